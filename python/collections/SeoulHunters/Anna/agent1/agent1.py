@@ -1,10 +1,16 @@
 import json
+import sys
+from pathlib import Path
 from openai import OpenAI
 from langgraph.graph import StateGraph, END
 from .schema import TravelPreference
 import re
 import os
 
+# SeoulHunters/shared 공용 모듈 경로 추가
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+from shared.llm_cache import cached_create
+
 # print("DEBUG:: OPENAI KEY =", os.getenv("OPENAI_API_KEY"))
 
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
@@ -40,7 +46,10 @@ def _extract_json(text: str) -> str:
 def classify_user_input(state: dict) -> dict:
     user_text = state["user_input"]
 
-    resp = client.responses.create(
+    # LLM_CACHE_NODES 에 agent1 이 켜져 있으면 같은 입력은 캐시에서 바로
+    resp = cached_create(
+        "agent1",
+        client.responses.create,
         model="gpt-4.1-mini",
         input=[
             {"role": "system", "content": SYSTEM_PROMPT},
@@ -17,10 +17,17 @@ agent3.py - 함수 기반 Agent3
     place_pool = result3["place_pool"]
 """
 
+import sys
+from functools import partial
+from pathlib import Path
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel
 from naver_local_test import search_local_places
 
+# SeoulHunters/shared 공용 모듈 경로 추가
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+from shared.search_client import fetch_all
+
 # ---------------------------------------------------------
 # 1. Place 스키마 (Agent3의 출력 단위)
 # ---------------------------------------------------------
@@ -203,14 +210,19 @@ def build_place_pool_from_plan(
     theme_area_pairs = extract_theme_area_pairs(tag_plan, prefs_data)
 
     # 2) 각 (theme, area) 슬롯당 per_slot개 검색
+    #    슬롯끼리는 서로 독립이라 공유 커넥션 풀로 동시에 검색한다.
     pool: List[Place] = []
-    for theme, area in theme_area_pairs:
-        places = search_places_for_theme_area(
+    results = fetch_all([
+        partial(
+            search_places_for_theme_area,
             area=area,
             theme=theme,
             limit=per_slot,
             sort="random",
         )
+        for theme, area in theme_area_pairs
+    ])
+    for places in results:
         pool.extend(places)
 
     # 3) 이름 + 주소 기준으로 전체 중복 제거
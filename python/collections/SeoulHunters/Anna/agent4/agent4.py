@@ -10,7 +10,8 @@ agent4.py
     app4 = build_agent4()
     result4 = app4({
         "prefs": result1["prefs"],          # TravelPreference
-        "place_pool": result3["place_pool"] # List[Place] (Pydantic or dict)
+        "place_pool": result3["place_pool"], # List[Place] (Pydantic or dict)
+        "tag_plan": result2["tag_plan"],    # (선택) 테마별 weight → 일정 전체의 테마 비율
     })
     routes = result4["routes"]
 
@@ -31,8 +32,15 @@ agent4.py
     }
 """
 
+import sys
+from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+# SeoulHunters/shared 공용 모듈 경로 추가
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+from shared.geo import naver_xy
+from shared.slot_filler import fill_days, theme_weights_from_plan
+
 
 # ---------------------------------------------------------
 # 1. place 를 dict 형태로 통일 (Pydantic / dict / 객체 모두 대응)
@@ -59,28 +67,7 @@ def _place_to_dict(p: Any) -> Dict[str, Any]:
 
 
 # ---------------------------------------------------------
-# 2. place_pool 을 테마별 버킷으로 분류
-# ---------------------------------------------------------
-def _bucket_places_by_theme(place_pool: List[Any]) -> Dict[str, List[Dict[str, Any]]]:
-    """
-    place_pool을 theme 기준으로 분류해서
-    {"맛집": [...], "카페": [...], "관광": [...], ...} 형태로 반환.
-    """
-    buckets: Dict[str, List[Dict[str, Any]]] = {}
-
-    for p in place_pool:
-        data = _place_to_dict(p)
-        theme = data.get("theme") or "기타"
-
-        if theme not in buckets:
-            buckets[theme] = []
-        buckets[theme].append(data)
-
-    return buckets
-
-
-# ---------------------------------------------------------
-# 3. intensity(일정 강도) → 하루에 사용할 time slot 결정
+# 2. intensity(일정 강도) → 하루에 사용할 time slot 결정
 # ---------------------------------------------------------
 BASE_SLOTS = ["morning", "lunch", "afternoon", "snack", "dinner", "night"]
 
@@ -119,7 +106,7 @@ def _slots_from_intensity(intensity: Optional[int]) -> List[str]:
 
 
 # ---------------------------------------------------------
-# 4. time slot → 선호 테마 매핑
+# 3. time slot → 선호 테마 매핑
 # ---------------------------------------------------------
 SLOT_THEME_PRIORITIES: Dict[str, List[str]] = {
     "morning": ["관광", "카페"],
@@ -131,33 +118,8 @@ SLOT_THEME_PRIORITIES: Dict[str, List[str]] = {
 }
 
 
-def _pick_place_for_slot(
-    slot: str,
-    theme_buckets: Dict[str, List[Dict[str, Any]]],
-) -> Optional[Dict[str, Any]]:
-    """
-    특정 time slot 에 대해 우선순위 테마를 기준으로 place 하나 선택.
-    없으면 '남은 아무 테마' 중 하나를 사용.
-    """
-    priorities = SLOT_THEME_PRIORITIES.get(slot, [])
-
-    # 1) 우선순위 테마에서 먼저 찾기
-    for theme in priorities:
-        bucket = theme_buckets.get(theme, [])
-        if bucket:
-            return bucket.pop(0)  # FIFO 방식으로 하나 꺼내기
-
-    # 2) 아무 테마나 남아있는 것 중에서 사용 (fallback)
-    for theme, bucket in theme_buckets.items():
-        if bucket:
-            return bucket.pop(0)
-
-    # 3) 정말 아무것도 없으면 None
-    return None
-
-
 # ---------------------------------------------------------
-# 5. prefs + place_pool → routes 생성 (핵심 로직)
+# 4. prefs + place_pool → routes 생성 (핵심 로직)
 # ---------------------------------------------------------
 # def _build_routes(
 #     prefs: Any,
@@ -210,11 +172,13 @@ def _pick_place_for_slot(
 def _build_routes(
     prefs: Any,
     place_pool: List[Any],
+    tag_plan: Any = None,
 ) -> List[Dict[str, Any]]:
     """
     Agent1의 prefs + Agent3의 place_pool 을 받아
     일차별 route 리스트를 생성한다.
     - 하루에 들어가는 장소 수를 가능한 한 '균등 분배' 하도록 조정.
+    - 슬롯 채우기는 shared/slot_filler (tag_plan weight 비율 + 그날 동선 중심에 가까운 장소 우선).
     """
 
     # prefs: TravelPreference or dict
@@ -229,11 +193,11 @@ def _build_routes(
     # 1) 하루에 사용할 time slot 결정
     slots = _slots_from_intensity(intensity)
 
-    # 2) place_pool을 theme 기준으로 버킷화
-    theme_buckets = _bucket_places_by_theme(place_pool)
+    # 2) place_pool을 dict로 통일
+    places = [_place_to_dict(p) for p in place_pool]
 
     # 🔥 3) 전체 place 개수와 하루 최소 개수 계산 (균등 분배용)
-    total_places = sum(len(bucket) for bucket in theme_buckets.values())
+    total_places = len(places)
     if total_places <= 0:
         # 장소가 아예 없으면 전부 비워둔 routes 반환
         return [
@@ -250,34 +214,34 @@ def _build_routes(
     # 예: total_places=12, duration=3 → min_per_day=4
     min_per_day = max(1, total_places // duration)
 
-    routes: List[Dict[str, Any]] = []
-
-    for day in range(1, duration + 1):
-        schedule_entries: List[Dict[str, Any]] = []
-
-        # 이 날에 실제로 채울 슬롯 개수
-        # (slots 수보다 min_per_day가 클 수 있으니)
-        slots_to_fill = min(len(slots), min_per_day)
-
-        for idx, slot in enumerate(slots):
-            if idx < slots_to_fill:
-                # 이 날에서 "우선 채워야 하는" 슬롯들만 place 할당
-                place = _pick_place_for_slot(slot, theme_buckets)
-            else:
-                # 나머지 슬롯은 비워두기
-                place = None
+    # 이 날에 실제로 채울 슬롯 개수
+    # (slots 수보다 min_per_day가 클 수 있으니)
+    slots_to_fill = min(len(slots), min_per_day)
+
+    # 4) 테마별 weight 비율 + 그날 동선 중심 기준으로 슬롯 채우기 (나머지 슬롯은 비워두기)
+    days = fill_days(
+        themes=[p.get("theme") or "기타" for p in places],
+        coords=[naver_xy(p) for p in places],
+        slots=slots,
+        n_days=duration,
+        priorities=SLOT_THEME_PRIORITIES,
+        theme_weights=theme_weights_from_plan(tag_plan),
+        per_day=slots_to_fill,
+    )
 
-            schedule_entries.append(
-                {
-                    "time": slot,
-                    "place": place,
-                }
-            )
+    routes: List[Dict[str, Any]] = []
 
+    for day, filled in enumerate(days, 1):
         routes.append(
             {
                 "day": day,
-                "schedule": schedule_entries,
+                "schedule": [
+                    {
+                        "time": slot,
+                        "place": places[i] if i is not None else None,  # dict 또는 None
+                    }
+                    for slot, i in filled
+                ],
             }
         )
 
@@ -287,7 +251,7 @@ def _build_routes(
 
 
 # ---------------------------------------------------------
-# 6. Agent4 빌더 (함수 기반, Agent1/2/3 스타일)
+# 5. Agent4 빌더 (함수 기반, Agent1/2/3 스타일)
 # ---------------------------------------------------------
 def build_agent4():
     """
@@ -299,6 +263,7 @@ def build_agent4():
         result4 = app4({
             "prefs": result1["prefs"],
             "place_pool": result3["place_pool"],
+            "tag_plan": result2["tag_plan"],   # 선택
         })
         routes = result4["routes"]
     """
@@ -315,6 +280,7 @@ def build_agent4():
         routes = _build_routes(
             prefs=prefs,
             place_pool=place_pool,
+            tag_plan=inputs.get("tag_plan"),
         )
 
         return {"routes": routes}
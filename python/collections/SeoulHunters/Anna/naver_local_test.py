@@ -1,9 +1,14 @@
 import os
-import requests
+import sys
+from pathlib import Path
 import urllib.parse
 import re
 from dotenv import load_dotenv
 
+# SeoulHunters/shared 공용 모듈 경로 추가
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from shared.search_client import get_search_client
+
 load_dotenv()
 
 NAVER_CLIENT_ID = os.getenv("NAVER_CLIENT_ID")
@@ -26,28 +31,12 @@ def search_local_places(query: str, display: int = 5, start: int = 1, sort: str
     - start: 시작 위치
     - sort: 'random' (기본, 정확도순) / 'comment' (리뷰 많은 순)
     """
-    url = "https://openapi.naver.com/v1/search/local.json"
-
-    headers = {
-        "X-Naver-Client-Id": NAVER_CLIENT_ID,
-        "X-Naver-Client-Secret": NAVER_CLIENT_SECRET,
-    }
-
-    params = {
-        "query": query,
-        "display": display,
-        "start": start,
-        "sort": sort,
-    }
-
-    resp = requests.get(url, headers=headers, params=params, timeout=5)
-    resp.raise_for_status()  # 4xx, 5xx 에러 시 예외 발생
-
-    data = resp.json()
+    # 공유 커넥션 풀(keep-alive) 사용. 4xx, 5xx 에러 시 예외 발생
+    items = get_search_client().naver(query, display=display, start=start, sort=sort)
 
     # 필요한 정보만 깔끔하게 정리해서 리턴
     places = []
-    for item in data.get("items", []):
+    for item in items:
         places.append(
             {
                 "name": clean_html(item.get("title", "")),
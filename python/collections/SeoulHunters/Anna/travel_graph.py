@@ -64,7 +64,7 @@ def agent3_node(state: TravelState) -> TravelState:
     return state
 
 
-# Agent4: prefs + place_pool -> routes
+# Agent4: prefs + place_pool (+ tag_plan weight) -> routes
 _app4 = build_agent4()
 
 def agent4_node(state: TravelState) -> TravelState:
@@ -73,6 +73,7 @@ def agent4_node(state: TravelState) -> TravelState:
     result4 = _app4({
         "prefs": prefs,
         "place_pool": place_pool,
+        "tag_plan": state.get("tag_plan"),
     })
     state["routes"] = result4["routes"]
     return state
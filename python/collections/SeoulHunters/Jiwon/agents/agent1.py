@@ -1,8 +1,13 @@
+import sys
+from pathlib import Path
 import os
 import json
 import re
 from openai import OpenAI
 from state import AgentState, TravelPreference
+# SeoulHunters/shared 공용 모듈 경로 추가
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+from shared.llm_cache import cached_create
 
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
@@ -36,7 +41,10 @@ SYSTEM1 = """
 def agent1_node(state: AgentState) -> AgentState:
     user_text = state["user_input"]
 
-    resp = client.responses.create(
+    # LLM_CACHE_NODES 에 agent1 이 켜져 있으면 같은 입력은 캐시에서 바로
+    resp = cached_create(
+        "agent1",
+        client.responses.create,
         model="gpt-4.1-mini",
         input=[
             {"role": "system", "content": SYSTEM1},
@@ -1,6 +1,12 @@
+import sys
+from pathlib import Path
+from functools import partial
 from typing import List
 from state import AgentState, TravelPreference, Place
 from tools import search_local_places
+# SeoulHunters/shared 공용 모듈 경로 추가
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+from shared.search_client import fetch_all
 
 THEME_KEYWORDS = {
     "맛집": ["맛집", "식당"],
@@ -26,25 +32,30 @@ def agent3_node(state: AgentState) -> AgentState:
     pairs = extract_theme_area_pairs(tag_plan, prefs)
     place_pool: List[Place] = []
 
-    for theme, area in pairs:
-        keywords = THEME_KEYWORDS.get(theme, [theme])
-        for kw in keywords:
-            results = search_local_places(f"{area} {kw}", display=5)
-            for r in results:
-                place_pool.append(
-                    Place(
-                        name=r["name"],
-                        category=r.get("category"),
-                        address=r.get("address"),
-                        road_address=r.get("road_address"),
-                        mapx=r.get("mapx"),
-                        mapy=r.get("mapy"),
-                        link=r.get("link"),
-                        telephone=r.get("telephone"),
-                        theme=theme,
-                        area=area,
-                    )
+    # (theme, area, kw) 검색을 공유 커넥션 풀로 한 번에 동시 실행
+    jobs = [
+        (theme, area, kw)
+        for theme, area in pairs
+        for kw in THEME_KEYWORDS.get(theme, [theme])
+    ]
+    all_results = fetch_all([partial(search_local_places, f"{area} {kw}", display=5) for _, area, kw in jobs])
+
+    for (theme, area, _), results in zip(jobs, all_results):
+        for r in results:
+            place_pool.append(
+                Place(
+                    name=r["name"],
+                    category=r.get("category"),
+                    address=r.get("address"),
+                    road_address=r.get("road_address"),
+                    mapx=r.get("mapx"),
+                    mapy=r.get("mapy"),
+                    link=r.get("link"),
+                    telephone=r.get("telephone"),
+                    theme=theme,
+                    area=area,
                 )
+            )
 
     dedup = {}
     for p in place_pool:
@@ -1,5 +1,13 @@
+import sys
+from pathlib import Path
 from typing import Any, Dict, List
 from state import AgentState
+# SeoulHunters/shared 공용 모듈 경로 추가
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+from shared.slot_filler import fill_days, theme_weights_from_plan
+from shared.travel_time import get_travel_time_matrix
+from shared.geo import naver_xy
+from shared.scheduler import place_kind, schedule_day
 
 def _place_dict(p):
     if hasattr(p, "model_dump"):
@@ -31,64 +39,9 @@ def _slots_from_intensity(i):
 # ==========================
 
 def _coord(p: Dict):
-    """네이버 좌표(mapx, mapy)를 숫자로 변환"""
-    x_raw = p.get("mapx") or 0
-    y_raw = p.get("mapy") or 0
-    try:
-        x = float(x_raw)
-    except Exception:
-        x = 0.0
-    try:
-        y = float(y_raw)
-    except Exception:
-        y = 0.0
-    return x, y
-
-
-def _sort_places_by_route(places: List[Dict]) -> List[Dict]:
-    """
-    하루치 장소 리스트를 받아서
-    '현재 위치에서 가장 가까운 다음 장소'를 고르는 방식으로 순서 정렬.
-    (nearest neighbor heuristic)
-    """
-    if len(places) <= 1:
-        return places
-
-    remaining = places[:]
-    current = remaining.pop(0)
-    ordered = [current]
-
-    while remaining:
-        cx, cy = _coord(current)
-        # 현재 위치와의 거리 제곱을 기준으로 가장 가까운 곳 선택
-        remaining.sort(
-            key=lambda q: (
-                (_coord(q)[0] - cx) ** 2 + (_coord(q)[1] - cy) ** 2
-            )
-        )
-        current = remaining.pop(0)
-        ordered.append(current)
-
-    return ordered
-
-def _pick_place_for_slot(slot: str, buckets: Dict[str, List[Dict]]) -> Dict | None:
-    """
-    기존 로직: 슬롯별 테마 우선순위에 따라 버킷에서 하나 꺼내기.
-    (buckets는 theme → [place dict, ...])
-    """
-    priorities = SLOT_THEME_PRIORITIES.get(slot, [])
-
-    # 1) 우선순위 테마에서 먼저 찾기
-    for th in priorities:
-        if buckets.get(th):
-            return buckets[th].pop(0)
-
-    # 2) 아무 테마나 남아 있는 것 중 하나 사용
-    for b in buckets.values():
-        if b:
-            return b.pop(0)
-
-    return None
+    """네이버 좌표(mapx, mapy = WGS84 * 1e7)를 (경도, 위도)로 변환"""
+    return naver_xy(p)
+
 
 # ==========================
 #   Agent4 노드 (동선 고려)
@@ -96,40 +49,39 @@ def _pick_place_for_slot(slot: str, buckets: Dict[str, List[Dict]]) -> Dict | No
 
 def agent4_node(state: AgentState) -> AgentState:
     prefs = state["prefs"]
-    place_pool = state["place_pool"]
-
-    # 1) theme 기준으로 버킷화
-    buckets: Dict[str, List[Dict]] = {}
-    for p in place_pool:
-        d = _place_dict(p)
-        t = d.get("theme", "기타")
-        buckets.setdefault(t, []).append(d)
+    place_pool = [_place_dict(p) for p in state["place_pool"]]
 
-    # 2) intensity/기간에 따른 기본 슬롯 정보
+    # 1) intensity/기간에 따른 기본 슬롯 정보
     slots = _slots_from_intensity(prefs.intensity)
     duration = prefs.duration
 
-    routes = []
+    # 2) 날짜별 장소 선택: tag_plan weight 비율 + 슬롯 테마 우선순위 + 그날 동선 중심에 가까운 장소 (shared/slot_filler)
+    days = fill_days(
+        themes=[p.get("theme", "기타") for p in place_pool],
+        coords=[_coord(p) for p in place_pool],
+        slots=slots,
+        n_days=duration,
+        priorities=SLOT_THEME_PRIORITIES,
+        theme_weights=theme_weights_from_plan(state.get("tag_plan")),
+    )
 
-    for day in range(1, duration + 1):
-        # 2-1) 이 날 사용할 장소들 먼저 선택 (slot 순서 기준)
-        day_places: List[Dict] = []
-        for slot in slots:
-            chosen = _pick_place_for_slot(slot, buckets)
-            if chosen:
-                day_places.append(chosen)
+    # 3) 이동 시간 행렬은 풀 전체 기준으로 한 번만 (같은 풀이면 재추천/다른 날짜도 shared/travel_time 캐시 재사용)
+    travel = get_travel_time_matrix([_coord(p) for p in place_pool], prefs.transport) if place_pool else None
+
+    routes = []
 
-        # 2-2) 선택된 장소들을 '동선 기준'으로 재정렬
-        day_places_sorted = _sort_places_by_route(day_places)
+    for day, filled in enumerate(days, 1):
+        # 3-1) 이 날 사용할 장소들 (풀 인덱스)
+        day_indices: List[int] = [i for _, i in filled if i is not None]
 
-        # 2-3) 정렬된 순서를 slots 에 순서대로 배치
+        # 3-2) 선택된 장소들을 시간창(점심 11:30~13:30 등) + 체류 시간 + 이동 시간 기준으로 스케줄링
+        #      (순서와 슬롯을 같이 정하므로 식당이 점심/저녁 시간에 맞춰 들어감)
         schedule = []
-        idx = 0
-        for slot in slots:
-            place = day_places_sorted[idx] if idx < len(day_places_sorted) else None
-            if idx < len(day_places_sorted):
-                idx += 1
-            schedule.append({"time": slot, "place": place})
+        if day_indices:
+            kinds = {i: place_kind(place_pool[i].get("theme"), place_pool[i].get("category")) for i in day_indices}
+            _, visits, _ = schedule_day(day_indices, kinds, travel.minutes)
+            for v in visits:
+                schedule.append({"time": v["slot"], "place": place_pool[v["index"]], "window": v["label"]})
 
         routes.append({"day": day, "schedule": schedule})
 
@@ -1,8 +1,13 @@
+import sys
+from pathlib import Path
 import json
 import re
 from typing import Any, Dict, List
 from state import AgentState, TravelPreference, Place
 from openai import OpenAI
+# SeoulHunters/shared 공용 모듈 경로 추가
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+from shared.llm_cache import cached_create
 
 client = OpenAI()
 
@@ -248,7 +253,9 @@ def agent4_suggest_node(state: AgentState) -> AgentState:
 
     user_content_1 = json.dumps(payload_recommend, ensure_ascii=False)
 
-    completion1 = client.chat.completions.create(
+    completion1 = cached_create(
+        "agent4_recommend",
+        client.chat.completions.create,
         model="gpt-4.1-mini",
         messages=[
             {"role": "system", "content": SYSTEM_PROMPT_AGENT4_RECOMMEND},
@@ -304,7 +311,9 @@ def agent4_suggest_node(state: AgentState) -> AgentState:
 
     user_content_2 = json.dumps(payload_interpret, ensure_ascii=False)
 
-    completion2 = client.chat.completions.create(
+    completion2 = cached_create(
+        "agent4_interpret",
+        client.chat.completions.create,
         model="gpt-4.1-mini",
         messages=[
             {"role": "system", "content": SYSTEM_PROMPT_AGENT4_INTERPRET},
@@ -1,7 +1,12 @@
+import sys
+from pathlib import Path
 import json
 from typing import Any, Dict, List
 from state import AgentState
 from openai import OpenAI
+# SeoulHunters/shared 공용 모듈 경로 추가
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+from shared.llm_cache import cached_create
 
 client = OpenAI() 
 
@@ -117,8 +122,10 @@ def agent5_route_node(state: AgentState) -> AgentState:
         "selected_main_places": selected_main_places,
     }
 
-    resp = client.chat.completions.create(
-        model="gpt-4.1-mini", 
+    resp = cached_create(
+        "agent5",
+        client.chat.completions.create,
+        model="gpt-4.1-mini",
         response_format={"type": "json_object"},
         messages=[
             {"role": "system", "content": ROUTE_SYSTEM_PROMPT},
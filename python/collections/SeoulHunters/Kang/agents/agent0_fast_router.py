@@ -0,0 +1,135 @@
+"""
+agent0_fast_router.py - Router 앞단의 규칙/인덱스 기반 빠른 라우팅
+
+역할:
+- 라우터에 들어오는 대부분의 턴은 "1번이랑 3번", 후보 장소 이름, 후보 리스트에서 복사한 주소다.
+  이런 확실한 경우는 LLM 호출 없이 바로 결정하고, 애매하면 None을 돌려 기존 LLM 라우터에 맡긴다.
+- 판단 순서
+  1. 여행 계획서가 없거나 미완성 → planner
+  2. 완성된 일정의 부분 수정 ("2일차 카페 말고 다른 데", "1일차 ○○ 빼줘") → path_finder (부분 수정)
+  3. 재추천/계획 변경 의도 단어("다른", "더 찾아", "바꿔" 등)가 있으면 → 애매 (LLM)
+  4. 후보 번호 선택 ("1번", "3번째", "첫 번째") → path_finder
+  5. 후보 이름/주소 매칭 (정규화 후 포함 여부 + 이름 유사도) → path_finder
+  6. 그 외 → 애매 (LLM)
+
+사용 예시:
+
+    route = fast_route(state, last_user_msg)   # (next_agent, reason) 또는 None
+"""
+
+import sys
+from pathlib import Path
+import re
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Optional, Tuple
+
+# SeoulHunters/shared 공용 모듈 경로 추가
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+from shared.geo import normalize_place_name
+from agents.agent5_editor import parse_edit
+
+# 재추천 / 계획 변경 의도 → 규칙으로 판단하지 않고 LLM에 맡긴다
+UNCERTAIN_MARKERS = [
+    "다른", "말고", "더 찾", "더 보여", "더 추천", "새로", "별로", "싫", "바꿔", "바꾸", "변경", "수정",
+    "대신", "추가", "빼", "지역", "테마", "일정", "며칠", "취소",
+]
+_DURATION_CHANGE = re.compile(r"\d\s*박|\d\s*일\s*(?:로|간|동안)")
+
+ORDINAL_WORDS = {
+    "첫": 1, "한": 1, "두": 2, "둘": 2, "세": 3, "셋": 3, "네": 4, "넷": 4, "다섯": 5,
+    "여섯": 6, "일곱": 7, "여덟": 8, "아홉": 9, "열": 10,
+}
+_NUMBER_PICK = re.compile(r"(\d{1,2})\s*(?:번|등|위|\))")
+_ORDINAL_PICK = re.compile(r"(" + "|".join(sorted(ORDINAL_WORDS, key=len, reverse=True)) + r")\s*번\s*째")
+
+NAME_FUZZY_THRESHOLD = 0.85
+MIN_NAME_LEN = 2
+
+
+def parse_ordinals(text: str, max_index: int) -> List[int]:
+    """'1번이랑 3번', '두 번째' → [1, 3] / [2] (1부터, 후보 수 범위 밖이면 제외)"""
+    picks = [int(n) for n in _NUMBER_PICK.findall(text)]
+    picks += [ORDINAL_WORDS[w] for w in _ORDINAL_PICK.findall(text)]
+    seen = []
+    for n in picks:
+        if 1 <= n <= max_index and n not in seen:
+            seen.append(n)
+    return seen
+
+
+def _address_keys(address: str) -> List[str]:
+    """'서울 용산구 한남동 744-5' → ['한남동7445'] (번지 숫자가 있는 마지막 두 토큰, 이름과 같은 정규화)"""
+    tokens = (address or "").split()
+    keys = []
+    if len(tokens) >= 2 and any(ch.isdigit() for ch in tokens[-1]):
+        keys.append(normalize_place_name(" ".join(tokens[-2:])))
+    return keys
+
+
+def _fuzzy_contains(needle: str, haystack: str) -> float:
+    """haystack 안에서 needle 길이만큼의 창을 밀면서 가장 높은 유사도"""
+    if not needle or not haystack:
+        return 0.0
+    if needle in haystack:
+        return 1.0
+    size = len(needle)
+    best = 0.0
+    for start in range(0, max(1, len(haystack) - size + 1)):
+        window = haystack[start:start + size]
+        best = max(best, SequenceMatcher(None, needle, window).ratio())
+    return best
+
+
+class CandidateIndex:
+    """main_place_candidates 이름/주소 → 후보 번호 인덱스"""
+
+    def __init__(self, candidates: List[Any]):
+        self.names: Dict[str, int] = {}
+        self.addresses: Dict[str, int] = {}
+        for idx, c in enumerate(candidates, start=1):
+            name = normalize_place_name(getattr(c, "place_name", str(c)))
+            if len(name) >= MIN_NAME_LEN:
+                self.names.setdefault(name, idx)
+            for key in _address_keys(getattr(c, "address", "")):
+                self.addresses.setdefault(key, idx)
+
+    def match(self, text: str) -> List[int]:
+        norm = normalize_place_name(text)
+        hits = []
+        for key, idx in self.addresses.items():
+            if key in norm:
+                hits.append(idx)
+        for name, idx in self.names.items():
+            if _fuzzy_contains(name, norm) >= NAME_FUZZY_THRESHOLD:
+                hits.append(idx)
+        return sorted(set(hits))
+
+
+def fast_route(state: Dict[str, Any], user_msg: str) -> Optional[Tuple[str, str]]:
+    """확실하면 (next_agent, reason), 애매하면 None"""
+    prefs = state.get("preferences")
+    if not prefs or not prefs.is_complete:
+        return "planner", "[fast-path] 여행 계획서 미완성"
+
+    edit = parse_edit(user_msg, state.get("final_itinerary"), state.get("candidates") or [])
+    if edit:
+        return "path_finder", f"[fast-path] 일정 부분 수정: {edit.day}일차 {edit.op} {edit.target or edit.new_place or edit.kind}"
+
+    if any(marker in user_msg for marker in UNCERTAIN_MARKERS) or _DURATION_CHANGE.search(user_msg):
+        return None
+
+    candidates = state.get("main_place_candidates") or []
+    if not candidates:
+        return None
+
+    picks = parse_ordinals(user_msg, len(candidates))
+    if picks:
+        chosen = ", ".join(f"{n}번" for n in picks)
+        return "path_finder", f"[fast-path] 후보 번호 선택: {chosen} (입력: {user_msg})"
+
+    matched = CandidateIndex(candidates).match(user_msg)
+    if matched:
+        names = ", ".join(getattr(candidates[n - 1], "place_name", str(candidates[n - 1])) for n in matched)
+        return "path_finder", f"[fast-path] 후보 이름/주소 일치: {names} (입력: {user_msg})"
+
+    return None
@@ -1,8 +1,14 @@
+import sys
+from pathlib import Path
 from typing import Literal, Optional
-from langchain_openai import ChatOpenAI
+# SeoulHunters/shared 공용 모듈 경로 추가
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+from shared.llm_registry import get_structured_llm
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
 from pydantic import BaseModel, Field
 
+from agents.agent0_fast_router import fast_route
+
 # [1] 라우팅 데이터 구조
 class RouteDecision(BaseModel):
     next_agent: Literal["planner", "suggester", "path_finder", "general_chat"] = Field(
@@ -57,13 +63,19 @@ def router_node(state):
     if len(messages) >= 2 and isinstance(messages[-2], AIMessage):
         last_ai_msg = messages[-2].content
         
+    # 확실한 경우(미완성 계획서 / 후보 번호·이름·주소 선택)는 LLM 없이 바로 결정
+    route = fast_route(state, last_user_msg)
+    if route is not None:
+        next_agent, reason = route
+        print(f"   ⚡ [Router 판단] {next_agent} (이유: {reason})")
+        return {"next_step": next_agent, "messages": [AIMessage(content=f"[Router 판단] {next_agent} \n (이유: {reason})")]}
+
     # 상태 요약 가져오기
     state_context = get_state_context(state)
     print("=== Agent 0 Router log 'state_context' ===")
     print(f"   📋 현재 상태 요약:\n{state_context}")
     # 모델명 수정 (gpt-4.1-mini -> gpt-4o-mini)
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
-    router_chain = llm.with_structured_output(RouteDecision)
+    router_chain = get_structured_llm("gpt-4o-mini", RouteDecision, temperature=0, cache_node="router")
     
     system_prompt = f"""
     당신은 여행 AI 서비스의 지능형 라우터입니다.
@@ -0,0 +1,180 @@
+"""
+agent1_extractors.py - Planner용 로컬 추출기 (LLM 없이 정규식/사전)
+
+역할:
+- 이미 완성된 여행 계획서(TripPreferences)에서 사용자가 한두 항목만 바꾸는 턴
+  ("2박 3일로 바꿀래", "부모님이랑 갈 거야", "택시 탈게요")을 LLM 없이 처리하기 위한 추출기.
+- extract_delta(text) → 바뀐 필드 dict + 해석하지 못한 나머지 토큰(residual)
+  residual이 비어 있으면 메시지 전체를 로컬에서 이해한 것 → LLM 호출 생략 가능.
+
+지원 항목:
+- duration   : "1박 2일" → 2, "2박" → 3, "3일로/3일간" → 3, "당일치기"/"하루" → 1, "이틀" → 2
+- companions : 혼자 / 친구 / 연인 / 가족(아이) / 가족(부모님)
+- transport  : 대중교통 / 걷기 / 자차 / 택시
+- intensity  : "빡빡하게" → 80, "여유롭게" → 30, "강도 70" → 70
+- target_area: 자주 나오는 서울 동네 이름 사전
+"""
+
+import re
+from typing import Any, Dict, List, Tuple
+
+NATIVE_DAYS = {"하루": 1, "당일": 1, "당일치기": 1, "이틀": 2, "사흘": 3, "나흘": 4, "닷새": 5}
+
+COMPANION_WORDS: Dict[str, List[str]] = {
+    "혼자": ["혼자", "혼행", "나홀로", "솔로"],
+    "친구": ["친구", "동기", "동창", "친구들"],
+    "연인": ["연인", "여자친구", "남자친구", "여친", "남친", "애인", "데이트", "커플"],
+    "가족(아이)": ["아이", "아기", "애기", "애들", "자녀", "아들", "딸"],
+    "가족(부모님)": ["부모님", "엄마", "아빠", "어머니", "아버지", "효도"],
+}
+
+TRANSPORT_WORDS: Dict[str, List[str]] = {
+    "대중교통": ["대중교통", "지하철", "버스", "전철"],
+    "걷기": ["걸어서", "걷기", "도보", "뚜벅이", "걸을"],
+    "자차": ["자차", "운전", "렌터카", "렌트카", "차로", "차 가지고", "자가용"],
+    "택시": ["택시"],
+}
+
+INTENSITY_WORDS: Dict[int, List[str]] = {
+    80: ["빡빡", "알차게", "최대한 많이", "부지런"],
+    30: ["여유", "느긋", "천천히", "휴식", "쉬엄쉬엄"],
+    50: ["적당히", "보통"],
+}
+
+AREAS = [
+    "종로", "성수", "강남", "홍대", "잠실", "이태원", "을지로", "연남", "한남", "익선동", "북촌", "서촌",
+    "명동", "여의도", "망원", "합정", "신촌", "압구정", "가로수길", "삼청동", "인사동", "용산", "건대",
+    "문래", "성북", "혜화", "대학로", "동대문", "광화문", "청담", "신사", "해방촌", "뚝섬", "서울숲",
+]
+
+# 바꾼 내용 외에 남아 있어도 의미가 없는 말 (명령/어미/조사)
+FILLER = {
+    "바꿔", "바꿔줘", "바꿔주세요", "바꿀래", "바꿀게", "바꿀래요", "변경", "변경해줘", "수정", "수정해줘",
+    "할래", "할게", "할게요", "할래요", "해줘", "해주세요", "갈래", "갈게", "갈게요", "갈래요", "가요", "갈", "거야",
+    "거예요", "탈게", "탈게요", "타고", "이용", "그리고", "이번엔", "이번에는", "대신", "그냥", "으로", "로", "요",
+    "좋아", "좋아요", "좋겠어", "좋겠어요", "가고", "싶어", "싶어요", "여행", "일정", "기간", "강도", "하게", "할",
+    "이랑", "랑", "하고", "같이", "함께", "계획", "다시", "롭게", "스럽게", "게",
+}
+_PARTICLE = re.compile(r"(으로|로|이랑|랑|하고|과|와|을|를|이|가|은|는|에|에서|도|만|요)$")
+
+_NIGHTS_DAYS = re.compile(r"(\d+)\s*박\s*(\d+)\s*일")
+_NIGHTS = re.compile(r"(\d+)\s*박")
+_DAYS = re.compile(r"(\d+)\s*일\s*(?:로|간|동안)")   # "3일에 갈래"(날짜)와 구분 → 기간 표현만
+_INTENSITY_NUM = re.compile(r"강도\s*(\d{1,3})")
+
+
+_TOKEN_TAIL = re.compile(r"[^\s,.!?~]*")
+SHORT_WORD_LEN = 2   # 이 길이 이하 단어는 뒤에 조사/어미만 붙을 때 인정 ('아이' ≠ '아이스크림', '딸' ≠ '딸기')
+
+
+def _tail_ok(tail: str) -> bool:
+    """단어 뒤에 붙은 글자가 조사/어미/복수(들)뿐인지"""
+    if tail.startswith("들"):
+        tail = tail[1:]
+    return not tail or tail in FILLER or bool(_PARTICLE.fullmatch(tail))
+
+
+def _find_words(text: str, table: Dict[Any, List[str]]) -> Tuple[List[Any], List[Tuple[int, int]]]:
+    """
+    table의 단어가 나온 값들과 위치(span)
+    - 긴 단어부터 자리를 차지하고, 이미 차지한 자리 안의 짧은 단어는 무시 ('여자친구' 안의 '친구')
+    """
+    matches = [
+        (m.start(), m.end(), value)
+        for value, words in table.items()
+        for w in words
+        for m in re.finditer(re.escape(w), text)
+    ]
+    matches.sort(key=lambda m: (-(m[1] - m[0]), m[0]))
+
+    values, spans = [], []
+    for start, end, value in matches:
+        if any(start < e and s < end for s, e in spans):
+            continue
+        if end - start <= SHORT_WORD_LEN and not _tail_ok(_TOKEN_TAIL.match(text, end).group()):
+            continue
+        if text.startswith("들", end):   # 복수형 '아이들', '친구들' 도 같이 지움
+            end += 1
+        if value not in values:
+            values.append(value)
+        spans.append((start, end))
+    return values, spans
+
+
+def extract_delta(text: str) -> Tuple[Dict[str, Any], List[str], List[str]]:
+    """
+    Returns:
+        delta     : 로컬에서 확실히 읽어낸 필드 값
+        residual  : 해석하지 못하고 남은 토큰 (비어 있으면 메시지 전체를 이해한 것)
+        conflicts : 한 항목에 값이 여러 개 나온 필드 (예: '친구' + '부모님') → 애매
+    """
+    delta: Dict[str, Any] = {}
+    conflicts: List[str] = []
+    spans: List[Tuple[int, int]] = []
+
+    # 1. 기간
+    m = _NIGHTS_DAYS.search(text)
+    if m:
+        delta["duration"] = int(m.group(2))
+        spans.append(m.span())
+    else:
+        m = _NIGHTS.search(text)
+        if m:
+            delta["duration"] = int(m.group(1)) + 1
+            spans.append(m.span())
+        else:
+            m = _DAYS.search(text)
+            if m:
+                delta["duration"] = int(m.group(1))
+                spans.append(m.span())
+    if "duration" not in delta:
+        for word, days in sorted(NATIVE_DAYS.items(), key=lambda kv: -len(kv[0])):
+            pos = text.find(word)
+            if pos >= 0:
+                delta["duration"] = days
+                spans.append((pos, pos + len(word)))
+                break
+
+    # 2. 동행자 / 이동수단 / 지역
+    for field, table in (("companions", COMPANION_WORDS), ("transport", TRANSPORT_WORDS)):
+        values, found = _find_words(text, table)
+        spans += found
+        if len(values) == 1:
+            delta[field] = values[0]
+        elif len(values) > 1:
+            conflicts.append(field)
+
+    areas, found = _find_words(text, {a: [a] for a in AREAS})
+    spans += found
+    if len(areas) == 1:
+        delta["target_area"] = areas[0]
+    elif len(areas) > 1:
+        conflicts.append("target_area")
+
+    # 3. 강도
+    m = _INTENSITY_NUM.search(text)
+    if m:
+        delta["intensity"] = max(0, min(100, int(m.group(1))))
+        spans.append(m.span())
+    else:
+        values, found = _find_words(text, INTENSITY_WORDS)
+        spans += found
+        if len(values) == 1:
+            delta["intensity"] = values[0]
+        elif len(values) > 1:
+            conflicts.append("intensity")
+
+    # 4. 남은 말 (읽어낸 부분을 지우고, 조사/어미/명령어 제거)
+    chars = list(text)
+    for start, end in spans:
+        for i in range(start, end):
+            chars[i] = " "
+    residual = []
+    for token in re.split(r"[\s,.!?~]+", "".join(chars)):
+        if not token or token in FILLER:
+            continue
+        stripped = _PARTICLE.sub("", token)
+        if stripped and stripped not in FILLER:
+            residual.append(token)
+
+    return delta, residual, conflicts
@@ -1,17 +1,68 @@
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import SystemMessage
+import sys
+from pathlib import Path
+# SeoulHunters/shared 공용 모듈 경로 추가
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+from shared.llm_registry import get_structured_llm
+from langchain_core.messages import SystemMessage, HumanMessage
 import json
 
 from state import AgentState, TripPreferences
+from agents.agent1_extractors import extract_delta
+
+FIELD_LABELS = {"duration": "기간", "target_area": "지역", "companions": "동행자", "transport": "이동수단", "intensity": "강도"}
+
+def _last_user_message(state: AgentState) -> str:
+   for msg in reversed(state.get("messages", [])):
+      if isinstance(msg, HumanMessage):
+         return msg.content
+   return ""
+
+def incremental_update(current_pref: TripPreferences, user_msg: str):
+   """
+   완성된 계획서에 대한 '한두 항목 변경' 턴 처리
+   - 로컬 추출기로 메시지 전체를 이해했으면 → LLM 없이 바로 반영
+   - 애매하면 → 전체 대화 대신 (현재 계획서 + 이번 메시지)만 보내는 짧은 delta 프롬프트
+   """
+   delta, residual, conflicts = extract_delta(user_msg)
+
+   if delta and not residual and not conflicts:
+      changes = ", ".join(f"{FIELD_LABELS[k]}: {v}" for k, v in delta.items())
+      print(f"   ⚡ [Planner] 로컬 추출로 바로 반영 ({changes})")
+      notes = current_pref.additional_notes or ""
+      return current_pref.model_copy(update={**delta, "additional_notes": f"{notes}\n[변경] {changes}".strip()})
+
+   print(f"   🔁 [Planner] 변경 내용이 애매해서 delta 프롬프트로 LLM 호출 (미해석: {residual}, 충돌: {conflicts})")
+   structured_llm = get_structured_llm('gpt-4.1-mini', TripPreferences, temperature=0, cache_node='planner_delta')
+   delta_prompt = f"""
+   당신은 '베테랑 여행 플래너'입니다. 아래는 이미 완성된 여행 계획서입니다.
+   사용자의 이번 메시지에서 **바뀐 항목만** 반영하고, 언급되지 않은 항목은 그대로 유지한 전체 계획서를 반환하세요.
+
+   [현재 계획서]
+   {json.dumps(current_pref.model_dump(), ensure_ascii=False)}
+
+   [로컬 추출 힌트] {json.dumps(delta, ensure_ascii=False)}
+
+   [규칙]
+   - 값은 스키마의 한국어 표준 값으로 저장. (예: 'taxi' -> '택시')
+   - 필수 6가지(duration, target_area, themes, intensity, companions, transport) 중 비는 것이 생기면 is_complete=False 와
+     missing_info_question(사용자 언어)을, 아니면 is_complete=True.
+   - additional_notes는 기존 내용에 이번 변경/요구사항을 반영해 갱신.
+   """
+   return structured_llm.invoke([SystemMessage(content=delta_prompt), HumanMessage(content=user_msg)])
+
 def planner_node(state: AgentState):
    print("🤖 --- [Planner Node] 사용자 의도 분석 중. . . ---")
-   
-   # 2. LLM 설정 (구조화된 출력)
-   llm = ChatOpenAI(model='gpt-4.1-mini', temperature=0)
-   structured_llm = llm.with_structured_output(TripPreferences)
 
    # 현재 상태 가져오기
-   current_pref = state.get("preferences", TripPreferences())
+   current_pref = state.get("preferences") or TripPreferences()
+
+   # 1. 이미 완성된 계획서를 고치는 턴이면 증분(incremental) 모드
+   user_msg = _last_user_message(state)
+   if current_pref.is_complete and user_msg:
+      return {"preferences": incremental_update(current_pref, user_msg)}
+
+   # 2. LLM 설정 (구조화된 출력, 프로세스 전역 레지스트리에서 재사용)
+   structured_llm = get_structured_llm('gpt-4.1-mini', TripPreferences, temperature=0, cache_node='planner')
 
    # 시스템 프롬프트: "5가지가 다 모여야 탈출 가능"
    system_prompt = f"""
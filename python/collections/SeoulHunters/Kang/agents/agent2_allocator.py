@@ -1,5 +1,9 @@
+import sys
+from pathlib import Path
 import json
-from langchain_openai import ChatOpenAI
+# SeoulHunters/shared 공용 모듈 경로 추가
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+from shared.llm_registry import get_structured_llm
 from langchain_core.messages import SystemMessage
 from state import AgentState, ItineraryStrategy
 
@@ -10,11 +14,8 @@ def allocator_node(state: AgentState):
    preferences = state['preferences']
    target_area = preferences.target_area
    duration = preferences.duration
-   # 수정사항
-   # 지금은 모든 node에서 llm을 ? 하고 있는데, 이걸 global로 변경할 필요는 있다.
-   
-   llm = ChatOpenAI(model='gpt-4.1-mini', temperature=0)
-   structured_llm = llm.with_structured_output(ItineraryStrategy)
+   # LLM은 shared/llm_registry 에서 (model, temperature, schema) 별로 한 번만 만들어 재사용
+   structured_llm = get_structured_llm('gpt-4.1-mini', ItineraryStrategy, temperature=0, cache_node='allocator')
 
    system_prompt = f"""
    당신은 치밀한 여행 전략가입니다. 
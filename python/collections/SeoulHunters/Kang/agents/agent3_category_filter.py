@@ -0,0 +1,205 @@
+"""
+agent3_category_filter.py - Agent 3 카테고리 규칙 기반 사전 필터
+
+역할:
+- Naver / Kakao 검색 결과에는 계층형 category 문자열이 이미 들어 있다.
+  (Kakao: "음식점 > 한식 > 육류,고기", Naver: "한식>냉면", "카페,디저트>베이커리")
+- LLM 검증 프롬프트가 실제로 걸러내는 것도 대부분 이 카테고리("편의점", "PC방", "재료상")라서
+  태그 계열(맛집 / 카페 / 쇼핑 / 관광)별로 통과/탈락 카테고리 prefix를 미리 정해 두고
+  트라이(prefix 트리)로 바로 판정한다.
+- 판정: True(통과) / False(탈락) / None(애매 → LLM 검증으로 넘김)
+  · 가장 길게 일치한 prefix 규칙이 이긴다. ("음식점" 통과, "음식점 > 카페"는 맛집에선 애매)
+  · 어느 계열인지 모르는 태그(예: "야경", "루프탑")나 규칙에 없는 카테고리는 전부 None.
+  · 통과(True)는 키워드의 지역명("연남동 맛집" → 연남)이 주소/이름에 있을 때만.
+    없으면 None → 지역 일치(판단 기준 2)는 LLM이 판단한다.
+
+사용 예시:
+
+    verdict = CATEGORY_FILTER.judge("연남동 맛집", "맛집", "홍길동식당", "음식점 > 한식", "서울 마포구 연남동 223")  # True
+    verdict = CATEGORY_FILTER.judge("연남동 맛집", "맛집", "GS25 연남점", "가정,생활 > 편의점")  # False
+"""
+
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# --- [태그 계열 판별용 별칭] 키워드/태그 이름에 포함되면 해당 계열 ---
+FAMILY_ALIASES: Dict[str, List[str]] = {
+    "맛집": ["맛집", "식당", "밥집", "음식", "한식", "양식", "일식", "중식", "파스타", "고기", "흑돼지",
+            "술집", "이자카야", "포차", "저녁", "점심", "브런치", "국밥", "냉면", "레스토랑"],
+    "카페": ["카페", "디저트", "베이커리", "빵집", "커피", "찻집", "케이크"],
+    "쇼핑": ["쇼핑", "편집샵", "소품샵", "옷가게", "기념품", "백화점", "아울렛", "쇼핑몰", "시장", "잡화"],
+    "관광": ["관광", "명소", "여행", "구경", "산책", "공원", "박물관", "미술관", "전시", "고궁", "랜드마크"],
+}
+
+# 어느 태그든 통과시키지 않는 카테고리 (프롬프트의 '편의점, PC방, 재료상')
+COMMON_REJECT = [
+    "가정,생활 > 편의점",
+    "생활,편의 > 편의점",
+    "쇼핑,유통 > 편의점",
+    "편의점",
+    "PC방",
+    "오락,레저 > PC방",
+    "스포츠,레저 > PC방",
+    "가정,생활 > 식품판매",
+    "쇼핑,유통 > 식자재",
+    "식자재",
+    "부동산",
+    "의료,건강",
+    "금융,보험",
+]
+
+_FOOD = ["음식점", "한식", "양식", "일식", "중식", "분식", "술집", "육류,고기요리", "아시아음식",
+         "세계음식", "뷔페", "치킨,닭강정", "패스트푸드", "퓨전요리", "해물,생선요리", "요리주점"]
+_CAFE = ["음식점 > 카페", "음식점 > 간식", "카페,디저트", "카페", "베이커리", "디저트"]
+
+# --- [태그 계열별 taxonomy] (카테고리 prefix, 판정) ---
+TAXONOMY: Dict[str, List[Tuple[str, Optional[bool]]]] = {
+    "맛집": (
+        [(c, True) for c in _FOOD]
+        + [(c, None) for c in _CAFE]  # 맛집 태그에 카페/디저트 → 애매 (LLM에게)
+    ),
+    "카페": (
+        [(c, True) for c in _CAFE]
+        + [(c, False) for c in ["음식점 > 한식", "음식점 > 중식", "음식점 > 일식", "음식점 > 양식", "음식점 > 분식",
+                                "한식", "중식", "일식", "양식", "분식", "육류,고기요리"]]
+    ),
+    "쇼핑": (
+        [(c, True) for c in ["쇼핑,유통", "패션", "가정,생활 > 의류판매", "가정,생활 > 패션", "가정,생활 > 시장",
+                             "가정,생활 > 생활용품점", "가정,생활 > 문구,팬시", "가정,생활 > 선물,기념품",
+                             "백화점", "쇼핑몰", "아울렛", "전통시장", "시장"]]
+        + [(c, False) for c in _FOOD + _CAFE]
+    ),
+    "관광": (
+        # Kakao "여행" 아래에는 숙박/여행사도 있으므로 "여행" 전체가 아니라 관광,명소 / 공원 하위만 통과
+        [(c, True) for c in ["여행 > 관광,명소", "여행 > 공원", "여행,명소", "관광,명소", "문화,예술", "공원", "박물관",
+                             "미술관", "전시관", "역사유적", "궁궐,궁", "랜드마크"]]
+        + [(c, False) for c in _FOOD + _CAFE + ["여행 > 숙박", "여행 > 여행사", "숙박", "여행사"]]
+    ),
+}
+
+REJECT_NAME_MARKERS = ("폐업", "이전")  # 프롬프트 판단 기준 3
+REGION_SUFFIXES = ("동", "역")           # "연남동" / "성수역" → "연남" / "성수" 로 주소(연남로, 성수동1가)와 비교
+
+
+def split_category(category: str) -> List[str]:
+    """'음식점 > 카페 > 커피전문점' / '카페,디저트>카페' → ['음식점', '카페', '커피전문점'] (공백 제거)"""
+    return [seg.replace(" ", "") for seg in (category or "").split(">") if seg.strip()]
+
+
+def region_of(keyword: str) -> str:
+    """키워드 맨 앞 토큰(allocator의 "[지역명] + [단순명사]" 규칙)에서 비교용 지역명. 토큰이 하나면 ''"""
+    tokens = (keyword or "").split()
+    if len(tokens) < 2:
+        return ""
+    region = tokens[0]
+    if region.endswith(REGION_SUFFIXES) and len(region) > 2:
+        region = region[:-1]
+    return region
+
+
+def in_area(keyword: str, name: str, address: str) -> bool:
+    """키워드 지역명이 주소나 이름에 있는지 (지역명이 없는 키워드는 항상 True)"""
+    region = region_of(keyword)
+    if not region:
+        return True
+    return region in (address or "").replace(" ", "") or region in (name or "").replace(" ", "")
+
+
+class CategoryTrie:
+    """카테고리 segment 단위 트라이. match()는 가장 길게 일치한 규칙의 판정을 돌려준다."""
+
+    def __init__(self):
+        self.root: Dict = {}
+
+    def insert(self, category: str, verdict: Optional[bool]):
+        node = self.root
+        for seg in split_category(category):
+            node = node.setdefault(seg, {})
+        node[""] = verdict  # "" 키 = 이 노드에서 끝나는 규칙
+
+    def match(self, segments: Iterable[str]) -> Tuple[bool, Optional[bool]]:
+        """(규칙 일치 여부, 판정)"""
+        node = self.root
+        found, verdict = False, None
+        for seg in segments:
+            node = node.get(seg)
+            if node is None:
+                break
+            if "" in node:
+                found, verdict = True, node[""]
+        return found, verdict
+
+
+class CategoryFilter:
+    def __init__(self, taxonomy: Dict[str, List[Tuple[str, Optional[bool]]]] = TAXONOMY,
+                 common_reject: List[str] = COMMON_REJECT):
+        self.families: Dict[str, CategoryTrie] = {}
+        for family, rules in taxonomy.items():
+            trie = CategoryTrie()
+            for category, verdict in rules:
+                trie.insert(category, verdict)
+            self.families[family] = trie
+
+        self.common = CategoryTrie()
+        for category in common_reject:
+            self.common.insert(category, False)
+
+        self.accepted = 0
+        self.rejected = 0
+        self.ambiguous = 0
+        self.off_area = 0      # 카테고리는 통과인데 지역명이 주소에 없어 LLM으로 넘긴 수
+        self._lock = threading.Lock()   # 비동기 collector(to_thread) / 여러 세션에서 같이 쓰므로
+
+    def family_of(self, keyword: str, tag_name: str) -> Optional[str]:
+        """키워드 → 태그 이름 순서로 계열 판별. 여러 계열에 걸치거나 모르면 None"""
+        for text in (keyword or "", tag_name or ""):
+            hits = {family for family, aliases in FAMILY_ALIASES.items() if any(a in text for a in aliases)}
+            if len(hits) == 1:
+                return hits.pop()
+            if len(hits) > 1:
+                return None
+        return None
+
+    def _judge(self, keyword: str, tag_name: str, name: str, category: str, address: str = "") -> Optional[bool]:
+        if any(marker in (name or "") for marker in REJECT_NAME_MARKERS):
+            return False
+
+        segments = split_category(category)
+        if not segments:
+            return None
+
+        # 공통 탈락은 카테고리 어디에 있어도 (예: '쇼핑,유통 > 편의점', 'PC방')
+        for start in range(len(segments)):
+            found, _ = self.common.match(segments[start:])
+            if found:
+                return False
+
+        family = self.family_of(keyword, tag_name)
+        if family is None:
+            return None
+        _, verdict = self.families[family].match(segments)
+        if verdict is True and not in_area(keyword, name, address):
+            with self._lock:
+                self.off_area += 1
+            return None
+        return verdict
+
+    def judge(self, keyword: str, tag_name: str, name: str, category: str, address: str = "") -> Optional[bool]:
+        verdict = self._judge(keyword, tag_name, name, category, address)
+        with self._lock:
+            if verdict is True:
+                self.accepted += 1
+            elif verdict is False:
+                self.rejected += 1
+            else:
+                self.ambiguous += 1
+        return verdict
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"accepted": self.accepted, "rejected": self.rejected, "ambiguous": self.ambiguous,
+                    "off_area": self.off_area}
+
+
+# 프로세스 전역 (taxonomy는 import 시 한 번만 컴파일)
+CATEGORY_FILTER = CategoryFilter()
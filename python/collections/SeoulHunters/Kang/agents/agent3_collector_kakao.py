@@ -1,13 +1,14 @@
+import sys
+from pathlib import Path
+from functools import partial
 from state import AgentState, CandidatePlace
-from tools import search_kakao
-from pydantic import BaseModel, Field
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import SystemMessage
+from tools import search_kakao_paged
+# SeoulHunters/shared 공용 모듈 경로 추가
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+from shared.search_client import fetch_all, search_stats
+from agents.agent3_validator import build_place_validator
 import json
 
-class Satisfied(BaseModel):
-    satisfy: bool = Field(description="조건 충족 여부 (True/False)")
-
 def collector_node_kakao(state: AgentState):
     print("\n🏃 --- [Agent 3] 장소 수집 및 검증중 KAKAO ---")
     
@@ -30,9 +31,20 @@ def collector_node_kakao(state: AgentState):
         reverse=True
     )
     
-    llm = ChatOpenAI(model='gpt-4.1-mini', temperature=0)
-    structured_llm = llm.with_structured_output(Satisfied)
-    for alloc in allocations:
+    validator = build_place_validator('gpt-4.1-mini')
+
+    # 모든 (태그, 키워드) 검색을 공유 커넥션 풀로 한 번에 동시 실행
+    search_jobs = [
+        (i, kw, min(15, alloc.count))
+        for i, alloc in enumerate(allocations) if alloc.count > 0
+        for kw in alloc.keywords
+    ]
+    search_results = dict(zip(
+        [(i, kw) for i, kw, _ in search_jobs],
+        fetch_all([partial(search_kakao_paged, kw, limit) for _, kw, limit in search_jobs]),
+    ))
+
+    for i, alloc in enumerate(allocations):
         tag_name = alloc.tag_name
         weight = alloc.weight
         target_count = alloc.count
@@ -47,54 +59,49 @@ def collector_node_kakao(state: AgentState):
         if search_limit > 15: search_limit = 15
 
         print(f"   🔎 [Collect] '{tag_name}' (Weight {weight}) | 키워드당 {search_limit}개 검색 시작...")
-        for kw in keywords:
-            places = search_kakao(kw, search_limit)
-            for p in places:
-                system_prompt = f"""
-                당신은 검색 결과 검증기입니다.
-                사용자가 입력한 **'검색 키워드'**와 API가 반환한 **'장소 정보'**가 논리적으로 일치하는지 O/X로 판단하세요.
-                [기준 테마]: {tag_name}
-                [기준 키워드]: {kw}
-                
-                [검색된 장소]
-                - 이름: {p['place_name']}
-                - 카테고리: {p['category_name']}
-                
-                [판단 기준]
-                1. **카테고리 일치**: 키워드가 '맛집/식당'인데 '편의점', 'PC방', '재료상'이면 False.
-                2. **지역 일치**: 키워드에 포함된 지역명(예: 종로)과 장소 위치가 터무니없이 다르면 False.
-                3. **폐업/부적합**: 이름에 '폐업', '이전' 등이 포함되어 있으면 False.
-                
-                일치하면 true, 아니면 false를 반환하세요.
-                """
-                message = [SystemMessage(content=system_prompt)]
-
-                result = structured_llm.invoke(message)
-                if not result.satisfy:
-                    print(f"   ⚠️ 장소 '{p['place_name']}'는 기준 미달로 스킵됨.")
-                    continue
-                
-                pid = p['id']
-                
-                # 중복 제거 로직 (이미 수집한 장소면 스킵)
-                if pid in seen_ids: 
-                    continue
-
-                seen_ids.add(pid)
-                
-                place_obj = CandidatePlace(
-                    place_name=p['place_name'],
-                    address=p['road_address_name'] or p['address_name'],
-                    category=p['category_name'],
-                    tag_name=tag_name,
-                    place_url=p['place_url'],
-                    x=float(p['x']),
-                    y=float(p['y']),
-                    weight=weight,
-                    keyword=kw
-                )
-                final_candidates.append(place_obj)
+        # 이미 수집한 장소(id)는 검증 전에 제외
+        batch = [
+            (kw, p)
+            for kw in keywords
+            for p in search_results[(i, kw)]
+            if p['id'] not in seen_ids
+        ]
+
+        # 태그 하나의 장소들을 한 번의 호출로 배치 검증
+        verdicts = validator.validate_batch(tag_name, [
+            {"keyword": kw, "name": p['place_name'], "category": p['category_name'],
+             "source": "kakao", "place_id": p.get('id'), "address": p.get('address_name')}
+            for kw, p in batch
+        ])
+
+        for (kw, p), satisfy in zip(batch, verdicts):
+            if not satisfy:
+                print(f"   ⚠️ 장소 '{p['place_name']}'는 기준 미달로 스킵됨.")
+                continue
+
+            pid = p['id']
+
+            # 중복 제거 로직 (이미 수집한 장소면 스킵)
+            if pid in seen_ids:
+                continue
+
+            seen_ids.add(pid)
+
+            place_obj = CandidatePlace(
+                place_name=p['place_name'],
+                address=p['road_address_name'] or p['address_name'],
+                category=p['category_name'],
+                tag_name=tag_name,
+                place_url=p['place_url'],
+                x=float(p['x']),
+                y=float(p['y']),
+                weight=weight,
+                keyword=kw
+            )
+            final_candidates.append(place_obj)
             
     print(f"✅ 총 {len(final_candidates)}개의 유니크한 장소 후보(Pool) 수집 완료. - KAKAO")
+    print(f"   📦 검색 지표: {search_stats()}")
+    print(f"   🧾 검증 지표: {validator.stats()}")
 
     return {"candidates": final_candidates}
\ No newline at end of file
@@ -0,0 +1,172 @@
+import sys
+from pathlib import Path
+from functools import partial
+from typing import Any, Dict, List, Optional
+
+from state import AgentState, CandidatePlace
+from tools import search_local_places_paged, search_kakao_paged
+# SeoulHunters/shared 공용 모듈 경로 추가
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+from shared.search_client import fetch_all, search_stats
+from shared.geo import naver_xy, kakao_xy, is_same_place
+from agents.agent3_validator import build_place_validator
+
+# --- [Provider별 결과 → 공통 형태로 변환] ---
+# 좌표계를 WGS84 (경도 x, 위도 y) 로 통일한다.
+def _from_naver(item: Dict[str, Any]) -> Dict[str, Any]:
+    x, y = naver_xy(item)
+    return {
+        "source": "naver",
+        "place_name": item.get("title") or "",
+        "address": item.get("roadAddress") or item.get("address") or "",
+        "category": item.get("category") or "",
+        "place_url": item.get("link") or "",
+        "x": x,
+        "y": y,
+    }
+
+def _from_kakao(doc: Dict[str, Any]) -> Dict[str, Any]:
+    x, y = kakao_xy(doc)
+    return {
+        "source": "kakao",
+        "place_name": doc.get("place_name") or "",
+        "address": doc.get("road_address_name") or doc.get("address_name") or "",
+        "category": doc.get("category_name") or "",
+        "place_url": doc.get("place_url") or "",
+        "x": x,
+        "y": y,
+    }
+
+def _find_same(place: Dict[str, Any], pool: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    for other in pool:
+        if is_same_place(
+            place["place_name"], (place["x"], place["y"]), other["place_name"], (other["x"], other["y"]),
+            address_a=place["address"], address_b=other["address"],
+        ):
+            return other
+    return None
+
+def _merge_into(base: Dict[str, Any], other: Dict[str, Any]):
+    """같은 장소로 판정된 두 결과 병합: Kakao(WGS84 원본 좌표, 지도 URL) 값을 우선, 빈 값은 채움"""
+    if base["source"] == "naver" and other["source"] == "kakao":
+        for key in ("place_name", "address", "category", "place_url", "x", "y"):
+            if other[key]:
+                base[key] = other[key]
+        base["source"] = "kakao+naver"
+    else:
+        for key in ("address", "category", "place_url"):
+            if not base[key] and other[key]:
+                base[key] = other[key]
+        if other["source"] not in base["source"]:
+            base["source"] += "+" + other["source"]
+
+def merge_provider_results(naver_items: List[Dict[str, Any]], kakao_docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    한 키워드에 대한 Naver / Kakao 결과를 합친다.
+    - 이름 유사도 + 수십 m 이내 거리면 같은 장소로 보고 하나로 병합.
+    - 순서는 provider 결과를 번갈아 가며 (양쪽 상위 결과가 골고루 앞에 오도록)
+    """
+    merged: List[Dict[str, Any]] = []
+    kakao_list = [_from_kakao(d) for d in kakao_docs]
+    naver_list = [_from_naver(i) for i in naver_items]
+
+    for idx in range(max(len(kakao_list), len(naver_list))):
+        for source_list in (kakao_list, naver_list):
+            if idx >= len(source_list):
+                continue
+            place = source_list[idx]
+            same = _find_same(place, merged)
+            if same is not None:
+                _merge_into(same, place)
+            else:
+                merged.append(dict(place))
+    return merged
+
+def collector_node_multi(state: AgentState):
+    print("\n🏃 --- [Agent 3] 장소 수집 및 검증중 NAVER + KAKAO ---")
+
+    strategy = state.get('strategy')
+    preferences = state.get('preferences')
+
+    if not strategy or not preferences:
+        print("🚨 전략(Strategy) 또는 선호도(Preferences)가 없습니다.")
+        return {}
+
+    # 1. 검증기 초기화 (VALIDATOR_BACKEND: llm / lexical / offline)
+    validator = build_place_validator('gpt-4o-mini')
+
+    # 2. 가중치 높은 순으로 정렬
+    allocations = sorted(
+        strategy.allocations,
+        key=lambda x: x.weight,
+        reverse=True
+    )
+
+    # 3. 모든 (태그, 키워드) 를 Naver / Kakao 양쪽에 한 번에 동시 검색
+    search_jobs = [
+        (i, kw, min(15, alloc.count))
+        for i, alloc in enumerate(allocations) if alloc.count > 0
+        for kw in alloc.keywords
+    ]
+    calls = []
+    for _, kw, limit in search_jobs:
+        calls.append(partial(search_local_places_paged, kw, limit))
+        calls.append(partial(search_kakao_paged, kw, limit))
+    raw_results = fetch_all(calls)
+
+    search_results = {}
+    for j, (i, kw, _) in enumerate(search_jobs):
+        search_results[(i, kw)] = merge_provider_results(raw_results[2 * j], raw_results[2 * j + 1])
+
+    final_candidates: List[CandidatePlace] = []
+    accepted: List[Dict[str, Any]] = []   # 전체 키워드에 걸친 중복 제거용 (지리 기반)
+
+    for i, alloc in enumerate(allocations):
+        tag_name = alloc.tag_name
+        weight = alloc.weight
+        keywords = alloc.keywords
+
+        if alloc.count <= 0: continue
+
+        search_limit = min(15, alloc.count)
+        print(f"   🔎 [Collect] '{tag_name}' (W:{weight}) | 키워드: {keywords[0]} 등... (목표 {search_limit}개, Naver+Kakao)")
+
+        # 다른 키워드/태그에서 이미 수집한 장소는 검증 전에 제외
+        batch = [
+            (kw, p)
+            for kw in keywords
+            for p in search_results[(i, kw)]
+            if _find_same(p, accepted) is None
+        ]
+
+        # --- [LLM 검증 단계] 태그 하나의 장소들을 한 번의 호출로 배치 검증 ---
+        verdicts = validator.validate_batch(tag_name, [
+            {"keyword": kw, "name": p['place_name'], "category": p['category'],
+             "source": p['source'], "address": p['address']}
+            for kw, p in batch
+        ])
+
+        for (kw, p), satisfy in zip(batch, verdicts):
+            if not satisfy: continue
+            # 같은 태그 안 다른 키워드에서 방금 수집한 장소면 스킵
+            if _find_same(p, accepted) is not None: continue
+
+            # --- [수집 성공] ---
+            accepted.append(p)
+            final_candidates.append(CandidatePlace(
+                place_name=p['place_name'],
+                address=p['address'],
+                category=p['category'],
+                tag_name=tag_name,
+                place_url=p['place_url'],
+                x=p['x'],
+                y=p['y'],
+                weight=weight,
+                keyword=kw
+            ))
+
+    print(f"✅ 총 {len(final_candidates)}개의 장소 후보 수집 완료. - NAVER + KAKAO")
+    print(f"   📦 검색 지표: {search_stats()}")
+    print(f"   🧾 검증 지표: {validator.stats()}")
+
+    return {"candidates": final_candidates}
@@ -1,120 +1,117 @@
-from typing import List, Set
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import SystemMessage
-from pydantic import BaseModel, Field
+import sys
+from pathlib import Path
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set
 
 from state import AgentState, CandidatePlace
 # [수정] search_kakao 대신 search_local_places import
-from tools import search_local_places 
+from tools import search_local_places_paged
+# SeoulHunters/shared 공용 모듈 경로 추가
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+from shared.search_client import search_stats
+from agents.agent3_validator import build_place_validator
 
-# 검증용 출력 스키마
-class Satisfied(BaseModel):
-    satisfy: bool = Field(description="조건 충족 여부 (True/False)")
+# 검색 호출을 동시에 몇 개까지 실행할지 기본값 (COLLECTOR_MAX_IN_FLIGHT 환경변수로 조정, 호출 시점에 읽음)
+DEFAULT_MAX_IN_FLIGHT = 8
 
-def collector_node_naver(state: AgentState):
+def _max_in_flight() -> int:
+    try:
+        return max(1, int(os.environ.get("COLLECTOR_MAX_IN_FLIGHT", DEFAULT_MAX_IN_FLIGHT)))
+    except ValueError:
+        return DEFAULT_MAX_IN_FLIGHT
+
+async def _search(sem: asyncio.Semaphore, keyword: str, limit: int) -> List[Dict[str, Any]]:
+    """키워드 하나 검색 (semaphore 로 동시 검색 수 제한)"""
+    async with sem:
+        return await asyncio.to_thread(search_local_places_paged, keyword, limit) or []
+
+async def acollector_node_naver(state: AgentState, max_in_flight: Optional[int] = None):
     print("\n🏃 --- [Agent 3]장소 수집 및 검증중 NAVER ---")
-    
+
     strategy = state.get('strategy')
     preferences = state.get('preferences')
-    
+
     if not strategy or not preferences:
         print("🚨 전략(Strategy) 또는 선호도(Preferences)가 없습니다.")
         return {}
 
-    # 1. LLM 초기화 (검증용)
-    llm = ChatOpenAI(model='gpt-4o-mini', temperature=0)
-    structured_llm = llm.with_structured_output(Satisfied)
+    # 1. 검증기 초기화 (VALIDATOR_BACKEND: llm / lexical / offline)
+    validator = build_place_validator('gpt-4o-mini')
+    sem = asyncio.Semaphore(max_in_flight or _max_in_flight())
 
     final_candidates: List[CandidatePlace] = []
     seen_ids: Set[str] = set()
-    
+
     # 2. 가중치 높은 순으로 정렬
     allocations = sorted(
-        strategy.allocations, 
-        key=lambda x: x.weight, 
+        strategy.allocations,
+        key=lambda x: x.weight,
         reverse=True
     )
 
+    # 3. 모든 (태그, 키워드) 검색을 한꺼번에 띄운다 (검색 한도: 키워드당 최대 15개, 네이버는 5개씩 페이지로 나눠 받음)
+    jobs = []
     for alloc in allocations:
-        tag_name = alloc.tag_name
-        weight = alloc.weight
-        target_count = alloc.count
-        keywords = alloc.keywords
-
-        if target_count <= 0: continue
-
-        # 검색 한도 (API 페이징 고려 최대 15개)
-        search_limit = min(15, target_count)
-        
-        print(f"   🔎 [Collect] '{tag_name}' (W:{weight}) | 키워드: {keywords[0]} 등... (목표 {search_limit}개)")
-
-        for kw in keywords:
-            # [수정] search_local_places 함수 사용
-            # (tools.py에 정의된 함수 시그니처에 맞춰 호출)
-            places = search_local_places(kw, search_limit)
-            # print("==== DEBUG ====")
-            # print(tag_name)
-            # print("==== KEYWORD ====")
-            # print(kw)
-            # print("==== PLACES ====")
-            # print(places)
-            # print(len(places))
-            # print("==== END PLACES ====")
-            for p in places:
-                # print("---- PLACE ----")
-                # print(p)
-                # API 결과 키값 매핑 (search_local_places의 리턴 형태에 맞춰 조정 필요)
-                # 여기서는 Kakao API 표준 키('id', 'place_name' 등)를 가정합니다.
-                pid = p.get('title') 
-                
-                if pid in seen_ids: continue
-
-                # --- [LLM 검증 단계] ---
-                system_prompt = f"""
-                당신은 검색 결과 검증기입니다.
-                사용자가 입력한 **'검색 키워드'**와 API가 반환한 **'장소 정보'**가 논리적으로 일치하는지 O/X로 판단하세요.
-                [기준 테마]: {tag_name}
-                [기준 키워드]: {kw}
-                
-                [검색된 장소]
-                - 이름: {p.get('title')}
-                - 카테고리: {p.get('category')}
-                
-                [판단 기준]
-                1. **카테고리 일치**: 키워드가 '맛집/식당'인데 '편의점', 'PC방', '재료상'이면 False.
-                2. **지역 일치**: 키워드에 포함된 지역명(예: 종로)과 장소 위치가 터무니없이 다르면 False.
-                3. **폐업/부적합**: 이름에 '폐업', '이전' 등이 포함되어 있으면 False.
-                
-                적합하면 true, 아니면 false를 반환하세요.
-                """
-                # print(p.get('title'))
-                # print(p.get('category'))
-                try:
-                    validation = structured_llm.invoke([SystemMessage(content=system_prompt)])
-                    # print(validation.satisfy)
-                    if not validation.satisfy:
-                        continue
-                except Exception as e:
-                    print(f"      ⚠️ [Error] 검증 중 오류: {e}")
-                    # 에러 시 안전하게 통과 또는 스킵 (여기선 통과)
-
-                # --- [수집 성공] ---
-                seen_ids.add(pid)
-                
-                # CandidatePlace 매핑
-                place_obj = CandidatePlace(
-                    place_name=p.get('title'),
-                    address=p.get('address'),
-                    category=p.get('category'),
-                    tag_name=tag_name,
-                    place_url=p.get('link'),
-                    x=float(p.get('mapx', 0))/10000000,
-                    y=float(p.get('mapy', 0))/10000000,
-                    weight=weight,
-                    keyword=kw
-                )
-                final_candidates.append(place_obj)
+        if alloc.count <= 0: continue
+        search_limit = min(15, alloc.count)
+        print(f"   🔎 [Collect] '{alloc.tag_name}' (W:{alloc.weight}) | 키워드: {alloc.keywords[0]} 등... (목표 {search_limit}개)")
+        for kw in alloc.keywords:
+            jobs.append((alloc, kw, asyncio.create_task(_search(sem, kw, search_limit))))
+
+    # 4. 검증은 원래 순서(가중치 높은 태그 → 키워드 순)대로
+    #    - 이미 수집한 장소(seen_ids)는 검증 전에 제외 → 순차 실행과 같은 결과, 같은 장소를 두 번 검증하지 않음
+    #    - 키워드 1 결과를 검증하는 동안 뒤 키워드들의 검색은 계속 진행된다.
+    #    (API 결과의 title을 장소 ID로 사용)
+    for alloc, kw, task in jobs:
+        places = []
+        for p in await task:
+            pid = p.get('title')
+            if pid in seen_ids or any(q.get('title') == pid for q in places): continue
+            places.append(p)
+        if not places: continue
+
+        verdicts = await asyncio.to_thread(validator.validate_batch, alloc.tag_name, [
+            {"keyword": kw, "name": p.get('title'), "category": p.get('category'),
+             "source": "naver", "address": p.get('address')}
+            for p in places
+        ])
+
+        for p, satisfy in zip(places, verdicts):
+            if not satisfy: continue
+
+            # --- [수집 성공] ---
+            seen_ids.add(p.get('title'))
+
+            # CandidatePlace 매핑
+            place_obj = CandidatePlace(
+                place_name=p.get('title'),
+                address=p.get('address'),
+                category=p.get('category'),
+                tag_name=alloc.tag_name,
+                place_url=p.get('link'),
+                x=float(p.get('mapx', 0))/10000000,
+                y=float(p.get('mapy', 0))/10000000,
+                weight=alloc.weight,
+                keyword=kw
+            )
+            final_candidates.append(place_obj)
 
     print(f"✅ 총 {len(final_candidates)}개의 장소 후보 수집 완료. - NAVER")
-    
-    return {"candidates": final_candidates}
\ No newline at end of file
+    print(f"   📦 검색 지표: {search_stats()}")
+    print(f"   🧾 검증 지표: {validator.stats()}")
+
+    return {"candidates": final_candidates}
+
+def collector_node_naver(state: AgentState):
+    """
+    동기 그래프(app.stream / app.invoke)용 래퍼. 비동기 그래프에서는 acollector_node_naver를 바로 등록하면 된다.
+    - 이미 이벤트 루프가 돌고 있는 스레드(노트북, async 서버)에서는 asyncio.run 을 쓸 수 없으므로 별도 스레드에서 실행
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(acollector_node_naver(state))
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, acollector_node_naver(state)).result()
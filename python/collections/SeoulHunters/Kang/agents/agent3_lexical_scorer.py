@@ -0,0 +1,186 @@
+"""
+agent3_lexical_scorer.py - Agent 3 로컬 관련도 점수기 (네트워크/LLM 없음)
+
+역할:
+- "이 장소가 키워드 X에 맞는가?"를 LLM 대신 문자 n-gram TF-IDF 코사인 유사도로 점수화한다.
+  · 문서 = 장소 이름 + 카테고리 ("홍길동식당 음식점 > 한식")
+  · 질의 = 키워드에서 지역명(맨 앞 토큰, allocator의 "[지역명] + [단순명사]" 규칙)을 뺀 부분, 태그 이름,
+           태그 계열(맛집/카페/쇼핑/관광)의 통과 카테고리/별칭 하나하나 (= prototype 여러 개)
+  · 점수 = 문서와 prototype들 사이 코사인 유사도의 최댓값
+  · IDF는 category taxonomy 전체를 배경 코퍼스로 한 번만 계산 → 배치 구성과 상관없이 같은 점수
+- 배치 전체를 (장소 수 x 해시 차원) 행렬로 만들어 numpy로 한 번에 계산한다.
+- 두 개의 임계값으로 판정: score >= accept_threshold (+ 키워드 지역명이 주소에 있음) → True, score < reject_threshold → False,
+  그 사이(borderline)는 None → LLM 검증으로 넘긴다. (calibrate()로 라벨 데이터에 맞춰 조정 가능)
+
+사용 예시:
+
+    scorer = LexicalScorer()
+    scores = scorer.score_batch("맛집", items)     # np.ndarray
+    verdicts = scorer.judge_batch("맛집", items)   # [True, None, False, ...]
+"""
+
+import threading
+import zlib
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from agents.agent3_category_filter import COMMON_REJECT, FAMILY_ALIASES, TAXONOMY, CategoryFilter, in_area
+
+HASH_DIM = 1 << 12
+NGRAM_RANGE = (2, 3)
+
+DEFAULT_ACCEPT_THRESHOLD = 0.35
+DEFAULT_REJECT_THRESHOLD = 0.10
+
+
+def _normalize(text: str) -> str:
+    return "".join((text or "").lower().replace(">", " ").replace(",", " ").split())
+
+
+def _ngram_ids(text: str) -> List[int]:
+    norm = _normalize(text)
+    ids = []
+    for n in range(NGRAM_RANGE[0], NGRAM_RANGE[1] + 1):
+        for i in range(len(norm) - n + 1):
+            ids.append(zlib.crc32(norm[i:i + n].encode("utf-8")) % HASH_DIM)
+    return ids
+
+
+def topic_of(keyword: str) -> str:
+    """'연남동 파스타' → '파스타' (지역명 제거). 토큰이 하나면 그대로"""
+    tokens = (keyword or "").split()
+    return " ".join(tokens[1:]) if len(tokens) > 1 else (keyword or "")
+
+
+class LexicalScorer:
+    def __init__(
+        self,
+        accept_threshold: float = DEFAULT_ACCEPT_THRESHOLD,
+        reject_threshold: float = DEFAULT_REJECT_THRESHOLD,
+        category_filter: Optional[CategoryFilter] = None,
+    ):
+        self.accept_threshold = accept_threshold
+        self.reject_threshold = reject_threshold
+        self.category_filter = category_filter or CategoryFilter()
+
+        # 배경 코퍼스(taxonomy 카테고리 + 계열 별칭)로 IDF 계산
+        background = [c for rules in TAXONOMY.values() for c, _ in rules] + COMMON_REJECT
+        background += [" ".join(aliases) for aliases in FAMILY_ALIASES.values()]
+        df = np.zeros(HASH_DIM)
+        for doc in background:
+            df[list(set(_ngram_ids(doc)))] += 1
+        self.idf = np.log((1 + len(background)) / (1 + df)) + 1.0
+
+        # 계열별 질의 확장 prototype (통과 카테고리 + 별칭)
+        self.expansions: Dict[str, List[str]] = {
+            family: [c for c, verdict in TAXONOMY[family] if verdict] + FAMILY_ALIASES[family]
+            for family in TAXONOMY
+        }
+
+        self._lock = threading.Lock()   # category filter 와 같이 여러 collector 스레드에서 공유
+        self.scored = 0
+        self.accepted = 0
+        self.rejected = 0
+        self.borderline = 0
+
+    def _vectorize(self, texts: Sequence[str]) -> np.ndarray:
+        """texts → L2 정규화된 TF-IDF 행렬 (len(texts) x HASH_DIM)"""
+        matrix = np.zeros((len(texts), HASH_DIM))
+        for row, text in enumerate(texts):
+            ids = _ngram_ids(text)
+            if ids:
+                np.add.at(matrix[row], ids, 1.0)
+        np.log1p(matrix, out=matrix)   # sublinear tf
+        matrix *= self.idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def _prototypes(self, tag_name: str, keyword: str) -> List[str]:
+        family = self.category_filter.family_of(keyword, tag_name)
+        return [topic_of(keyword), tag_name] + (self.expansions[family] if family else [])
+
+    def score_batch(self, tag_name: str, items: List[Dict[str, Any]]) -> np.ndarray:
+        """items: [{"keyword", "name", "category"}, ...] → 0~1 코사인 점수 배열"""
+        if not items:
+            return np.zeros(0)
+        d_matrix = self._vectorize([f"{it['name']} {it['category']}" for it in items])
+        scores = np.zeros(len(items))
+
+        # 같은 키워드(배치 안에 보통 몇 개)끼리 묶어서 (문서 x prototype) 행렬곱 한 번
+        groups: Dict[str, List[int]] = {}
+        for idx, it in enumerate(items):
+            groups.setdefault(it["keyword"], []).append(idx)
+        for keyword, rows in groups.items():
+            p_matrix = self._vectorize(self._prototypes(tag_name, keyword))
+            scores[rows] = (d_matrix[rows] @ p_matrix.T).max(axis=1)
+
+        with self._lock:
+            self.scored += len(items)
+        return scores
+
+    def judge_batch(self, tag_name: str, items: List[Dict[str, Any]]) -> List[Optional[bool]]:
+        """True(통과) / False(탈락) / None(borderline)"""
+        scores = self.score_batch(tag_name, items)
+        verdicts: List[Optional[bool]] = []
+        for it, score in zip(items, scores):
+            if score >= self.accept_threshold and in_area(it["keyword"], it["name"], it.get("address") or ""):
+                # 지역명이 주소에 없으면 점수가 높아도 borderline → 지역 일치는 LLM이 판단
+                verdicts.append(True)
+            elif score < self.reject_threshold and self.category_filter.family_of(it["keyword"], tag_name):
+                # 계열을 모르는 태그는 확장 질의가 없어 점수가 낮게 나오므로 탈락시키지 않는다
+                verdicts.append(False)
+            else:
+                verdicts.append(None)
+        with self._lock:
+            self.accepted += verdicts.count(True)
+            self.rejected += verdicts.count(False)
+            self.borderline += verdicts.count(None)
+        return verdicts
+
+    def calibrate(self, tag_names: List[str], items: List[Dict[str, Any]], labels: List[bool], target_precision: float = 0.95):
+        """
+        라벨(LLM 판정 기록 등)에 맞춰 임계값 조정.
+        - accept_threshold: 그 이상을 통과시켰을 때 precision >= target 이 되는 가장 낮은 점수
+        - reject_threshold: 그 미만을 탈락시켰을 때 precision >= target 이 되는 가장 높은 점수
+          (accept_threshold 를 넘지 않도록 자름)
+        """
+        # 태그별로 묶어서 score_batch 한 번씩 (장소마다 행렬을 따로 만들지 않게)
+        scores = np.zeros(len(items))
+        by_tag: Dict[str, List[int]] = {}
+        for idx, tag in enumerate(tag_names):
+            by_tag.setdefault(tag, []).append(idx)
+        for tag, rows in by_tag.items():
+            scores[rows] = self.score_batch(tag, [items[i] for i in rows])
+        labels_arr = np.array(labels, dtype=bool)
+        order = np.argsort(-scores)
+        s_sorted, l_sorted = scores[order], labels_arr[order]
+
+        # 위에서부터 누적 precision
+        precision_top = np.cumsum(l_sorted) / np.arange(1, len(l_sorted) + 1)
+        ok = np.where(precision_top >= target_precision)[0]
+        if len(ok):
+            self.accept_threshold = float(s_sorted[ok.max()])
+
+        # 아래에서부터 누적 (탈락) precision
+        precision_bottom = np.cumsum(~l_sorted[::-1]) / np.arange(1, len(l_sorted) + 1)
+        ok = np.where(precision_bottom >= target_precision)[0]
+        if len(ok):
+            # 같은 점수 경계 문제를 피하려고 살짝 위로
+            self.reject_threshold = float(s_sorted[::-1][ok.max()]) + 1e-9
+
+        # 두 구간이 겹치면 (탈락 기준 > 통과 기준) borderline 구간을 0으로 → 같은 점수가 통과/탈락 둘 다 되지 않게
+        self.reject_threshold = min(self.reject_threshold, self.accept_threshold)
+        return {"accept_threshold": self.accept_threshold, "reject_threshold": self.reject_threshold}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "scored": self.scored,
+                "accepted": self.accepted,
+                "rejected": self.rejected,
+                "borderline": self.borderline,
+                "accept_threshold": round(self.accept_threshold, 3),
+                "reject_threshold": round(self.reject_threshold, 3),
+            }
@@ -0,0 +1,236 @@
+"""
+agent3_validator.py - Agent 3 검색 결과 검증기 (LLM)
+
+- 기존: 장소 1개마다 structured_llm.invoke 1번 (여행 1건에 50~150번 순차 호출)
+- 배치: 한 태그(allocation)의 장소들을 한 번의 structured call로 보내고 장소별 판정을 받는다.
+  출력 파싱이 실패하거나 판정이 빠지면 배치를 반으로 나눠 다시 시도하고,
+  1개까지 내려가면 기존 단건 검증으로 처리한다.
+- 사전 필터: CategoryFilter를 넘기면 카테고리 규칙으로 확실한 통과/탈락은 LLM 없이 판정하고
+  애매한 장소만 아래 단계로 넘긴다.
+- 캐시: VerdictCache를 넘기면 (장소 키, tag_name, 키워드 클래스) 판정을 먼저 찾아보고
+  없는 장소만 LLM에 보낸다. LLM 오류로 "안전하게 통과"된 판정은 저장하지 않는다.
+  판정은 모델마다 다를 수 있어 키에 검증 모델 이름을 넣는다 (kakao: gpt-4.1-mini, naver/multi: gpt-4o-mini).
+- 로컬 점수기: LexicalScorer를 넘기면 점수가 확실한 장소는 바로 판정하고 borderline만 LLM에 보낸다.
+  llm=None(offline)이면 borderline도 LLM 없이 통과시킨다.
+
+검증 backend (환경변수 VALIDATOR_BACKEND, build_place_validator 에서 사용):
+- llm     (기본) : 규칙 필터 → 캐시 → LLM
+- lexical        : 규칙 필터 → 캐시 → 로컬 점수기 → borderline만 LLM
+- offline        : 규칙 필터 → 캐시 → 로컬 점수기 (네트워크 호출 없음, borderline은 통과)
+
+사용 예시:
+
+    validator = build_place_validator('gpt-4o-mini')   # 또는 PlaceValidator(llm, cache=..., prefilter=..., scorer=...)
+    verdicts = validator.validate_batch(tag_name, [
+        {"keyword": "연남동 맛집", "name": "...", "category": "음식점 > 한식",
+         "source": "kakao", "place_id": "12345", "address": "..."},  # 캐시 키용 (선택)
+        ...
+    ])  # -> [True, False, ...]
+"""
+
+import sys
+from pathlib import Path
+import hashlib
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+from langchain_core.messages import SystemMessage
+from pydantic import BaseModel, Field
+
+# SeoulHunters/shared 공용 모듈 경로 추가
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+from shared.llm_registry import get_llm
+
+from agents.agent3_category_filter import CATEGORY_FILTER, CategoryFilter
+from agents.agent3_verdict_cache import VerdictCache, get_verdict_cache, make_verdict_key, place_key
+
+if TYPE_CHECKING:   # 점수기는 numpy 가 필요해서 lexical/offline backend 에서만 import
+    from agents.agent3_lexical_scorer import LexicalScorer
+
+DEFAULT_BATCH_SIZE = 30
+BACKENDS = ("llm", "lexical", "offline")
+
+# --- [출력 스키마] ---
+class Satisfied(BaseModel):
+    satisfy: bool = Field(description="조건 충족 여부 (True/False)")
+
+class PlaceVerdict(BaseModel):
+    index: int = Field(description="장소 번호 (입력 리스트의 번호 그대로)")
+    satisfy: bool = Field(description="조건 충족 여부 (True/False)")
+
+class BatchVerdicts(BaseModel):
+    verdicts: List[PlaceVerdict] = Field(description="입력된 모든 장소에 대한 판정 리스트 (빠짐없이)")
+
+
+# --- [프롬프트] ---
+JUDGE_RULES = """
+[판단 기준]
+1. **카테고리 일치**: 키워드가 '맛집/식당'인데 '편의점', 'PC방', '재료상'이면 False.
+2. **지역 일치**: 키워드에 포함된 지역명(예: 종로)과 장소 위치가 터무니없이 다르면 False.
+3. **폐업/부적합**: 이름에 '폐업', '이전' 등이 포함되어 있으면 False.
+"""
+
+# 판정 기준이 바뀌면 캐시 키도 바뀌도록
+RULES_VERSION = hashlib.sha1(JUDGE_RULES.encode("utf-8")).hexdigest()[:8]
+
+def build_single_prompt(tag_name: str, keyword: str, name: str, category: str) -> str:
+    return f"""
+    당신은 검색 결과 검증기입니다.
+    사용자가 입력한 **'검색 키워드'**와 API가 반환한 **'장소 정보'**가 논리적으로 일치하는지 O/X로 판단하세요.
+    [기준 테마]: {tag_name}
+    [기준 키워드]: {keyword}
+
+    [검색된 장소]
+    - 이름: {name}
+    - 카테고리: {category}
+    {JUDGE_RULES}
+    적합하면 true, 아니면 false를 반환하세요.
+    """
+
+def build_batch_prompt(tag_name: str, items: List[Dict[str, Any]]) -> str:
+    lines = "\n".join(
+        f"{i}. 키워드: {it['keyword']} | 이름: {it['name']} | 카테고리: {it['category']}"
+        for i, it in enumerate(items)
+    )
+    return f"""
+    당신은 검색 결과 검증기입니다.
+    아래 각 장소마다, 해당 **'검색 키워드'**와 API가 반환한 **'장소 정보'**가 논리적으로 일치하는지 O/X로 판단하세요.
+    [기준 테마]: {tag_name}
+
+    [검색된 장소 리스트] (번호. 키워드 | 이름 | 카테고리)
+    {lines}
+    {JUDGE_RULES}
+    **0번부터 {len(items) - 1}번까지 모든 장소**에 대해 index와 satisfy(true/false)를 빠짐없이 반환하세요.
+    """
+
+
+def verdict_key(tag_name: str, item: Dict[str, Any], rules_version: str = RULES_VERSION) -> str:
+    place = place_key(item.get("source", ""), item.get("place_id"), item.get("name", ""), item.get("address", ""))
+    return make_verdict_key(place, tag_name, item.get("keyword", ""), rules_version)
+
+
+class PlaceValidator:
+    def __init__(
+        self,
+        llm,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        cache: Optional[VerdictCache] = None,
+        prefilter: Optional[CategoryFilter] = None,
+        scorer: Optional["LexicalScorer"] = None,
+        model: str = "",
+    ):
+        self.batch_size = batch_size
+        # 판정 기준 + 검증 모델이 같을 때만 캐시 판정을 재사용
+        self.rules_version = f"{RULES_VERSION}:{model}" if model else RULES_VERSION
+        self.cache = cache
+        self.prefilter = prefilter
+        self.scorer = scorer
+        self.single_llm = llm.with_structured_output(Satisfied) if llm is not None else None
+        self.batch_llm = llm.with_structured_output(BatchVerdicts) if llm is not None else None
+
+    def validate_one(self, tag_name: str, keyword: str, name: str, category: str) -> bool:
+        verdict = self._judge_one(tag_name, keyword, name, category)
+        return True if verdict is None else verdict  # 에러 시 안전하게 통과
+
+    def _judge_one(self, tag_name: str, keyword: str, name: str, category: str) -> Optional[bool]:
+        if self.single_llm is None:
+            return None
+        try:
+            result = self.single_llm.invoke([SystemMessage(content=build_single_prompt(tag_name, keyword, name, category))])
+            return result.satisfy
+        except Exception as e:
+            print(f"      ⚠️ [Error] 검증 중 오류: {e}")
+            return None
+
+    def validate_batch(self, tag_name: str, items: List[Dict[str, Any]]) -> List[bool]:
+        """items: [{"keyword", "name", "category", (source, place_id, address)}, ...] → 같은 순서의 판정 리스트"""
+        verdicts: List[Optional[bool]] = [None] * len(items)
+
+        # 1. 카테고리 규칙으로 확실한 것부터 판정
+        pending = list(range(len(items)))
+        if self.prefilter is not None:
+            for idx, item in enumerate(items):
+                verdicts[idx] = self.prefilter.judge(item["keyword"], tag_name, item["name"], item["category"], item.get("address") or "")
+            pending = [idx for idx in pending if verdicts[idx] is None]
+
+        # 2. 캐시에서 찾기
+        keys: Dict[int, str] = {}
+        if self.cache is not None:
+            misses = []
+            for idx in pending:
+                keys[idx] = verdict_key(tag_name, items[idx], self.rules_version)
+                verdicts[idx] = self.cache.get(keys[idx])
+                if verdicts[idx] is None:
+                    misses.append(idx)
+            pending = misses
+
+        # 3. 로컬 점수기로 확실한 것 판정 (배치 전체를 한 번에)
+        if self.scorer is not None and pending:
+            scored = self.scorer.judge_batch(tag_name, [items[idx] for idx in pending])
+            for idx, verdict in zip(pending, scored):
+                verdicts[idx] = verdict
+            pending = [idx for idx, verdict in zip(pending, scored) if verdict is None]
+
+        # 4. 그래도 못 정한 장소만 LLM 배치 검증 (offline이면 건너뜀)
+        if self.batch_llm is None:
+            pending = []
+        for start in range(0, len(pending), self.batch_size):
+            chunk_idx = pending[start:start + self.batch_size]
+            results = self._validate_chunk(tag_name, [items[idx] for idx in chunk_idx])
+            for idx, verdict in zip(chunk_idx, results):
+                verdicts[idx] = verdict
+                if verdict is not None and self.cache is not None:
+                    self.cache.set(keys[idx], tag_name, verdict)
+
+        return [True if v is None else v for v in verdicts]  # 에러 시 안전하게 통과
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "prefilter": self.prefilter.stats() if self.prefilter is not None else None,
+            "cache": self.cache.stats() if self.cache is not None else None,
+            "scorer": self.scorer.stats() if self.scorer is not None else None,
+        }
+
+    def _validate_chunk(self, tag_name: str, chunk: List[Dict[str, Any]]) -> List[Optional[bool]]:
+        if not chunk:
+            return []
+        if len(chunk) == 1:
+            item = chunk[0]
+            return [self._judge_one(tag_name, item["keyword"], item["name"], item["category"])]
+
+        try:
+            result = self.batch_llm.invoke([SystemMessage(content=build_batch_prompt(tag_name, chunk))])
+            by_index = {v.index: v.satisfy for v in result.verdicts}
+            if all(i in by_index for i in range(len(chunk))):
+                return [by_index[i] for i in range(len(chunk))]
+            print(f"      ⚠️ [Batch] 판정 누락 ({len(by_index)}/{len(chunk)}) → 배치 분할 후 재시도")
+        except Exception as e:
+            print(f"      ⚠️ [Batch] 출력 파싱 실패 → 배치 분할 후 재시도: {e}")
+
+        mid = len(chunk) // 2
+        return self._validate_chunk(tag_name, chunk[:mid]) + self._validate_chunk(tag_name, chunk[mid:])
+
+
+_validators: Dict[Tuple[str, str], PlaceValidator] = {}
+_validators_lock = threading.Lock()
+
+def build_place_validator(model: str, backend: Optional[str] = None) -> PlaceValidator:
+    """
+    collector용 검증기 (backend 미지정 시 VALIDATOR_BACKEND 환경변수, 기본 llm)
+    - (model, backend) 별로 한 번만 만들어 재사용 (LLM은 shared/llm_registry 에서)
+    """
+    backend = (backend or os.environ.get("VALIDATOR_BACKEND", "llm")).lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"알 수 없는 VALIDATOR_BACKEND: {backend} (가능: {BACKENDS})")
+
+    with _validators_lock:
+        validator = _validators.get((model, backend))
+        if validator is None:
+            scorer = None
+            if backend in ("lexical", "offline"):
+                from agents.agent3_lexical_scorer import LexicalScorer
+                scorer = LexicalScorer(category_filter=CATEGORY_FILTER)
+            llm = get_llm(model, temperature=0) if backend != "offline" else None
+            validator = PlaceValidator(llm, cache=get_verdict_cache(), prefilter=CATEGORY_FILTER, scorer=scorer, model=model)
+            _validators[(model, backend)] = validator
+    return validator
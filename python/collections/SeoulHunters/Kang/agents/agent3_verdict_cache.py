@@ -0,0 +1,128 @@
+"""
+agent3_verdict_cache.py - Agent 3 검증 결과(verdict) 디스크 캐시 (SQLite)
+
+역할:
+- 인기 장소(예: 성수 카페)가 세션마다 같은 태그로 LLM 검증을 다시 받지 않도록
+  (장소 키, tag_name, 키워드 클래스) → True/False 판정을 SQLite 파일에 저장해 두고 재사용한다.
+- 장소 키: provider 장소 id (카카오 id) 가 있으면 그것, 없으면 정규화한 이름 + 주소 (네이버)
+- 키워드 클래스: 공백/대소문자/어순을 정리한 키워드 ("성수 카페" == "카페  성수")
+- 판정 기준(JUDGE_RULES)이나 검증 모델이 바뀌면 rules_version이 달라져 예전 판정은 자동으로 안 쓰인다.
+  (collector마다 검증 모델이 달라도 캐시 파일은 하나를 같이 쓴다)
+- TTL, 최대 개수 기반 LRU 제거, hit/miss 카운터, invalidate() 훅 제공. (공통 부분은 shared/sqlite_cache.py)
+
+환경변수:
+- VERDICT_CACHE_PATH : 저장 위치 (기본 ~/.cache/seoulhunters/verdict_cache.sqlite3, "off"면 사용 안 함)
+- VERDICT_CACHE_TTL  : 유효 시간(초, 기본 7일)
+
+사용 예시:
+
+    cache = get_verdict_cache()
+    key = make_verdict_key(place_key("kakao", doc_id, name, address), tag_name, keyword)
+    verdict = cache.get(key)          # True / False / None(없음)
+    if verdict is None:
+        verdict = llm_judge(...)
+        cache.set(key, tag_name, verdict)
+"""
+
+import sys
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# SeoulHunters/shared 공용 모듈 경로 추가
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+from shared.geo import normalize_place_name
+from shared.sqlite_cache import SQLiteCache
+
+DEFAULT_VERDICT_CACHE_PATH = "~/.cache/seoulhunters/verdict_cache.sqlite3"
+DEFAULT_VERDICT_TTL = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 50000
+
+
+def keyword_class(keyword: str) -> str:
+    """키워드 정규화: 소문자 + 토큰 정렬 (어순/공백 차이는 같은 클래스로)"""
+    return " ".join(sorted((keyword or "").lower().split()))
+
+
+def place_key(source: str, place_id: Optional[str], name: str, address: str) -> str:
+    """provider 장소 id가 있으면 id, 없으면 정규화된 이름 + 주소"""
+    if place_id:
+        return f"{source}:{place_id}"
+    return f"addr:{normalize_place_name(name)}|{normalize_place_name(address)}"
+
+
+def make_verdict_key(place: str, tag_name: str, keyword: str, rules_version: str = "") -> str:
+    return "\t".join((rules_version, place, tag_name, keyword_class(keyword)))
+
+
+class VerdictCache(SQLiteCache):
+    """
+    검증 판정용 SQLite TTL + LRU 캐시 (저장/만료/LRU 는 shared/sqlite_cache.SQLiteCache).
+    - 여러 스레드(비동기 collector의 to_thread, Gradio 세션)에서 같이 써도 되도록 lock으로 감싼다.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_VERDICT_CACHE_PATH,
+        ttl: float = DEFAULT_VERDICT_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        super().__init__(
+            path, table="verdicts", group_column="tag_name", max_entries=max_entries,
+            value_column="satisfy", value_type="INTEGER",
+        )
+        self.ttl = ttl
+
+    def get(self, key: str) -> Optional[bool]:
+        """캐시에 있고 TTL 안이면 판정을, 아니면 None을 돌려준다."""
+        satisfy = self._get(key, "verdict", self.ttl)
+        return bool(satisfy) if satisfy is not None else None
+
+    def set(self, key: str, tag_name: str, satisfy: bool):
+        self._set(key, tag_name, int(bool(satisfy)))
+
+    def invalidate(self, tag_name: Optional[str] = None, place: Optional[str] = None):
+        """
+        무효화 훅
+        - tag_name 지정: 해당 태그 판정만 삭제 (태그 정의를 바꿨을 때)
+        - place 지정: 해당 장소(place_key 값) 판정만 삭제 (폐업/잘못된 판정 신고 등)
+        - 둘 다 없으면 전체 삭제
+        """
+        clauses, args = [], []
+        if tag_name:
+            clauses.append("tag_name = ?")
+            args.append(tag_name)
+        if place:
+            clauses.append("instr(key, ?) > 0")
+            args.append("\t" + place + "\t")
+        self._delete(" AND ".join(clauses), args)
+
+    def stats(self) -> Dict[str, Any]:
+        return self.totals()
+
+
+# ---------------------------------------------------------
+# 환경변수 기반 전역 캐시
+# ---------------------------------------------------------
+_verdict_cache: Optional[VerdictCache] = None
+_verdict_cache_loaded = False
+_verdict_cache_lock = threading.Lock()
+
+
+def get_verdict_cache() -> Optional[VerdictCache]:
+    """VERDICT_CACHE_PATH가 off면 None, 아니면 프로세스 전역 VerdictCache"""
+    global _verdict_cache, _verdict_cache_loaded
+    if not _verdict_cache_loaded:
+        with _verdict_cache_lock:
+            if not _verdict_cache_loaded:
+                path = os.environ.get("VERDICT_CACHE_PATH", DEFAULT_VERDICT_CACHE_PATH)
+                if path and path.lower() != "off":
+                    try:
+                        ttl = float(os.environ.get("VERDICT_CACHE_TTL", DEFAULT_VERDICT_TTL))
+                        _verdict_cache = VerdictCache(path, ttl=ttl)
+                    except Exception as e:
+                        # 캐시 파일을 못 열어도 검증 자체는 되도록
+                        print(f"   ⚠️ 검증 캐시를 열 수 없어 캐시 없이 진행합니다: {e}")
+                _verdict_cache_loaded = True
+    return _verdict_cache
@@ -1,6 +1,11 @@
+import sys
+from pathlib import Path
 import json
 from typing import List
-from langchain_openai import ChatOpenAI
+# SeoulHunters/shared 공용 모듈 경로 추가
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+from shared.llm_registry import get_structured_llm
+from shared.spatial_index import get_spatial_index
 from langchain_core.messages import SystemMessage
 from pydantic import BaseModel, Field
 
@@ -69,9 +74,8 @@ def agent4_suggest_node(state: AgentState):
         print("   ⚠️ 후보군(Pool)이 없습니다.")
         return {}
 
-    # LLM 설정
-    llm = ChatOpenAI(model='gpt-4o', temperature=0.7)
-    structured_llm = llm.with_structured_output(SuggestionOutput)
+    # LLM 설정 (temperature 0.7 → 재추천마다 다른 결과가 나와야 하므로 LLM 캐시 대상 아님)
+    structured_llm = get_structured_llm('gpt-4o', SuggestionOutput, temperature=0.7)
 
     # --- [모드 결정 및 데이터 준비] ---
     
@@ -145,5 +149,8 @@ def agent4_suggest_node(state: AgentState):
 
     print(f"   ✅ {len(main_candidates)}개 장소 선정 완료.")
     
+    # 공간 인덱스는 풀 기준으로 한 번만 만들고, state 에는 key만 (Agent 5 / 재계획에서 참조)
+    pool_index_key, _ = get_spatial_index([(p.x, p.y) for p in place_pool], tags=[p.tag_name for p in place_pool])
+
     # State 업데이트 (덮어쓰기)
-    return {"main_place_candidates": main_candidates}
\ No newline at end of file
+    return {"main_place_candidates": main_candidates, "pool_index_key": pool_index_key}
\ No newline at end of file
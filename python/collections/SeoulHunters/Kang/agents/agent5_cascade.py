@@ -0,0 +1,102 @@
+"""
+agent5_cascade.py - Agent 5 모델 캐스케이드 (싼 모델 먼저, 검증 실패 시에만 상위 모델)
+
+역할:
+- 일정 생성은 매번 gpt-4o 로 돌 필요가 없다. 먼저 gpt-4o-mini 로 만들어 보고,
+  결과를 로컬 규칙으로 검증한 뒤 통과하지 못했을 때만 다음 모델로 올린다.
+- 검증 규칙 (validate_itinerary)
+  1. 모든 place_name 이 장소 풀(combined_pool)에 매핑되는가
+  2. 일수 == duration (Day 1 ~ Day N 이 빠짐없이)
+  3. 하루 장소 수가 spots_per_day ± SPOT_TOLERANCE 안인가
+  4. 같은 장소가 두 번 나오지 않는가 (일정 전체 기준)
+- 모델(tier)별 시도/통과/실패 사유/평균 지연을 누적 → cascade_stats() 로 보고 비율 조정
+
+환경변수:
+- AGENT5_MODEL_TIERS : 시도할 모델 순서 (쉼표 구분, 기본 "gpt-4o-mini,gpt-4o")
+
+사용 예시:
+
+    problems = validate_itinerary(result, resolve, duration=2, spots_per_day=5)
+    record_attempt("gpt-4o-mini", problems, elapsed)
+    print(cascade_stats())
+"""
+
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_MODEL_TIERS = "gpt-4o-mini,gpt-4o"
+SPOT_TOLERANCE = 1
+
+MODEL_TIERS: List[str] = [
+    m.strip() for m in os.getenv("AGENT5_MODEL_TIERS", DEFAULT_MODEL_TIERS).split(",") if m.strip()
+]
+
+_lock = threading.Lock()
+_stats: Dict[str, Dict[str, Any]] = {}
+
+
+def validate_itinerary(
+    result: Any,
+    resolve: Callable[[str], Optional[Any]],
+    duration: int,
+    spots_per_day: int,
+) -> List[str]:
+    """LLMItineraryOutput 검증. "사유: 상세" 형태의 문제 목록을 돌려주고, 비어 있으면 통과"""
+    problems: List[str] = []
+
+    days = sorted(d.day for d in result.schedule)
+    if days != list(range(1, duration + 1)):
+        problems.append(f"일수: {days} (기대 1~{duration})")
+
+    seen = set()
+    for day_plan in result.schedule:
+        n_places = len(day_plan.places)
+        if abs(n_places - spots_per_day) > SPOT_TOLERANCE:
+            problems.append(f"장소 수: Day {day_plan.day} {n_places}개 (목표 {spots_per_day}±{SPOT_TOLERANCE})")
+
+        for place_ref in day_plan.places:
+            place = resolve(place_ref.place_name)
+            if place is None:
+                problems.append(f"매핑: '{place_ref.place_name}'")
+                continue
+            if place.place_name in seen:
+                problems.append(f"중복: '{place.place_name}'")
+            seen.add(place.place_name)
+
+    return problems
+
+
+def record_attempt(model: str, problems: Optional[List[str]], elapsed: float):
+    """
+    tier 한 번의 결과 기록.
+    problems=None 은 호출 자체가 실패(예외)한 경우.
+    """
+    with _lock:
+        s = _stats.setdefault(model, {"attempts": 0, "passed": 0, "errors": 0, "seconds": 0.0, "reasons": {}})
+        s["attempts"] += 1
+        s["seconds"] += elapsed
+        if problems is None:
+            s["errors"] += 1
+        elif not problems:
+            s["passed"] += 1
+        else:
+            for reason in {p.split(":")[0] for p in problems}:
+                s["reasons"][reason] = s["reasons"].get(reason, 0) + 1
+
+
+def cascade_stats() -> Dict[str, Dict[str, Any]]:
+    """tier별 통과율 / 평균 지연 / 실패 사유 카운트"""
+    with _lock:
+        report = {}
+        for model, s in _stats.items():
+            attempts = s["attempts"] or 1
+            report[model] = {
+                "attempts": s["attempts"],
+                "passed": s["passed"],
+                "errors": s["errors"],
+                "pass_rate": round(s["passed"] / attempts, 3),
+                "avg_seconds": round(s["seconds"] / attempts, 2),
+                "reasons": dict(s["reasons"]),
+            }
+        return report
@@ -0,0 +1,213 @@
+"""
+agent5_editor.py - 완성된 일정(FinalItinerary)의 부분 수정 (LLM 재생성 없이)
+
+역할:
+- Agent 5 이후의 "2일차 카페 말고 다른 데", "1일차 ○○ 빼줘", "2일차에 맛집 하나 추가해줘" 같은 요청을
+  전체 재생성(gpt-4o) 대신 해당 날짜만 고쳐서 ms 단위로 처리한다.
+  · replace : 대상 장소를 빼고, 공간 인덱스로 대상 근처의 같은 종류 장소를 채움
+  · remove  : 대상 장소만 제거
+  · insert  : 그날 동선 중심 근처의 (요청한 종류) 장소를 추가
+- 수정한 날짜만 shared/scheduler 로 순서/방문 시각을 다시 계산한다.
+  이동 시간 행렬은 풀 전체 기준이라 같은 일정을 여러 번 고쳐도 shared/travel_time 캐시를 그대로 쓴다.
+- 새로 들어간 장소의 짧은 설명만 describe 콜백(LLM 한 문장)으로 만든다.
+
+사용 예시:
+
+    edit = parse_edit("2일차 카페 말고 다른 데", itinerary, pool)
+    new_itinerary, added = apply_edit(itinerary, edit, pool, index, transport="대중교통")
+"""
+
+import sys
+from pathlib import Path
+import re
+from typing import Callable, List, Literal, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+# SeoulHunters/shared 공용 모듈 경로 추가
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+from shared.geo import normalize_place_name
+from shared.scheduler import SLOT_LABELS, match_kind, place_kind, schedule_day
+from shared.travel_time import get_travel_time_matrix
+from state import CandidatePlace, DaySchedule, FinalItinerary, ScheduledPlace
+
+REMOVE_WORDS = ["빼", "삭제", "제외", "없애", "지워"]
+INSERT_WORDS = ["추가", "넣어", "더 넣", "하나 더"]
+REPLACE_WORDS = ["말고", "다른", "바꿔", "바꾸", "대신", "교체", "변경"]
+FILL_WORDS = ["다른"]   # 혼자 오면 교체, '추가'와 같이 오면 ("다른 카페 하나 추가") 추가
+
+DAY_WORDS = {"첫째": 1, "첫": 1, "둘째": 2, "셋째": 3, "넷째": 4, "다섯째": 5}
+_DAY_NUM = re.compile(r"(\d+)\s*일\s*차|day\s*(\d+)|(\d+)\s*번째\s*날", re.IGNORECASE)
+_DAY_WORD = re.compile(r"(" + "|".join(sorted(DAY_WORDS, key=len, reverse=True)) + r")\s*날")
+
+REFILL_CANDIDATES = 30   # 근처 후보를 이만큼 뽑아서 종류가 맞는 첫 장소 사용
+
+
+class ItineraryEdit(BaseModel):
+    op: Literal["replace", "remove", "insert"] = Field(description="수정 종류")
+    day: int = Field(description="수정할 일차")
+    target: Optional[str] = Field(None, description="빼거나 바꿀 장소 이름 (replace/remove)")
+    kind: Optional[str] = Field(None, description="채울 장소 종류 (맛집/카페/관광/쇼핑/야경)")
+    new_place: Optional[str] = Field(None, description="사용자가 이름으로 지정한 새 장소")
+
+
+def _parse_day(text: str, total_days: int) -> Optional[int]:
+    m = _DAY_NUM.search(text)
+    if m:
+        day = int(next(g for g in m.groups() if g))
+    else:
+        m = _DAY_WORD.search(text)
+        day = DAY_WORDS[m.group(1)] if m else (1 if total_days == 1 else None)
+    return day if day is not None and 1 <= day <= total_days else None
+
+
+def _named_place(norm_text: str, places: List[CandidatePlace]) -> Optional[CandidatePlace]:
+    """메시지에 이름이 들어 있는 장소 (긴 이름 우선 → '카페' 같은 짧은 이름 오매칭 방지)"""
+    for p in sorted(places, key=lambda p: -len(p.place_name)):
+        name = normalize_place_name(p.place_name)
+        if len(name) >= 2 and name in norm_text:
+            return p
+    return None
+
+
+def parse_edit(text: str, itinerary: Optional[FinalItinerary], pool: List[CandidatePlace]) -> Optional[ItineraryEdit]:
+    """사용자 메시지 → ItineraryEdit (일정 부분 수정 요청이 아니거나 애매하면 None)"""
+    if itinerary is None or not itinerary.schedule:
+        return None
+    # "카페 빼고 다른 데 넣어줘" 처럼 빼는 말 + 채우는 말이 같이 오면 교체
+    removing = any(w in text for w in REMOVE_WORDS)
+    inserting = any(w in text for w in INSERT_WORDS)
+    if removing and (inserting or any(w in text for w in FILL_WORDS)):
+        op = "replace"
+    elif any(w in text for w in REPLACE_WORDS if w not in FILL_WORDS):
+        op = "replace"
+    elif removing:
+        op = "remove"
+    elif inserting:
+        op = "insert"
+    elif any(w in text for w in FILL_WORDS):
+        op = "replace"
+    else:
+        return None
+
+    day = _parse_day(text, itinerary.total_days)
+    if day is None:
+        return None
+    day_plan = next((d for d in itinerary.schedule if d.day == day), None)
+    if day_plan is None:
+        return None
+
+    norm_text = normalize_place_name(text)
+    kind = match_kind(text)
+    day_places = [sp.place for sp in day_plan.places]
+
+    if op == "insert":
+        used = {sp.place.place_name for d in itinerary.schedule for sp in d.places}
+        new_place = _named_place(norm_text, [p for p in pool if p.place_name not in used])
+        if new_place is None and kind is None:
+            return None
+        return ItineraryEdit(op=op, day=day, kind=kind, new_place=new_place.place_name if new_place else None)
+
+    # replace / remove: 대상은 이름 → 종류 순서로 찾기
+    target = _named_place(norm_text, day_places)
+    if target is None and kind is not None:
+        target = next((p for p in day_places if place_kind(p.tag_name, p.category) == kind), None)
+    if target is None:
+        return None
+    return ItineraryEdit(op=op, day=day, target=target.place_name, kind=place_kind(target.tag_name, target.category))
+
+
+def _refill(
+    near: Tuple[float, float],
+    kind: Optional[str],
+    pool: List[CandidatePlace],
+    index,
+    exclude_names: set,
+) -> Optional[CandidatePlace]:
+    """near 좌표에서 가까운 순으로, 종류(kind)가 맞고 아직 일정에 없는 장소"""
+    exclude = [i for i, p in enumerate(pool) if p.place_name in exclude_names]
+    nearby = [pool[i] for i in index.nearest(near[0], near[1], REFILL_CANDIDATES, exclude=exclude)]
+    if kind:
+        same_kind = [p for p in nearby if place_kind(p.tag_name, p.category) == kind]
+        if same_kind:
+            return same_kind[0]
+    return nearby[0] if nearby else None
+
+
+def _pool_travel(itinerary: FinalItinerary, pool: List[CandidatePlace], transport):
+    """풀 전체(+ 풀 밖의 일정 장소) 이동 시간 행렬 - 일정이 같으면 매 수정마다 같은 지문이라 캐시 재사용"""
+    names = {p.place_name for p in pool}
+    extras = sorted(
+        {sp.place.place_name: sp.place for d in itinerary.schedule for sp in d.places if sp.place.place_name not in names}.values(),
+        key=lambda p: p.place_name,
+    )
+    places = list(pool) + extras
+    return places, get_travel_time_matrix([(p.x, p.y) for p in places], transport)
+
+
+def _reschedule(
+    day_plan: DaySchedule,
+    day_places: List[CandidatePlace],
+    matrix_places: List[CandidatePlace],
+    travel,
+    descriptions: dict,
+) -> DaySchedule:
+    """그날 장소들만 다시 순서/방문 시각 계산 (설명은 기존 것 유지)"""
+    index_of = {p.place_name: i for i, p in enumerate(matrix_places)}
+    indices = [index_of[p.place_name] for p in day_places if p.place_name in index_of]
+    kinds = {i: place_kind(matrix_places[i].tag_name, matrix_places[i].category) for i in indices}
+    _, visits, _ = schedule_day(indices, kinds, travel.minutes)
+    return day_plan.model_copy(update={"places": [
+        ScheduledPlace(
+            place=matrix_places[v["index"]],
+            order=order,
+            visit_time=f"{v['label']} ({SLOT_LABELS[v['slot']]})",
+            description=descriptions.get(matrix_places[v["index"]].place_name, ""),
+        )
+        for order, v in enumerate(visits, 1)
+    ]})
+
+
+def apply_edit(
+    itinerary: FinalItinerary,
+    edit: ItineraryEdit,
+    pool: List[CandidatePlace],
+    index,
+    transport=None,
+    describe: Optional[Callable[[CandidatePlace, DaySchedule], str]] = None,
+) -> Tuple[FinalItinerary, Optional[CandidatePlace]]:
+    """edit 를 적용한 새 FinalItinerary 와 새로 들어간 장소 (없으면 None)"""
+    day_plan = next(d for d in itinerary.schedule if d.day == edit.day)
+    places = [sp.place for sp in day_plan.places]
+    descriptions = {sp.place.place_name: sp.description for sp in day_plan.places}
+    used = {sp.place.place_name for d in itinerary.schedule for sp in d.places}
+
+    target = next((p for p in places if p.place_name == edit.target), None)
+    if target is not None:
+        places = [p for p in places if p is not target]
+
+    added = None
+    if edit.op in ("replace", "insert"):
+        if edit.new_place:
+            added = next((p for p in pool if p.place_name == edit.new_place), None)
+        else:
+            if target is not None:
+                near = (target.x, target.y)
+            elif places:
+                near = (sum(p.x for p in places) / len(places), sum(p.y for p in places) / len(places))
+            else:
+                near = index.center()
+            added = _refill(near, edit.kind, pool, index, used) if near else None
+        if added is not None:
+            places.append(added)
+
+    matrix_places, travel = _pool_travel(itinerary, pool, transport)
+    new_day = _reschedule(day_plan, places, matrix_places, travel, descriptions)
+    if added is not None and describe is not None:
+        new_day = new_day.model_copy(update={"places": [
+            sp.model_copy(update={"description": describe(sp.place, new_day)}) if sp.place is added else sp
+            for sp in new_day.places
+        ]})
+
+    schedule = [new_day if d.day == edit.day else d for d in itinerary.schedule]
+    return itinerary.model_copy(update={"schedule": schedule}), added
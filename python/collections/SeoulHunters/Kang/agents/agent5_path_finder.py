@@ -1,11 +1,29 @@
+import sys
+from pathlib import Path
 import json
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import SystemMessage
+import os
+import time
+import numpy as np
+# SeoulHunters/shared 공용 모듈 경로 추가
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+from shared.llm_registry import get_llm, get_structured_llm
+from shared.llm_cache import get_llm_cache, make_llm_key
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.utils.json import parse_partial_json
+from langgraph.config import get_stream_writer
 from pydantic import BaseModel, Field
-from typing import List
+from typing import Callable, Dict, List, Optional
 
 # state.py에서 정의한 클래스들 import
 from state import AgentState, CandidatePlace, FinalItinerary, DaySchedule, ScheduledPlace
+from agents.agent5_cascade import MODEL_TIERS, cascade_stats, record_attempt, validate_itinerary
+from agents.agent5_editor import apply_edit, parse_edit
+from agents.agent0_fast_router import CandidateIndex, parse_ordinals
+from shared.geo import normalize_place_name
+from shared.itinerary_engine import distance_matrix, engine_summary, plan_itinerary
+from shared.spatial_index import get_spatial_index, index_for_key
+from shared.travel_time import get_travel_time_matrix, transport_label
+from shared.scheduler import SLOT_LABELS, place_kind, schedule_day
 
 # --- [LLM 출력용 스키마 (이름만 받기)] ---
 # CandidatePlace 객체 전체를 LLM이 뱉게 하면 망가지므로, 이름만 받아서 매핑함.
@@ -24,18 +42,351 @@ class LLMItineraryOutput(BaseModel):
     schedule: List[LLMDaySchedule]
     overall_review: str
 
+class LLMPlaceNote(BaseModel):
+    description: str = Field(description="이 장소를 이 시간에 넣은 이유 (한 문장)")
 
-def agent5_route_node(state: AgentState) -> AgentState:
-    print("\n🚗 --- [Agent 5] 일자별 상세 여행 경로 생성 ---")
-    
-    prefs = state["preferences"]
-    place_pool = state.get("candidates") or []
-    main_candidates = state.get("main_place_candidates") or []
-    user_selection_msg = state["messages"][-1].content # 사용자의 선택 ("1번이랑 3번")
 
-    # 1. 데이터 준비 (Mapping용 Dict 생성)
-    combined_pool = {p.place_name: p for p in place_pool + main_candidates}
-    
+# --- [스트리밍 설정] ---
+# LLM이 일정 JSON 전체를 다 쓸 때까지 기다리지 않고, 토큰이 들어오는 대로 부분 파싱해서
+# 완성된 장소가 생길 때마다 custom stream("agent5_partial")으로 FinalItinerary를 흘려보낸다.
+# (main.py bot_turn 이 stream_mode=["updates", "custom"] 으로 받아 채팅/지도를 바로 갱신)
+# llm 모드의 tier 결과는 검증 전 초안이라 "agent5_provisional" 을 붙이고, 검증 실패 시 "agent5_discard" 를 보낸다.
+STREAM_ENABLED = os.getenv("AGENT5_STREAM", "1") != "0"
+
+# --- [일정 구성 방식] ---
+# engine : 날짜 분배/방문 순서는 shared/itinerary_engine 이 좌표로 결정 (ms, 재현 가능),
+#          LLM은 이미 정해진 일정에 테마/방문 시간대/설명 문구만 채운다 (가장 싼 tier 한 번)
+# llm    : 기존 방식 - LLM이 분배/순서까지 정하고 모델 캐스케이드로 검증
+PLANNER_MODE = os.getenv("AGENT5_PLANNER", "engine")
+
+# 선택한 장소(anchor) 주변 풀만 쓰기 위한 반경 (좁은 반경부터 넓혀 가며 필요한 개수의 1.5배가 모이면 멈춤)
+ANCHOR_RADII_M = (800, 1500, 3000, 6000)
+
+
+# 스트리밍(json_object 모드)과 일반 구조화 호출이 같은 프롬프트를 쓰도록 출력 형식을 프롬프트에 명시.
+# daily_theme → places 순서, overall_review 는 맨 마지막 → 첫 날 일정이 가장 먼저 도착한다.
+JSON_FORMAT_GUIDE = """
+    [출력 형식]
+    아래 형태의 JSON 하나만 출력하세요. (키 순서 그대로: total_days → schedule → overall_review)
+    {"total_days": 2, "schedule": [{"day": 1, "daily_theme": "...", "places": [{"place_name": "...", "visit_time": "...", "description": "..."}]}], "overall_review": "..."}
+    """
+
+
+def _find_place(name: str, combined_pool: Dict[str, CandidatePlace]) -> Optional[CandidatePlace]:
+    """이름으로 실제 CandidatePlace 찾기 (1. 완전 일치 → 2. 부분 일치)"""
+    if name in combined_pool:
+        return combined_pool[name]
+    for db_name, db_obj in combined_pool.items():
+        if name in db_name or db_name in name:
+            return db_obj
+    return None
+
+
+def _to_final_itinerary(result: LLMItineraryOutput, combined_pool: Dict[str, CandidatePlace], warn: bool = True) -> FinalItinerary:
+    """LLM 결과(이름만)를 실제 객체(FinalItinerary)로 변환 (매핑)"""
+    final_schedule = []
+
+    for day_plan in result.schedule:
+        daily_places = []
+        for place_ref in day_plan.places:
+            real_place_obj = _find_place(place_ref.place_name, combined_pool)
+
+            if real_place_obj:
+                # 스케줄 객체 생성
+                scheduled_p = ScheduledPlace(
+                    place=real_place_obj,
+                    order=len(daily_places) + 1,
+                    visit_time=place_ref.visit_time,
+                    description=place_ref.description
+                )
+                daily_places.append(scheduled_p)
+            elif warn:
+                print(f"   ⚠️ 경고: '{place_ref.place_name}' 매핑 실패")
+
+        # 하루 일정 완성
+        final_schedule.append(DaySchedule(
+            day=day_plan.day,
+            places=daily_places,
+            daily_theme=day_plan.daily_theme
+        ))
+
+    return FinalItinerary(
+        total_days=result.total_days,
+        schedule=final_schedule,
+        overall_review=result.overall_review
+    )
+
+
+def _completed_prefix(data: dict) -> LLMItineraryOutput:
+    """
+    부분 JSON(dict) → 다 쓰인 장소까지만 담은 LLMItineraryOutput.
+    마지막으로 보이는 장소는 아직 쓰는 중일 수 있으므로(이름/설명이 잘려 있음) 뺀다.
+    overall_review 가 시작됐으면 schedule 은 끝난 것이므로 전부 포함.
+    """
+    days = [d for d in (data.get("schedule") or []) if isinstance(d, dict)]
+    schedule_done = "overall_review" in data
+
+    out_days = []
+    for di, d in enumerate(days):
+        places = [p for p in (d.get("places") or []) if isinstance(p, dict)]
+        if di == len(days) - 1 and not schedule_done:
+            places = places[:-1]
+        refs = [
+            LLMPlaceRef(
+                place_name=p["place_name"],
+                visit_time=str(p.get("visit_time") or ""),
+                description=str(p.get("description") or ""),
+            )
+            for p in places if p.get("place_name")
+        ]
+        out_days.append(LLMDaySchedule(day=d.get("day") or di + 1, places=refs, daily_theme=str(d.get("daily_theme") or "")))
+
+    return LLMItineraryOutput(total_days=data.get("total_days") or len(out_days), schedule=out_days, overall_review="")
+
+
+def _stream_itinerary(model: str, messages: list, on_partial: Callable[[LLMItineraryOutput], None]) -> LLMItineraryOutput:
+    """토큰 스트림을 부분 파싱하면서, 완성된 장소 수가 늘 때마다 on_partial 호출"""
+    llm = get_llm(model, temperature=0).bind(response_format={"type": "json_object"})
+
+    buffer = ""
+    shown = 0
+    for chunk in llm.stream(messages):
+        if not isinstance(chunk.content, str) or not chunk.content:
+            continue
+        buffer += chunk.content
+        data = parse_partial_json(buffer)
+        if not isinstance(data, dict):
+            continue
+        partial = _completed_prefix(data)
+        n_places = sum(len(d.places) for d in partial.schedule)
+        if n_places > shown:
+            shown = n_places
+            on_partial(partial)
+
+    return LLMItineraryOutput.model_validate_json(buffer)
+
+
+def _cache_key(model: str, messages: list):
+    """path_finder LLM 캐시와 키 (캐시가 꺼져 있으면 (None, None)). 스트리밍/일반 호출이 같은 키를 쓴다"""
+    cache = get_llm_cache()
+    if cache is None or not cache.enabled("path_finder"):
+        return None, None
+    return cache, make_llm_key("path_finder", model, messages, LLMItineraryOutput, temperature=0)
+
+
+def _remember(model: str, messages: list, result: LLMItineraryOutput):
+    """검증을 통과한 결과만 캐시에 저장 (실패한 tier 결과가 다음 요청에 재생되지 않게)"""
+    cache, key = _cache_key(model, messages)
+    if key is not None:
+        cache.set("path_finder", key, result.model_dump_json(exclude_none=True))
+
+
+def _generate(model: str, messages: list, on_partial: Callable[[LLMItineraryOutput], None]) -> LLMItineraryOutput:
+    """한 tier 실행 (캐시 → 스트리밍 → 실패 시 일반 구조화 호출). 저장은 호출한 쪽에서 검증 후 _remember 로"""
+    cache, key = _cache_key(model, messages)
+    if key is not None:
+        payload = cache.get("path_finder", key)
+        if payload is not None:
+            return LLMItineraryOutput.model_validate_json(payload)
+
+    if STREAM_ENABLED:
+        try:
+            return _stream_itinerary(model, messages, on_partial)
+        except Exception as e:
+            print(f"   ⚠️ [{model}] 스트리밍 실패 → 일반 호출로 재시도: {e}")
+
+    structured_llm = get_structured_llm(model, LLMItineraryOutput, temperature=0)
+    return structured_llm.invoke(messages)
+
+
+def _stream_writer() -> Callable[[dict], None]:
+    """그래프 밖에서 노드를 직접 호출할 때는 get_stream_writer()가 실패하므로 no-op으로 대체"""
+    try:
+        return get_stream_writer()
+    except Exception:
+        return lambda _: None
+
+
+def _last_user_message(state: AgentState) -> str:
+    """마지막 사용자 입력 (messages[-1] 은 Router 판단 AIMessage 라서 쓰면 안 됨)"""
+    for msg in reversed(state.get("messages", [])):
+        if isinstance(msg, HumanMessage):
+            return msg.content
+    return ""
+
+
+def _selected_anchors(main_candidates: List[CandidatePlace], user_selection_msg: str) -> List[CandidatePlace]:
+    """사용자가 고른 후보 ("1번이랑 3번", 장소 이름/주소) → CandidatePlace 목록"""
+    picks = parse_ordinals(user_selection_msg, len(main_candidates))
+    if not picks:
+        picks = CandidateIndex(main_candidates).match(user_selection_msg)
+    return [main_candidates[n - 1] for n in picks]
+
+
+def _pool_index(state: AgentState, place_pool: List[CandidatePlace]):
+    """state 의 pool_index_key 로 공간 인덱스 참조 (없거나 밀려났으면 candidates 로 다시 만들기)"""
+    index = index_for_key(state.get("pool_index_key"))
+    if index is None or len(index) != len(place_pool):
+        _, index = get_spatial_index([(p.x, p.y) for p in place_pool], tags=[p.tag_name for p in place_pool])
+    return index
+
+
+def _nearby_pool(
+    combined_pool: Dict[str, CandidatePlace],
+    place_pool: List[CandidatePlace],
+    index,
+    anchors: List[CandidatePlace],
+    needed: int,
+) -> Dict[str, CandidatePlace]:
+    """anchor 주변 반경 안의 장소만 남긴 풀 (anchor가 없거나 주변에 충분히 없으면 전체 풀)"""
+    if not anchors or not place_pool:
+        return combined_pool
+    for radius in ANCHOR_RADII_M:
+        near = set()
+        for a in anchors:
+            if a.x > 0 and a.y > 0:
+                near.update(index.within(a.x, a.y, radius))
+        if len(near) + len(anchors) >= needed * 1.5:
+            break
+    else:
+        return combined_pool
+
+    names = {place_pool[i].place_name for i in near} | {a.place_name for a in anchors}
+    print(f"   📍 anchor 반경 {radius}m 안 장소 {len(names)}개 / 전체 {len(combined_pool)}개")
+    return {name: p for name, p in combined_pool.items() if name in names}
+
+
+def _engine_itinerary(
+    combined_pool: Dict[str, CandidatePlace],
+    anchors: List[CandidatePlace],
+    duration: int,
+    spots_per_day: int,
+    transport: Optional[str] = None,
+) -> FinalItinerary:
+    """좌표 기반 엔진으로 날짜 분배 + 방문 순서/시각 결정 → 문구가 비어 있는 FinalItinerary
+    (날짜 분배는 거리, 하루 순서/시각은 이동 시간(분) + 장소 종류별 시간창 스케줄러)"""
+    places = [p for p in combined_pool.values() if p.x > 0 and p.y > 0]
+    index_of = {p.place_name: i for i, p in enumerate(places)}
+    anchor_idx = [index_of[a.place_name] for a in anchors if a.place_name in index_of]
+
+    coords = [(p.x, p.y) for p in places]
+    dist = distance_matrix(coords)
+    travel = get_travel_time_matrix(coords, transport)
+    days = plan_itinerary(
+        coords,
+        n_days=duration,
+        capacity=spots_per_day,
+        anchors=anchor_idx,
+        weights=[p.weight for p in places],
+        tags=[p.tag_name for p in places],
+        dist=travel.minutes,
+    )
+    summary = engine_summary(days, dist)
+    minutes = travel.minutes
+
+    # 좌표가 없는 anchor도 사용자가 고른 장소라 빼지 않는다:
+    # 장소가 가장 적은 날(같으면 같은 종류가 적은 날)에 붙이고, 이동 시간은 0분으로 보고 시간창만 맞춘다
+    placed = {places[i].place_name for day in days for i in day}
+    no_coord = [a for a in anchors if a.place_name not in index_of and a.place_name not in placed]
+    if no_coord:
+        print(f"   ⚠️ 좌표 없는 anchor {len(no_coord)}개 → 장소가 적은 날에 추가: {[a.place_name for a in no_coord]}")
+        minutes = np.pad(minutes, (0, len(no_coord)))
+        for a in no_coord:
+            kind = place_kind(a.tag_name, a.category)
+            day = min(days, key=lambda d: (len(d), sum(place_kind(places[i].tag_name, places[i].category) == kind for i in d)))
+            day.append(len(places))
+            places.append(a)
+
+    # 하루 안의 순서/방문 시각: 시간창(점심 11:30~13:30 등) + 체류 시간 + 이동 시간
+    kinds = {i: place_kind(places[i].tag_name, places[i].category) for day in days for i in day}
+    timed_days = [schedule_day(day, kinds, minutes) for day in days]
+    missed = sum(v["missed"] for _, visits, _ in timed_days for v in visits)
+
+    travel_min = round(sum(minutes[a][b] for route, _, _ in timed_days for a, b in zip(route, route[1:])))
+    print(f"   🧭 엔진 일정: {summary}, 이동 약 {travel_min}분 ({transport_label(transport)}, anchor {len(anchor_idx) + len(no_coord)}개, 시간창 미준수 {missed}곳)")
+
+    schedule = []
+    for day_no, (route, visits, _) in enumerate(timed_days, 1):
+        schedule.append(DaySchedule(
+            day=day_no,
+            places=[
+                ScheduledPlace(
+                    place=places[v["index"]],
+                    order=order,
+                    visit_time=f"{v['label']} ({SLOT_LABELS[v['slot']]})",
+                    description="",
+                )
+                for order, v in enumerate(visits, 1)
+            ],
+            daily_theme="",
+        ))
+    return FinalItinerary(total_days=duration, schedule=schedule, overall_review="")
+
+
+def _apply_text(skeleton: FinalItinerary, text: LLMItineraryOutput) -> FinalItinerary:
+    """엔진 일정(장소/순서/방문 시각 고정)에 LLM 문구(테마/설명/총평)만 덮어쓰기"""
+    text_days = {d.day: d for d in text.schedule}
+    schedule = []
+    for day in skeleton.schedule:
+        text_day = text_days.get(day.day)
+        # 띄어쓰기/기호만 바꿔 쓴 경우도 같은 장소로 (부분 일치는 'P1' / 'P14' 처럼 오매칭이 생겨서 쓰지 않음)
+        refs = {normalize_place_name(r.place_name): r for r in text_day.places} if text_day else {}
+
+        places = []
+        for sp in day.places:
+            ref = refs.get(normalize_place_name(sp.place.place_name))
+            places.append(sp.model_copy(update={"description": ref.description}) if ref else sp)
+
+        schedule.append(day.model_copy(update={
+            "places": places,
+            "daily_theme": (text_day.daily_theme if text_day else "") or day.daily_theme,
+        }))
+    return skeleton.model_copy(update={"schedule": schedule, "overall_review": text.overall_review or skeleton.overall_review})
+
+
+def _plan_with_engine(prefs, combined_pool, main_candidates, anchors, user_selection_msg, duration, spots_per_day, writer) -> Optional[FinalItinerary]:
+    skeleton = _engine_itinerary(combined_pool, anchors, duration, spots_per_day, prefs.transport)
+    writer({"agent5_partial": skeleton})  # 문구 없이 일정/지도부터 바로 표시
+
+    skeleton_txt = ""
+    for day in skeleton.schedule:
+        skeleton_txt += f"Day {day.day}\n"
+        for sp in day.places:
+            skeleton_txt += f"  {sp.order}. {sp.place.place_name} ({sp.place.category}, 방문 시각:{sp.visit_time})\n"
+
+    system_prompt = f"""
+    당신은 여행 동선 설계 전문가입니다.
+    아래 **{duration}일간의 여행 코스**는 날짜 분배, 방문 순서, 방문 시각이 이미 확정되었습니다.
+    장소/순서/시각은 절대 바꾸지 말고, 이 시간에 배치한 이유, 그날의 테마, 전체 총평만 작성하세요.
+
+    [사용자 프로필]
+    - 테마: {prefs.themes}
+    - 요청사항: "{prefs.additional_notes}"
+    - 사용자 피드백: "{user_selection_msg}"
+
+    [확정된 코스]
+    {skeleton_txt}
+    [작성 규칙]
+    1. 장소 이름은 위 코스에 있는 **정확한 이름**을 그대로 쓰세요.
+    2. visit_time 에는 위의 방문 시각을 그대로 적으세요.
+    """ + JSON_FORMAT_GUIDE
+    messages = [SystemMessage(content=system_prompt)]
+
+    model = MODEL_TIERS[0]
+    started = time.perf_counter()
+    try:
+        text = _generate(model, messages, lambda partial: writer({"agent5_partial": _apply_text(skeleton, partial)}))
+    except Exception as e:
+        record_attempt(f"{model} (engine text)", None, time.perf_counter() - started)
+        print(f"   ⚠️ [{model}] 문구 생성 실패 → 기본 시간대로 반환: {e}")
+        return skeleton
+    # 문구만 쓰는 호출은 검증 대상이 아니므로 캐스케이드 통과율과 섞지 않고 별도 키로 기록
+    record_attempt(f"{model} (engine text)", [], time.perf_counter() - started)
+    _remember(model, messages, text)
+    return _apply_text(skeleton, text)
+
+
+def _plan_with_llm(prefs, combined_pool, main_candidates, anchors, user_selection_msg, duration, spots_per_day, writer) -> Optional[FinalItinerary]:
     # LLM에게 보여줄 텍스트
     # (메인 후보는 강조, 나머지는 풀로 제공)
     main_txt = ", ".join([f"{p.place_name}({p.category})" for p in main_candidates])
@@ -44,16 +395,7 @@ def agent5_route_node(state: AgentState) -> AgentState:
     for i, (name, p) in enumerate(list(combined_pool.items())[:50]): # 너무 많으면 자름
         pool_txt += f"- {name} ({p.category}, 키워드:{p.keyword}, 좌표:{p.y:.3f},{p.x:.3f})\n"
 
-    # 2. 목표 일수 및 스팟 수 계산
-    duration = prefs.duration # (int)
-    intensity = prefs.intensity
-    spots_per_day = 4 if intensity <= 30 else (5 if intensity <= 60 else 6)
-
-    # 3. LLM 설정
-    llm = ChatOpenAI(model="gpt-4o", temperature=0) # 복잡한 작업은 gpt-4o 필수
-    structured_llm = llm.with_structured_output(LLMItineraryOutput)
-
-    # 4. 프롬프트
+    # 프롬프트
     system_prompt = f"""
     당신은 여행 동선 설계 전문가입니다.
     사용자의 선택과 전체 장소 풀을 조합하여 **{duration}일간의 여행 코스**를 작성하세요.
@@ -77,64 +419,126 @@ def agent5_route_node(state: AgentState) -> AgentState:
     2. **순서 배열**: 식사 -> 카페 -> 관광 -> 식사 등 상식적인 순서로 배치하세요.
     3. **빈자리 채우기**: 선택된 장소만으로 부족하면, '장소 풀'에서 적절한 곳을 추가하여 하루 일정을 완성하세요.
     4. **출력**: 장소 이름은 위 리스트에 있는 **정확한 이름**을 사용해야 매핑이 가능합니다.
-    """
+    """ + JSON_FORMAT_GUIDE
+    messages = [SystemMessage(content=system_prompt)]
 
-    # 5. 실행
-    try:
-        result = structured_llm.invoke([SystemMessage(content=system_prompt)])
-    except Exception as e:
-        print(f"Error in Agent 5: {e}")
-        return state # 에러 시 기존 상태 반환
+    # 실행 (모델 캐스케이드: 싼 모델 → 로컬 검증 실패 시에만 상위 모델)
+    # tier 결과는 검증 전이므로 부분 일정에 "agent5_provisional"(모델 이름)을 붙여 보내고,
+    # 검증에 실패하면 "agent5_discard" 로 화면의 초안을 지우게 한다.
+    def push_partial_for(model: str) -> Callable[[LLMItineraryOutput], None]:
+        def push_partial(partial: LLMItineraryOutput):
+            writer({"agent5_partial": _to_final_itinerary(partial, combined_pool, warn=False), "agent5_provisional": model})
+        return push_partial
 
-    # 6. [핵심] LLM 결과를 실제 객체(FinalItinerary)로 변환 (매핑)
-    final_schedule = []
+    def resolve(name: str) -> Optional[CandidatePlace]:
+        return _find_place(name, combined_pool)
+
+    result = None
+    best_problems = None
+    for model in MODEL_TIERS:
+        started = time.perf_counter()
+        try:
+            candidate = _generate(model, messages, push_partial_for(model))
+        except Exception as e:
+            record_attempt(model, None, time.perf_counter() - started)
+            writer({"agent5_discard": model})
+            print(f"Error in Agent 5 [{model}]: {e}")
+            continue
+
+        problems = validate_itinerary(candidate, resolve, duration, spots_per_day)
+        record_attempt(model, problems, time.perf_counter() - started)
+        # 모든 tier가 실패하면 문제가 가장 적은 결과를 쓴다
+        if result is None or len(problems) < len(best_problems):
+            result, best_problems = candidate, problems
+        if not problems:
+            print(f"   ✅ [{model}] 검증 통과")
+            _remember(model, messages, candidate)
+            break
+        writer({"agent5_discard": model})
+        print(f"   ⚠️ [{model}] 검증 실패 → 상위 모델로: {problems[:3]}")
+
+    print(f"   📈 캐스케이드 지표: {cascade_stats()}")
+    if result is None:
+        return None
+
+    # [핵심] LLM 결과를 실제 객체(FinalItinerary)로 변환 (매핑)
+    return _to_final_itinerary(result, combined_pool)
+
+
+def _describe_place(prefs, user_msg: str) -> Callable[[CandidatePlace, DaySchedule], str]:
+    """부분 수정으로 새로 들어간 장소 한 곳의 설명만 LLM으로 (실패하면 빈 문자열)"""
+    def describe(place: CandidatePlace, day: DaySchedule) -> str:
+        sp = next(sp for sp in day.places if sp.place is place)
+        route = " → ".join(p.place.place_name for p in day.places)
+        prompt = f"""
+        여행 {day.day}일차 코스({route})에 '{place.place_name}'({place.category})을(를) {sp.visit_time}에 새로 넣었습니다.
+        사용자 요청: "{user_msg}" / 테마: {prefs.themes}
+        이 장소를 이 시간에 넣은 이유를 한 문장으로 설명하세요.
+        """
+        try:
+            llm = get_structured_llm(MODEL_TIERS[0], LLMPlaceNote, temperature=0, cache_node="path_finder")
+            return llm.invoke([SystemMessage(content=prompt)]).description
+        except Exception as e:
+            print(f"   ⚠️ 설명 생성 실패 (빈 설명으로 유지): {e}")
+            return ""
+    return describe
+
+
+def _edit_itinerary(state: AgentState, user_msg: str) -> Optional[FinalItinerary]:
+    """완성된 일정에 대한 부분 수정 요청이면 해당 날짜만 고친 일정, 아니면 None"""
+    itinerary = state.get("final_itinerary")
+    place_pool = state.get("candidates") or []
+    edit = parse_edit(user_msg, itinerary, place_pool)
+    if edit is None:
+        return None
+
+    prefs = state["preferences"]
+    started = time.perf_counter()
+    index = _pool_index(state, place_pool)
+    edited, added = apply_edit(itinerary, edit, place_pool, index, prefs.transport, _describe_place(prefs, user_msg))
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    target = f"{edit.target} → " if edit.target else ""
+    print(f"   ✏️ 부분 수정 ({edit.op}) {edit.day}일차: {target}{added.place_name if added else '-'} ({elapsed_ms:.0f}ms)")
+    return edited
+
+
+def agent5_route_node(state: AgentState) -> AgentState:
+    print("\n🚗 --- [Agent 5] 일자별 상세 여행 경로 생성 ---")
     
-    for day_plan in result.schedule:
-        daily_places = []
-        for i, place_ref in enumerate(day_plan.places, 1):
-            # 이름으로 실제 객체 찾기
-            real_place_obj = None
-            
-            # 1. 완전 일치
-            if place_ref.place_name in combined_pool:
-                real_place_obj = combined_pool[place_ref.place_name]
-            else:
-                # 2. 부분 일치 (유연성)
-                for db_name, db_obj in combined_pool.items():
-                    if place_ref.place_name in db_name or db_name in place_ref.place_name:
-                        real_place_obj = db_obj
-                        break
-            
-            if real_place_obj:
-                # 스케줄 객체 생성
-                scheduled_p = ScheduledPlace(
-                    place=real_place_obj,
-                    order=i,
-                    visit_time=place_ref.visit_time,
-                    description=place_ref.description
-                )
-                daily_places.append(scheduled_p)
-            else:
-                print(f"   ⚠️ 경고: '{place_ref.place_name}' 매핑 실패")
+    prefs = state["preferences"]
+    place_pool = state.get("candidates") or []
+    main_candidates = state.get("main_place_candidates") or []
+    user_selection_msg = _last_user_message(state) # 사용자의 선택 ("1번이랑 3번")
 
-        # 하루 일정 완성
-        day_schedule = DaySchedule(
-            day=day_plan.day,
-            places=daily_places,
-            daily_theme=day_plan.daily_theme
-        )
-        final_schedule.append(day_schedule)
+    # 0. 이미 만든 일정의 부분 수정 ("2일차 카페 말고 다른 데") → 그날만 다시 계산 (전체 재생성 X)
+    edited = _edit_itinerary(state, user_selection_msg)
+    if edited is not None:
+        return {"final_itinerary": edited, "routes_text": edited.overall_review}
 
-    # 최종 결과 객체
-    final_itinerary = FinalItinerary(
-        total_days=result.total_days,
-        schedule=final_schedule,
-        overall_review=result.overall_review
-    )
+    # 1. 데이터 준비 (Mapping용 Dict 생성)
+    combined_pool = {p.place_name: p for p in place_pool + main_candidates}
+
+    # 2. 목표 일수 및 스팟 수 계산
+    duration = prefs.duration # (int)
+    intensity = prefs.intensity
+    spots_per_day = 4 if intensity <= 30 else (5 if intensity <= 60 else 6)
+
+    # 3. 사용자가 고른 장소(anchor) 주변으로 풀 좁히기 (공간 인덱스)
+    anchors = _selected_anchors(main_candidates, user_selection_msg)
+    index = _pool_index(state, place_pool)
+    pool = _nearby_pool(combined_pool, place_pool, index, anchors, duration * spots_per_day)
+
+    # 4. 일정 구성 (engine: 좌표 엔진 + LLM 문구 / llm: LLM 캐스케이드)
+    writer = _stream_writer()
+    plan = _plan_with_engine if PLANNER_MODE == "engine" else _plan_with_llm
+    final_itinerary = plan(prefs, pool, main_candidates, anchors, user_selection_msg, duration, spots_per_day, writer)
+    if final_itinerary is None:
+        return state # 에러 시 기존 상태 반환
 
+    final_schedule = final_itinerary.schedule
     print(f"   ✅ 최종 일정 생성 완료: 총 {len(final_schedule)}일, {sum(len(d.places) for d in final_schedule)}개 장소")
     
     return {
         "final_itinerary": final_itinerary,
-        "routes_text": result.overall_review # 간단한 텍스트용
-    }
\ No newline at end of file
+        "routes_text": final_itinerary.overall_review # 간단한 텍스트용
+    }
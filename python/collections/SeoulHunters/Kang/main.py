@@ -1,3 +1,6 @@
+import os
+import sys
+from pathlib import Path
 import gradio as gr
 import pandas as pd
 import uuid
@@ -6,7 +9,10 @@ from typing import Annotated, List, Optional, TypedDict
 from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.memory import MemorySaver
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
-from langchain_openai import ChatOpenAI
+# SeoulHunters/shared 공용 모듈 경로 추가
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from shared.llm_registry import get_llm
+from shared.distance import get_distance_matrix
 
 # 모듈 import
 from state import AgentState, CandidatePlace
@@ -15,6 +21,7 @@ from agents.agent1_planner import planner_node
 from agents.agent2_allocator import allocator_node
 from agents.agent3_collector_kakao import collector_node_kakao
 from agents.agent3_collector_naver import collector_node_naver
+from agents.agent3_collector_multi import collector_node_multi
 from agents.agent4_suggest import agent4_suggest_node
 from agents.agent5_path_finder import agent5_route_node 
 import folium
@@ -113,12 +120,14 @@ def create_map_html(data):
             
             # [핵심] 일자별 경로 선 그리기
             if len(day_coords) > 1:
+                # 경로 길이 (shared/distance 거리 행렬, (경도, 위도) 순서)
+                route_km = get_distance_matrix([(lng, lat) for lat, lng in day_coords]).route_length(range(len(day_coords))) / 1000
                 folium.PolyLine(
                     locations=day_coords,
                     color=day_color,
                     weight=5,
                     opacity=0.8,
-                    tooltip=f"Day {day_schedule.day} 경로"
+                    tooltip=f"Day {day_schedule.day} 경로 ({route_km:.1f} km)"
                 ).add_to(m)
                 
         return m._repr_html_()
@@ -153,7 +162,7 @@ def translate_text(text, target_lang):
     if text.startswith("http") or text.startswith("www"): return text
     if target_lang in ["Korean", "한국어"] or not text.strip(): return text
     
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+    llm = get_llm("gpt-4o-mini", temperature=0, cache_node="translate")
     system_prompt = f"Translate Korean to {target_lang}. Keep proper nouns/codes. Return only text."
     try:
         res = llm.invoke([SystemMessage(content=system_prompt), HumanMessage(content=text)])
@@ -201,8 +210,13 @@ workflow = StateGraph(AgentState)
 workflow.add_node("router", router_node)
 workflow.add_node("planner", planner_node)
 workflow.add_node("allocator", allocator_node)
-# workflow.add_node("kakao", collector_node_kakao)
-workflow.add_node("naver", collector_node_naver)
+# 장소 수집 노드 선택 (AGENT3_COLLECTOR: multi / naver / kakao, 기본 multi = Naver + Kakao 동시 검색 후 지리 기반 병합)
+COLLECTOR_NODES = {"kakao": collector_node_kakao, "naver": collector_node_naver, "multi": collector_node_multi}
+COLLECTOR = os.getenv("AGENT3_COLLECTOR", "multi")
+if COLLECTOR not in COLLECTOR_NODES:
+    print(f"⚠️ 알 수 없는 AGENT3_COLLECTOR '{COLLECTOR}' → multi 사용")
+    COLLECTOR = "multi"
+workflow.add_node(COLLECTOR, COLLECTOR_NODES[COLLECTOR])
 workflow.add_node("suggester", agent4_suggest_node)
 workflow.add_node("path_finder", agent5_route_node) 
 # workflow.add_node("scheduler", agent5_schedule_node) # [Future] Agent 5 추가 예정
@@ -227,10 +241,8 @@ def check_complete(state: AgentState):
     return END
 
 workflow.add_conditional_edges("planner", check_complete, {"allocator": "allocator", END: END})
-# workflow.add_edge("allocator", "kakao")
-workflow.add_edge("allocator", "naver")
-# workflow.add_edge("kakao", "suggester")
-workflow.add_edge("naver", "suggester")
+workflow.add_edge("allocator", COLLECTOR)
+workflow.add_edge(COLLECTOR, "suggester")
 
 # [중요] Suggester 이후 Agent 5로 바로 가지 않고 일단 END.
 # 사용자가 채팅창에서 "여기 여기 갈래"라고 입력하면, 그때 Router가 판단해서 Agent 5로 보내는 구조가 됩니다.
@@ -245,6 +257,19 @@ def user_turn(user_message, history):
     history.append({"role": "user", "content": user_message})
     return "", history
 
+def format_itinerary_log(itinerary, header):
+    """FinalItinerary → 채팅용 마크다운 (스트리밍 중 부분 일정 / 최종 일정 공용)"""
+    log_text = f"{header}\n"
+    if itinerary.overall_review:
+        log_text += f"\n**[총평]** {itinerary.overall_review}\n"
+
+    for day in itinerary.schedule:
+        # 일자별 테마 표시
+        log_text += f"\n**📅 Day {day.day} - {day.daily_theme}**\n"
+        for sp in day.places:
+            log_text += f"{sp.order}. {sp.place.place_name} ({sp.visit_time})\n"
+    return log_text
+
 def bot_turn(history, thread_id):
     if not thread_id: thread_id = str(uuid.uuid4())
     config = {"configurable": {"thread_id": thread_id}}
@@ -260,7 +285,34 @@ def bot_turn(history, thread_id):
 
     # [핵심 수정] 초기값을 루프 밖에서 미리 선언해야 에러가 안 납니다!
     map_html = "<div style='text-align:center; padding:20px; color:gray;'>아직 지도가 생성되지 않았습니다.</div>"
-    for output in app.stream(inputs, config=config):
+    df_p = format_prefs_to_df(accumulated_state.get('preferences'))
+    df_s = format_strategy_to_df(accumulated_state.get('strategy'))
+    stream_base = None  # Agent 5 스트리밍 직전까지의 채팅 내용 (부분 일정은 이 뒤에 덮어씀)
+
+    # updates: 노드 완료 단위 / custom: Agent 5가 토큰 스트림에서 흘려보내는 부분 일정
+    for mode, output in app.stream(inputs, config=config, stream_mode=["updates", "custom"]):
+        if mode == "custom":
+            if not isinstance(output, dict):
+                continue
+            if stream_base is None and ("agent5_partial" in output or "agent5_discard" in output):
+                stream_base = "" if history[-1]['content'] == "🤔 Thinking..." else history[-1]['content'] + "\n\n"
+            # 검증에 실패한 tier의 초안은 지우고 상위 모델 결과를 기다린다
+            if "agent5_discard" in output:
+                history[-1]['content'] = stream_base + f"🚗 **Agent 5:** 초안({output['agent5_discard']}) 검증 실패 → 다시 작성 중..."
+                yield history, thread_id, df_p, df_s, map_html
+                continue
+            partial = output.get("agent5_partial")
+            if partial is None:
+                continue
+            # 부분 일정은 번역하지 않고 그대로 (매번 번역 호출하면 스트리밍 의미가 없음) → 완료 시 번역본으로 교체
+            header = "🚗 **Agent 5:** 일정 작성 중..."
+            if output.get("agent5_provisional"):
+                header += " (검증 전 초안)"
+            history[-1]['content'] = stream_base + format_itinerary_log(partial, header)
+            map_html = create_map_html(partial)
+            yield history, thread_id, df_p, df_s, map_html
+            continue
+
         for node_name, state_update in output.items():
             accumulated_state.update(state_update)
             
@@ -285,9 +337,9 @@ def bot_turn(history, thread_id):
             elif node_name == "allocator":
                 kor_log = f"\n ⬇️\n📊 **Agent 2:** 전략 수립 완료!"
 
-            elif node_name in ["kakao", "naver"]:
+            elif node_name in ["kakao", "naver", "multi"]:
                 cands = accumulated_state.get('candidates', [])
-                source = "Kakao" if node_name == "kakao" else "Naver"
+                source = {"kakao": "Kakao", "naver": "Naver", "multi": "Naver + Kakao"}[node_name]
                 kor_log = f"\n ⬇️\n🏃 **Agent 3 ({source}):** 수집 중... (현재 누적 {len(cands)}개)"
 
             # [핵심 수정] Agent 4 결과 출력 (체크박스 제거 -> 채팅창 리스트 출력)
@@ -321,17 +373,14 @@ def bot_turn(history, thread_id):
                     map_html = create_map_html(final_itinerary)
                     
                     # 로그 메시지 생성
-                    log_text = f"\n⬇️\n🚗 **Agent 5:** 최종 일정 생성 완료!\n\n**[총평]** {final_itinerary.overall_review}\n"
-                    
-                    for day in final_itinerary.schedule:
-                        # 일자별 테마 표시
-                        log_text += f"\n**📅 Day {day.day} - {day.daily_theme}**\n"
-                        for sp in day.places:
-                            log_text += f"{sp.order}. {sp.place.place_name} ({sp.visit_time})\n"
-                            
-                    kor_log = log_text
+                    kor_log = format_itinerary_log(final_itinerary, "\n⬇️\n🚗 **Agent 5:** 최종 일정 생성 완료!")
                 else:
                     kor_log = "⚠️ 일정 생성 실패."
+
+                # 스트리밍으로 붙여 둔 부분 일정은 최종 일정으로 교체
+                if stream_base is not None:
+                    history[-1]['content'] = stream_base.rstrip("\n") or "🤔 Thinking..."
+                    stream_base = None
             
                 
             # --- 번역 및 UI 업데이트 ---
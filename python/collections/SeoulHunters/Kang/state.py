@@ -166,6 +166,9 @@ class AgentState(TypedDict):
 
     # 5. Agent 4의 결과물 (Top-3 Candidates)
     main_place_candidates: Optional[List[CandidatePlace]]
+
+    # candidates 공간 인덱스 참조 키 (인덱스 자체는 shared/spatial_index 레지스트리에 보관)
+    pool_index_key: Optional[str]
     
     # 6. Agent 5의 결과물 (Route Locations)
     # selected_main_places: Optional[List[CandidatePlace]] # <-- 이거 대신 아래꺼 사용
@@ -1,34 +1,40 @@
+import asyncio
 import os
-import requests
+import sys
+from pathlib import Path
 from dotenv import load_dotenv
 import re
 import html
 
+# SeoulHunters/shared 공용 모듈 경로 추가
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from shared.search_client import get_search_client
+
 load_dotenv()
 
 def search_kakao(query, n, sort_type='accuracy', x=None, y=None):
-    api_key = os.environ.get("KAKAO_REST_API_KEY")
-    if not api_key:
+    if not os.environ.get("KAKAO_REST_API_KEY"):
         print("🚨 Error: KAKAO_REST_API_KEY 환경변수가 없습니다.")
         return []
-    
-    url = "https://dapi.kakao.com/v2/local/search/keyword.json"
-    headers = {"Authorization": f"KakaoAK {api_key}"}
-    params = {
-        "query": query,
-        "size": n,
-        "sort": sort_type
-    }
-    # 거리순 정렬일 경우 중심 좌표 필수
-    if sort_type == 'distance' and x and y:
-        params['x'] = x
-        params['y'] = y
-        params['radius'] = 2000 # 반경 2km 이내 (도보/차량 고려)
 
     try:
-        resp = requests.get(url, headers=headers, params=params)
-        resp.raise_for_status()
-        return resp.json().get('documents', [])
+        # 거리순 정렬일 경우 중심 좌표 필수 (반경 2km 이내, 도보/차량 고려)
+        return get_search_client().kakao(query, size=n, sort=sort_type, x=x, y=y, radius=2000)
+    except Exception as e:
+        print(f"   ❌ API Error: {e}")
+        return []
+
+def search_kakao_paged(query, limit, sort_type='accuracy', x=None, y=None):
+    """
+    search_kakao의 페이지 버전: limit 개수를 채울 만큼 page=1..N 을 동시에 받아 합친다.
+    (카카오는 한 페이지 최대 15개)
+    """
+    if not os.environ.get("KAKAO_REST_API_KEY"):
+        print("🚨 Error: KAKAO_REST_API_KEY 환경변수가 없습니다.")
+        return []
+
+    try:
+        return get_search_client().kakao_paged(query, limit, sort=sort_type, x=x, y=y, radius=2000)
     except Exception as e:
         print(f"   ❌ API Error: {e}")
         return []
@@ -53,35 +59,44 @@ def search_local_places(query: str, display: int = 5, start: int = 1, sort: str
     - start: 시작 위치
     - sort: 'random' (기본, 정확도순) / 'comment' (리뷰 많은 순)
     """
-    url = "https://openapi.naver.com/v1/search/local.json"
-
-    headers = {
-        "X-Naver-Client-Id": os.environ.get("NAVER_CLIENT_ID"),
-        "X-Naver-Client-Secret": os.environ.get("NAVER_CLIENT_SECRET"),
-    }
-
-    params = {
-        "query": query,
-        "display": display,
-        "start": start,
-        "sort": sort,
-    }
     try:
-        resp = requests.get(url, headers=headers, params=params, timeout=5)
-        resp.raise_for_status()  # 4xx, 5xx 에러 시 예외 발생
-        data = resp.json()
-        items = data.get("items", [])
-        # 2. 리스트를 돌면서 전처리를 수행합니다.
-        cleaned_items = []
-        for item in items:
-            # 딕셔너리의 모든 값(Value)에 대해 clean_html 적용
-            new_item = {}
-            for key, value in item.items():
-                new_item[key] = clean_html(value)
-            cleaned_items.append(new_item)
-            
-        return cleaned_items
+        items = get_search_client().naver(query, display=display, start=start, sort=sort)
+        return _clean_items(items)
     
     except Exception as e:
         print(f"   ❌ API Error: {e}")
-        return []
\ No newline at end of file
+        return []
+
+def search_local_places_paged(query: str, limit: int, sort: str = "random"):
+    """
+    search_local_places의 페이지 버전
+    - 네이버는 한 번에 최대 5개라서, limit 개수를 채우는 데 필요한 페이지를 동시에 받아 합친다.
+    - 짧은 페이지가 오면(결과 끝) 거기서 멈춘다.
+    """
+    try:
+        items = get_search_client().naver_paged(query, limit, sort=sort)
+        return _clean_items(items)
+
+    except Exception as e:
+        print(f"   ❌ API Error: {e}")
+        return []
+
+def _clean_items(items):
+    # 리스트를 돌면서 전처리를 수행합니다.
+    cleaned_items = []
+    for item in items:
+        # 딕셔너리의 모든 값(Value)에 대해 clean_html 적용
+        new_item = {}
+        for key, value in item.items():
+            new_item[key] = clean_html(value)
+        cleaned_items.append(new_item)
+
+    return cleaned_items
+
+async def asearch_kakao(query, n, sort_type='accuracy', x=None, y=None):
+    """search_kakao의 asyncio 버전 (공유 커넥션 풀 사용)"""
+    return await asyncio.to_thread(search_kakao, query, n, sort_type, x, y)
+
+async def asearch_local_places(query: str, display: int = 5, start: int = 1, sort: str = "random"):
+    """search_local_places의 asyncio 버전 (공유 커넥션 풀 사용)"""
+    return await asyncio.to_thread(search_local_places, query, display, start, sort)
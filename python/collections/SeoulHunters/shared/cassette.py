@@ -0,0 +1,178 @@
+"""
+cassette.py - 외부 API 응답 녹화(record) / 재생(replay)
+
+역할:
+- Naver / Kakao 지역 검색, Tavily 웹 검색 응답을 한 번 실제로 받아 파일로 저장(record)하고,
+  이후에는 네트워크 없이 저장된 응답을 바이트 그대로 돌려준다(replay).
+- 네트워크가 없는 환경에서도 같은 입력으로 collector 처리량 / 그래프 지연 시간을 측정하고
+  최적화 전후를 비교하기 위한 용도.
+- replay 시 지연 시간을 흉내낼 수 있다. (고정 초 / 녹화 당시 실제 소요 시간)
+
+환경변수:
+- CASSETTE_MODE    : off (기본) / record / replay / auto (있으면 replay, 없으면 record)
+- CASSETTE_DIR     : 저장 위치 (기본 ~/.cache/seoulhunters/cassettes)
+- CASSETTE_LATENCY : replay 지연. 초 단위 숫자(예: 0.15) 또는 "recorded"
+
+파일 구조:
+    {CASSETTE_DIR}/{namespace}/{sha1}.body       응답 원본 바이트
+    {CASSETTE_DIR}/{namespace}/{sha1}.meta.json  요청 키, 녹화 시각, 소요 시간
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+MODES = ("off", "record", "replay", "auto")
+DEFAULT_CASSETTE_DIR = "~/.cache/seoulhunters/cassettes"
+
+
+class CassetteMissError(LookupError):
+    """replay 모드에서 녹화된 응답이 없을 때"""
+
+
+def _key_json(key_params: Dict[str, Any]) -> str:
+    return json.dumps(key_params, sort_keys=True, ensure_ascii=False, default=str)
+
+
+class Cassette:
+    def __init__(
+        self,
+        directory: str = DEFAULT_CASSETTE_DIR,
+        mode: str = "replay",
+        latency: Union[None, float, str] = None,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"알 수 없는 cassette mode: {mode} (가능: {MODES})")
+        self.directory = Path(os.path.expanduser(directory))
+        self.mode = mode
+        self.latency = latency  # None / 초(float) / "recorded"
+
+        self._lock = threading.Lock()
+        self.recorded = 0
+        self.replayed = 0
+        self.misses = 0
+
+    def _paths(self, namespace: str, key_params: Dict[str, Any]):
+        digest = hashlib.sha1(_key_json(key_params).encode("utf-8")).hexdigest()
+        folder = self.directory / namespace
+        return folder / f"{digest}.body", folder / f"{digest}.meta.json"
+
+    def _simulate_latency(self, meta_path: Path):
+        if self.latency is None:
+            return
+        if self.latency == "recorded":
+            delay = json.loads(meta_path.read_text(encoding="utf-8")).get("elapsed", 0.0)
+        else:
+            delay = float(self.latency)
+        if delay > 0:
+            time.sleep(delay)
+
+    def lookup(self, namespace: str, key_params: Dict[str, Any]) -> Optional[bytes]:
+        """
+        녹화된 응답만 찾아본다 (fetch 없음).
+        - replay/auto 에서 있으면 응답 바이트, 없으면 None (replay 모드면 CassetteMissError)
+        - 호출 제한(rate limit) 밖에서 먼저 부르면 재생은 quota 를 쓰지 않는다.
+        """
+        body_path, meta_path = self._paths(namespace, key_params)
+
+        if self.mode in ("replay", "auto") and body_path.exists():
+            self._simulate_latency(meta_path)
+            with self._lock:
+                self.replayed += 1
+            return body_path.read_bytes()
+
+        if self.mode == "replay":
+            with self._lock:
+                self.misses += 1
+            raise CassetteMissError(f"[{namespace}] 녹화된 응답이 없습니다: {_key_json(key_params)}")
+        return None
+
+    def play(self, namespace: str, key_params: Dict[str, Any], fetch: Callable[[], bytes]) -> bytes:
+        """
+        key_params(요청을 구분하는 값. 비밀키/헤더는 넣지 말 것)에 해당하는 응답 바이트를 돌려준다.
+        - replay: 저장된 응답 (없으면 CassetteMissError)
+        - record: 항상 fetch() 후 저장
+        - auto  : 저장된 게 있으면 replay, 없으면 record
+        """
+        body = self.lookup(namespace, key_params)
+        if body is not None:
+            return body
+        return self.record(namespace, key_params, fetch)
+
+    def record(self, namespace: str, key_params: Dict[str, Any], fetch: Callable[[], bytes]) -> bytes:
+        """fetch() 결과를 저장하고 그대로 돌려준다"""
+        body_path, meta_path = self._paths(namespace, key_params)
+        started = time.perf_counter()
+        body = fetch()
+        elapsed = time.perf_counter() - started
+
+        body_path.parent.mkdir(parents=True, exist_ok=True)
+        # 파일을 통째로 쓴 뒤 rename → 동시에 replay 하는 쪽이 반쯤 쓴 파일을 읽지 않도록
+        tmp_path = body_path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(body)
+        meta_path.write_text(
+            json.dumps(
+                {
+                    "namespace": namespace,
+                    "key": key_params,
+                    "recorded_at": time.time(),
+                    "elapsed": round(elapsed, 4),
+                    "size": len(body),
+                },
+                ensure_ascii=False,
+                indent=2,
+                default=str,
+            ),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, body_path)
+        with self._lock:
+            self.recorded += 1
+        return body
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "recorded": self.recorded,
+                "replayed": self.replayed,
+                "misses": self.misses,
+            }
+
+
+# ---------------------------------------------------------
+# 환경변수 기반 전역 cassette
+# ---------------------------------------------------------
+_cassette: Optional[Cassette] = None
+_cassette_loaded = False
+_cassette_lock = threading.Lock()
+
+
+def _latency_from_env() -> Union[None, float, str]:
+    value = os.environ.get("CASSETTE_LATENCY")
+    if not value:
+        return None
+    if value == "recorded":
+        return value
+    return float(value)
+
+
+def get_cassette() -> Optional[Cassette]:
+    """CASSETTE_MODE가 off(기본)면 None, 아니면 프로세스 전역 Cassette"""
+    global _cassette, _cassette_loaded
+    if not _cassette_loaded:
+        with _cassette_lock:
+            if not _cassette_loaded:
+                mode = os.environ.get("CASSETTE_MODE", "off").lower()
+                if mode != "off":
+                    _cassette = Cassette(
+                        directory=os.environ.get("CASSETTE_DIR", DEFAULT_CASSETTE_DIR),
+                        mode=mode,
+                        latency=_latency_from_env(),
+                    )
+                _cassette_loaded = True
+    return _cassette
@@ -0,0 +1,116 @@
+"""
+distance.py - 후보 풀 거리 행렬 서비스 (NumPy 벡터화 + 풀 단위 메모이즈)
+
+역할:
+- 장소 좌표 목록(경도 x, 위도 y)에 대한 모든 쌍의 haversine 거리(m)를 numpy로 한 번에 계산한다.
+  (파이썬 이중 루프 / 정렬 key 안에서 매번 좌표 파싱 → 행렬 한 번)
+- 같은 풀(좌표가 같으면 같은 지문)은 다시 계산하지 않고 LRU 메모리 캐시에서 꺼낸다.
+  Agent 4/5, 지도, 재계획이 같은 candidates 로 여러 번 불러도 계산은 한 번.
+- 질의: nearest_k (가까운 k개), within_radius (반경 안), route_length (경로 길이), distances_from (임의 좌표 → 풀 전체)
+
+사용 예시:
+
+    dm = get_distance_matrix([(p.x, p.y) for p in places])
+    dm.matrix[i, j]                    # 미터
+    dm.nearest_k(0, k=3)               # 0번과 가장 가까운 3곳 (자기 자신 제외)
+    dm.within_radius(0, 800)           # 0번에서 800m 안
+    dm.route_length([3, 0, 5])         # 3 → 0 → 5 경로 길이
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from shared.geo import EARTH_RADIUS_M
+
+MAX_CACHED_POOLS = 64
+FINGERPRINT_DECIMALS = 6   # 약 0.1m 단위로 반올림해서 지문 계산
+
+Coord = Tuple[float, float]
+
+
+def haversine_matrix(xs: np.ndarray, ys: np.ndarray, xs2: Optional[np.ndarray] = None, ys2: Optional[np.ndarray] = None) -> np.ndarray:
+    """(len(xs) x len(xs2)) 거리 행렬 (m). xs2/ys2 를 생략하면 자기 자신과의 행렬"""
+    if xs2 is None:
+        xs2, ys2 = xs, ys
+    lon1, lat1 = np.radians(xs)[:, None], np.radians(ys)[:, None]
+    lon2, lat2 = np.radians(xs2)[None, :], np.radians(ys2)[None, :]
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def pool_fingerprint(coords: Sequence[Coord]) -> str:
+    arr = np.round(np.asarray(coords, dtype=float).reshape(-1, 2), FINGERPRINT_DECIMALS)
+    return hashlib.sha1(arr.tobytes()).hexdigest()
+
+
+class DistanceMatrix:
+    def __init__(self, coords: Sequence[Coord]):
+        arr = np.asarray(coords, dtype=float).reshape(-1, 2)
+        self.xs = arr[:, 0]
+        self.ys = arr[:, 1]
+        self.matrix = haversine_matrix(self.xs, self.ys)
+        self.fingerprint = pool_fingerprint(coords)
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    def distances_from(self, x: float, y: float) -> np.ndarray:
+        """임의 좌표(예: 하루 중심) → 풀 전체 거리 (m)"""
+        return haversine_matrix(np.array([x]), np.array([y]), self.xs, self.ys)[0]
+
+    def nearest_k(self, i: int, k: int, candidates: Optional[Sequence[int]] = None) -> List[int]:
+        """i번과 가까운 k곳 (자기 자신 제외, 거리 → 인덱스 순으로 결정적)"""
+        pool = np.asarray(candidates if candidates is not None else range(len(self)), dtype=int)
+        pool = pool[pool != i]
+        if len(pool) == 0 or k <= 0:
+            return []
+        order = np.lexsort((pool, self.matrix[i, pool]))
+        return pool[order[:k]].tolist()
+
+    def within_radius(self, i: int, radius_m: float) -> List[int]:
+        """i번에서 radius_m 안의 장소 (자기 자신 제외, 가까운 순)"""
+        d = self.matrix[i]
+        hits = np.where(d <= radius_m)[0]
+        hits = hits[hits != i]
+        return hits[np.lexsort((hits, d[hits]))].tolist()
+
+    def route_length(self, order: Sequence[int]) -> float:
+        """열린 경로 길이 (m)"""
+        if len(order) < 2:
+            return 0.0
+        idx = np.asarray(order, dtype=int)
+        return float(self.matrix[idx[:-1], idx[1:]].sum())
+
+
+_lock = threading.Lock()
+_pools: "OrderedDict[str, DistanceMatrix]" = OrderedDict()
+_hits = 0
+_misses = 0
+
+
+def get_distance_matrix(coords: Sequence[Coord]) -> DistanceMatrix:
+    """풀 지문 기준으로 메모이즈된 거리 행렬"""
+    global _hits, _misses
+    key = pool_fingerprint(coords)
+    with _lock:
+        dm = _pools.get(key)
+        if dm is not None:
+            _pools.move_to_end(key)
+            _hits += 1
+            return dm
+    dm = DistanceMatrix(coords)
+    with _lock:
+        _misses += 1
+        _pools[key] = dm
+        while len(_pools) > MAX_CACHED_POOLS:
+            _pools.popitem(last=False)
+    return dm
+
+
+def distance_stats() -> Dict[str, int]:
+    with _lock:
+        return {"pools": len(_pools), "hits": _hits, "misses": _misses}
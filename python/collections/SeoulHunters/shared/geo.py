@@ -0,0 +1,117 @@
+"""
+geo.py - 좌표 정규화 / 거리 / 같은 장소 판별 헬퍼
+
+- Naver 지역 검색: mapx, mapy = WGS84 경위도 * 1e7 (정수 문자열)
+- Kakao 키워드 검색: x, y = WGS84 경위도 (실수 문자열)
+→ 둘 다 (경도 x, 위도 y) float 로 맞춘 뒤 거리(m)와 이름 유사도로 같은 장소인지 판단한다.
+"""
+
+import math
+import re
+from difflib import SequenceMatcher
+from typing import Any, Dict, Tuple
+
+EARTH_RADIUS_M = 6371008.8
+
+# 같은 장소로 보는 기준
+MERGE_DISTANCE_M = 30          # 이름이 비슷하면 이 거리 안은 같은 장소
+MERGE_MIN_SIMILARITY = 0.6
+SAME_NAME_DISTANCE_M = 100     # 이름이 (정규화 후) 완전히 같으면 조금 더 멀어도 같은 장소
+# 한쪽 이름이 다른 쪽에 포함("스타벅스" ⊂ "스타벅스 성수점")되는 경우는 체인 지점일 수 있어 병합 기준보다 낮게 매기고,
+# 주소(도로명/지번 + 번지)가 같을 때만 같은 장소로 본다.
+SUBSTRING_SIMILARITY = 0.55
+
+_NAME_STRIP = re.compile(r"[\s\-_·.,()\[\]'\"&]+")
+# "연무장길 12", "성수이로 7-1" (도로명) / "성수동2가 315-1" (지번)
+_ROAD_ADDRESS = re.compile(r"(\S+(?:로|길))\s*(\d+(?:-\d+)?)")
+_JIBUN_ADDRESS = re.compile(r"(\S+(?:동|가|리))\s*(?:산\s*)?(\d+(?:-\d+)?)")
+
+
+def haversine_m(x1: float, y1: float, x2: float, y2: float) -> float:
+    """두 WGS84 좌표(경도 x, 위도 y) 사이 거리 (미터)"""
+    lon1, lat1, lon2, lat2 = map(math.radians, (x1, y1, x2, y2))
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+
+def naver_xy(item: Dict[str, Any]) -> Tuple[float, float]:
+    """Naver item의 mapx/mapy(WGS84 * 1e7) → (경도, 위도)"""
+    try:
+        return float(item.get("mapx") or 0) / 1e7, float(item.get("mapy") or 0) / 1e7
+    except (TypeError, ValueError):
+        return 0.0, 0.0
+
+
+def kakao_xy(doc: Dict[str, Any]) -> Tuple[float, float]:
+    """Kakao document의 x/y(WGS84) → (경도, 위도)"""
+    try:
+        return float(doc.get("x") or 0), float(doc.get("y") or 0)
+    except (TypeError, ValueError):
+        return 0.0, 0.0
+
+
+def normalize_place_name(name: str) -> str:
+    """비교용 이름: 공백/기호 제거 + 소문자 (예: '카페 어니언 성수' → '카페어니언성수')"""
+    return _NAME_STRIP.sub("", name or "").lower()
+
+
+def name_similarity(a: str, b: str) -> float:
+    """정규화한 이름이 같으면 1.0, 한쪽이 다른 쪽에 포함되면 SUBSTRING_SIMILARITY 이하, 나머지는 문자열 유사도"""
+    na, nb = normalize_place_name(a), normalize_place_name(b)
+    if not na or not nb:
+        return 0.0
+    if na == nb:
+        return 1.0
+    ratio = SequenceMatcher(None, na, nb).ratio()
+    if na in nb or nb in na:
+        return min(ratio, SUBSTRING_SIMILARITY)
+    return ratio
+
+
+def address_key(address: str):
+    """주소 → ("road"/"jibun", 길 이름, 번지). 알아볼 수 없으면 None"""
+    for kind, pattern in (("road", _ROAD_ADDRESS), ("jibun", _JIBUN_ADDRESS)):
+        m = pattern.search(address or "")
+        if m:
+            return kind, m.group(1), m.group(2)
+    return None
+
+
+def same_address(a: str, b: str):
+    """두 주소가 같은 건물인지: True / False / None(한쪽을 모르거나 도로명·지번이 섞여 비교 불가)"""
+    ka, kb = address_key(a), address_key(b)
+    if ka is None or kb is None or ka[0] != kb[0]:
+        return None
+    return ka == kb
+
+
+def is_same_place(
+    name_a: str, xy_a: Tuple[float, float],
+    name_b: str, xy_b: Tuple[float, float],
+    max_distance_m: float = MERGE_DISTANCE_M,
+    min_similarity: float = MERGE_MIN_SIMILARITY,
+    address_a: str = "",
+    address_b: str = "",
+) -> bool:
+    """
+    이름 유사도 + 거리 (+ 주소)로 같은 장소인지 판단 (좌표가 없으면 이름이 완전히 같을 때만)
+    - 주소를 둘 다 알아볼 수 있는데 다르면 같은 장소가 아님 (가까운 체인 지점)
+    - 주소가 같으면 이름이 포함 관계("어니언" / "카페 어니언 성수")여도 같은 장소
+    """
+    address_match = same_address(address_a, address_b)
+    if address_match is False:
+        return False
+    if not (xy_a[0] and xy_a[1] and xy_b[0] and xy_b[1]):
+        return normalize_place_name(name_a) == normalize_place_name(name_b)
+
+    distance = haversine_m(xy_a[0], xy_a[1], xy_b[0], xy_b[1])
+    if distance > SAME_NAME_DISTANCE_M:
+        return False
+    similarity = name_similarity(name_a, name_b)
+    if similarity >= 1.0:
+        return True
+    if address_match and similarity >= SUBSTRING_SIMILARITY:
+        return True
+    return distance <= max_distance_m and similarity >= min_similarity
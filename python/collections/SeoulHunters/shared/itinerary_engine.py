@@ -0,0 +1,217 @@
+"""
+itinerary_engine.py - 좌표 기반 일정 엔진 (LLM 없이, 결정적)
+
+역할:
+- 장소 좌표 목록을 받아 n_days 개의 "하루 묶음"으로 나누고, 하루 안의 방문 순서를 정한다.
+  LLM에게 좌표를 보여주고 묶어 달라고 하는 것보다 빠르고(ms 단위), 같은 입력이면 항상 같은 결과.
+- 하루 묶음 (build_days)
+  1. 초기 중심: 주축(principal axis) 방향으로 점들을 정렬해 n_days 등분한 구간의 평균
+     (사용자가 고른 anchor가 있으면 각 구간에 가장 가까운 anchor를 중심으로)
+  2. 용량 제한 배정: anchor는 반드시 포함(pin), 나머지는 (중심까지 거리 x 가중치 보정) 이 작은 순서로
+     남은 자리가 있는 날에 배정. 한 날에 같은 태그가 너무 몰리지 않게 max_tag_share 적용 후 남는 자리는 채움
+  3. 배정 결과의 평균으로 중심을 다시 잡고 배정이 바뀌지 않을 때까지 반복 (최대 MAX_ITERATIONS)
+- 하루 순서 (order_route): 모든 시작점에서 nearest-neighbor → 2-opt 개선, 가장 짧은 경로 선택 (열린 경로)
+- 입력/출력은 인덱스 기반이라 Kang(CandidatePlace) / Jiwon·Anna(dict) 어느 쪽에서도 쓸 수 있다.
+  좌표가 없는 장소는 호출하는 쪽에서 빼고 넘긴다.
+
+사용 예시:
+
+    coords = [(p.x, p.y) for p in places]          # (경도, 위도)
+    days = plan_itinerary(coords, n_days=2, capacity=5, anchors=[0, 3], weights=[p.weight for p in places])
+    # → [[3, 7, 1, 0, 9], [2, 5, 4, 8, 6]]  (날짜별 방문 순서대로 인덱스)
+"""
+
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from shared.distance import get_distance_matrix, haversine_matrix
+from shared.geo import haversine_m
+
+MAX_ITERATIONS = 10
+WEIGHT_PULL = 0.5        # weight 1.0 인 장소는 거리를 절반으로 보고 먼저 배정
+MAX_TAG_SHARE = 0.4      # 하루에 같은 태그는 용량의 40%까지 (5곳이면 2곳 = 점심/저녁, 남는 자리는 제한 없이 채움)
+
+Coord = Tuple[float, float]
+
+
+def distance_matrix(coords: Sequence[Coord]) -> np.ndarray:
+    """모든 쌍의 거리(m) - shared/distance 의 풀 단위 메모이즈 행렬"""
+    return get_distance_matrix(coords).matrix
+
+
+def route_length(order: Sequence[int], dist: Sequence[Sequence[float]]) -> float:
+    """열린 경로 길이 (m)"""
+    return float(sum(dist[a][b] for a, b in zip(order, order[1:])))
+
+
+def _principal_order(coords: Sequence[Coord], indices: Sequence[int]) -> List[int]:
+    """주축 방향으로 투영한 순서 (동서로 퍼져 있으면 동서, 남북이면 남북)"""
+    lat0 = math.radians(sum(coords[i][1] for i in indices) / len(indices))
+    xs = [coords[i][0] * math.cos(lat0) for i in indices]
+    ys = [coords[i][1] for i in indices]
+    mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+    sxx = sum((x - mx) ** 2 for x in xs)
+    syy = sum((y - my) ** 2 for y in ys)
+    sxy = sum((x - mx) * (y - my) for x, y in zip(xs, ys))
+    angle = 0.5 * math.atan2(2 * sxy, sxx - syy)
+    ux, uy = math.cos(angle), math.sin(angle)
+    proj = {i: (x - mx) * ux + (y - my) * uy for i, x, y in zip(indices, xs, ys)}
+    return sorted(indices, key=lambda i: (proj[i], i))
+
+
+def _mean(coords: Sequence[Coord], indices: Sequence[int]) -> Coord:
+    return (
+        sum(coords[i][0] for i in indices) / len(indices),
+        sum(coords[i][1] for i in indices) / len(indices),
+    )
+
+
+def initial_centers(coords: Sequence[Coord], n_days: int, anchors: Sequence[int] = ()) -> List[Coord]:
+    """날짜별 시작 중심: 주축 방향 n_days 등분 구간의 평균 (anchor가 있으면 가장 가까운 anchor로 교체)"""
+    ordered = _principal_order(coords, list(range(len(coords))))
+    chunk = math.ceil(len(ordered) / n_days)
+    centers = [_mean(coords, ordered[k * chunk:(k + 1) * chunk] or ordered[-1:]) for k in range(n_days)]
+
+    # anchor가 있으면 각 구간 중심을 가장 가까운 (아직 안 쓴) anchor로 교체
+    unused = list(anchors)
+    for k in range(n_days):
+        if not unused:
+            break
+        cx, cy = centers[k]
+        best = min(unused, key=lambda a: (haversine_m(cx, cy, coords[a][0], coords[a][1]), a))
+        centers[k] = coords[best]
+        unused.remove(best)
+    return centers
+
+
+def _assign(
+    coords: Sequence[Coord],
+    centers: Sequence[Coord],
+    capacity: int,
+    anchors: Sequence[int],
+    weights: Sequence[float],
+    tags: Optional[Sequence[str]],
+    max_tag_share: float,
+) -> List[List[int]]:
+    n_days = len(centers)
+    center_dist = haversine_matrix(
+        np.array([c[0] for c in coords]), np.array([c[1] for c in coords]),
+        np.array([c[0] for c in centers]), np.array([c[1] for c in centers]),
+    ).tolist()
+    days: List[List[int]] = [[] for _ in range(n_days)]
+    assigned = set()
+
+    # 1. anchor 먼저 (용량 안에서 가장 가까운 날, 용량이 다 차도 반드시 포함)
+    for a in sorted(anchors, key=lambda a: (min(center_dist[a]), a)):
+        open_days = [k for k in range(n_days) if len(days[k]) < capacity] or list(range(n_days))
+        k = min(open_days, key=lambda k: (center_dist[a][k], len(days[k]), k))
+        days[k].append(a)
+        assigned.add(a)
+
+    # 2. 나머지: (거리 x 가중치 보정) 작은 순서
+    pairs = sorted(
+        (center_dist[i][k] * (1 - WEIGHT_PULL * max(0.0, min(1.0, weights[i]))), i, k)
+        for i in range(len(coords)) if i not in assigned
+        for k in range(n_days)
+    )
+    tag_limit = max(1, math.ceil(capacity * max_tag_share))
+    for use_tag_limit in ((True, False) if tags else (False,)):
+        for _, i, k in pairs:
+            if i in assigned or len(days[k]) >= capacity:
+                continue
+            if use_tag_limit and sum(1 for j in days[k] if tags[j] == tags[i]) >= tag_limit:
+                continue
+            days[k].append(i)
+            assigned.add(i)
+    return days
+
+
+def build_days(
+    coords: Sequence[Coord],
+    n_days: int,
+    capacity: int,
+    anchors: Sequence[int] = (),
+    weights: Optional[Sequence[float]] = None,
+    tags: Optional[Sequence[str]] = None,
+    max_tag_share: float = MAX_TAG_SHARE,
+) -> List[List[int]]:
+    """좌표 → 날짜별 장소 인덱스 묶음 (순서는 아직 정하지 않음)"""
+    if not coords or n_days <= 0:
+        return [[] for _ in range(max(0, n_days))]
+    weights = weights or [0.0] * len(coords)
+    anchors = list(dict.fromkeys(anchors))
+    # 장소가 모자라면 날짜별로 고르게
+    capacity = max(1, min(capacity, math.ceil(len(coords) / n_days)))
+
+    centers = initial_centers(coords, n_days, anchors)
+    days = _assign(coords, centers, capacity, anchors, weights, tags, max_tag_share)
+    for _ in range(MAX_ITERATIONS):
+        centers = [_mean(coords, d) if d else c for d, c in zip(days, centers)]
+        new_days = _assign(coords, centers, capacity, anchors, weights, tags, max_tag_share)
+        if [sorted(d) for d in new_days] == [sorted(d) for d in days]:
+            break
+        days = new_days
+    return days
+
+
+def _two_opt(order: List[int], dist: Sequence[Sequence[float]]) -> List[int]:
+    """열린 경로 2-opt: 구간을 뒤집어 짧아지면 반영, 더 이상 개선이 없을 때까지"""
+    improved = True
+    while improved:
+        improved = False
+        for i in range(len(order) - 1):
+            for j in range(i + 1, len(order)):
+                before = (dist[order[i - 1]][order[i]] if i > 0 else 0.0) + (dist[order[j]][order[j + 1]] if j + 1 < len(order) else 0.0)
+                after = (dist[order[i - 1]][order[j]] if i > 0 else 0.0) + (dist[order[i]][order[j + 1]] if j + 1 < len(order) else 0.0)
+                if after + 1e-9 < before:
+                    order[i:j + 1] = reversed(order[i:j + 1])
+                    improved = True
+    return order
+
+
+def _nearest_neighbor(start: int, indices: Sequence[int], dist: Sequence[Sequence[float]]) -> List[int]:
+    order = [start]
+    remaining = [i for i in indices if i != start]
+    while remaining:
+        last = order[-1]
+        nxt = min(remaining, key=lambda i: (dist[last][i], i))
+        order.append(nxt)
+        remaining.remove(nxt)
+    return order
+
+
+def order_route(indices: Sequence[int], dist: Sequence[Sequence[float]]) -> List[int]:
+    """하루치 인덱스 → 방문 순서 (모든 시작점 NN + 2-opt 중 가장 짧은 경로)"""
+    indices = list(indices)
+    if len(indices) <= 2:
+        return indices
+    best: Optional[List[int]] = None
+    best_len = float("inf")
+    for start in indices:
+        order = _two_opt(_nearest_neighbor(start, indices, dist), dist)
+        length = route_length(order, dist)
+        if length + 1e-9 < best_len:
+            best, best_len = order, length
+    return best
+
+
+def plan_itinerary(
+    coords: Sequence[Coord],
+    n_days: int,
+    capacity: int,
+    anchors: Sequence[int] = (),
+    weights: Optional[Sequence[float]] = None,
+    tags: Optional[Sequence[str]] = None,
+    dist: Optional[Sequence[Sequence[float]]] = None,
+) -> List[List[int]]:
+    """build_days + order_route. 날짜별로 방문 순서대로 정렬된 인덱스 리스트"""
+    dist = dist if dist is not None else distance_matrix(coords)
+    return [order_route(day, dist) for day in build_days(coords, n_days, capacity, anchors, weights, tags)]
+
+
+def engine_summary(days: List[List[int]], dist: Sequence[Sequence[float]]) -> Dict[str, float]:
+    """날짜별 경로 길이 요약 (로그용)"""
+    lengths = [route_length(d, dist) for d in days]
+    return {"days": len(days), "places": sum(len(d) for d in days), "total_km": round(sum(lengths) / 1000, 2)}
@@ -0,0 +1,252 @@
+"""
+llm_cache.py - LLM 응답 exact-match 디스크 캐시 (SQLite, opt-in)
+
+역할:
+- temperature=0 으로 도는 노드(router / planner / allocator 등)는 세션이 달라도 같은 프롬프트가 자주 반복된다.
+  (같은 선호도 → 같은 할당 전략) 이런 호출의 응답을 저장해 두고 몇 ms 안에 돌려준다.
+- 키: 노드 이름 + 모델 + temperature + 정규화된 메시지(공백 정리) + 출력 스키마
+- TTL, 최대 개수 기반 LRU 제거, 노드별 hit/miss 카운터 제공. (공통 부분은 sqlite_cache.py)
+- 노드별로 켜야 동작한다 (기본: 전부 꺼짐).
+
+환경변수:
+- LLM_CACHE_NODES : 캐시할 노드 이름 (쉼표 구분, 예: "router,planner,allocator" / "all")
+- LLM_CACHE_PATH  : 저장 위치 (기본 ~/.cache/seoulhunters/llm_cache.sqlite3)
+- LLM_CACHE_TTL   : 유효 시간(초, 기본 24시간)
+
+사용 예시:
+
+    # LangChain runnable (Kang)
+    structured_llm = cached_runnable("planner", get_structured_llm("gpt-4.1-mini", TripPreferences),
+                                     model="gpt-4.1-mini", schema=TripPreferences)
+    result = structured_llm.invoke(messages)
+
+    # OpenAI SDK 직접 호출 (Jiwon / Anna)
+    resp = cached_create("agent1", client.responses.create, model="gpt-4.1-mini", input=[...])
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, Optional, Set
+
+from .sqlite_cache import SQLiteCache
+
+DEFAULT_LLM_CACHE_PATH = "~/.cache/seoulhunters/llm_cache.sqlite3"
+DEFAULT_LLM_CACHE_TTL = 24 * 3600
+DEFAULT_MAX_ENTRIES = 5000
+
+
+def _normalize_text(text: Any) -> Any:
+    return " ".join(text.split()) if isinstance(text, str) else text
+
+
+def normalize_messages(messages: Any) -> Any:
+    """LangChain 메시지 / OpenAI dict 메시지 / 문자열 → 비교용 (role, 공백 정리된 content) 리스트"""
+    if isinstance(messages, str):
+        return _normalize_text(messages)
+    normalized = []
+    for m in messages:
+        if isinstance(m, dict):
+            normalized.append([m.get("role"), _normalize_text(m.get("content"))])
+        else:
+            normalized.append([getattr(m, "type", type(m).__name__), _normalize_text(getattr(m, "content", str(m)))])
+    return normalized
+
+
+def _schema_name(schema: Any) -> Optional[str]:
+    if schema is None:
+        return None
+    if isinstance(schema, type):
+        fields = getattr(schema, "model_fields", None)
+        return f"{schema.__module__}.{schema.__qualname__}" + (f":{sorted(fields)}" if fields else "")
+    return json.dumps(schema, sort_keys=True, ensure_ascii=False, default=str)
+
+
+def make_llm_key(node: str, model: str, messages: Any, schema: Any = None, **params) -> str:
+    raw = json.dumps(
+        {
+            "node": node,
+            "model": model,
+            "messages": normalize_messages(messages),
+            "schema": _schema_name(schema),
+            "params": {k: v for k, v in sorted(params.items()) if v is not None},
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LLMCache(SQLiteCache):
+    """LLM 응답용 SQLite TTL + LRU 캐시 (저장/만료/LRU 는 sqlite_cache.SQLiteCache, 노드별 카운터)"""
+
+    def __init__(
+        self,
+        path: str = DEFAULT_LLM_CACHE_PATH,
+        nodes: Optional[Set[str]] = None,
+        ttl: float = DEFAULT_LLM_CACHE_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        super().__init__(path, table="llm_responses", group_column="node", max_entries=max_entries)
+        self.nodes = set(nodes or ())
+        self.ttl = ttl
+
+    def enabled(self, node: str) -> bool:
+        return "all" in self.nodes or node in self.nodes
+
+    def get(self, node: str, key: str) -> Optional[str]:
+        return self._get(key, node, self.ttl)
+
+    def set(self, node: str, key: str, payload: str):
+        self._set(key, node, payload)
+
+    def invalidate(self, node: Optional[str] = None):
+        if node:
+            self._delete("node = ?", (node,))
+        else:
+            self._delete()
+
+    def stats(self) -> Dict[str, Any]:
+        per_node = {}
+        for node in sorted(set(self.hits) | set(self.misses)):
+            hits, misses = self.hits.get(node, 0), self.misses.get(node, 0)
+            per_node[node] = {"hits": hits, "misses": misses, "hit_rate": round(hits / (hits + misses), 3)}
+        return {"nodes": per_node, "evictions": self.evictions, "size": self.size(), "max_entries": self.max_entries}
+
+
+# ---------------------------------------------------------
+# 환경변수 기반 전역 캐시
+# ---------------------------------------------------------
+_llm_cache: Optional[LLMCache] = None
+_llm_cache_loaded = False
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMCache]:
+    """LLM_CACHE_NODES가 비어 있으면(기본) None, 아니면 프로세스 전역 LLMCache"""
+    global _llm_cache, _llm_cache_loaded
+    if not _llm_cache_loaded:
+        with _llm_cache_lock:
+            if not _llm_cache_loaded:
+                nodes = {n.strip() for n in os.environ.get("LLM_CACHE_NODES", "").split(",") if n.strip()}
+                if nodes:
+                    try:
+                        _llm_cache = LLMCache(
+                            os.environ.get("LLM_CACHE_PATH", DEFAULT_LLM_CACHE_PATH),
+                            nodes=nodes,
+                            ttl=float(os.environ.get("LLM_CACHE_TTL", DEFAULT_LLM_CACHE_TTL)),
+                        )
+                    except Exception as e:
+                        print(f"   ⚠️ LLM 캐시를 열 수 없어 캐시 없이 진행합니다: {e}")
+                _llm_cache_loaded = True
+    return _llm_cache
+
+
+def llm_cache_stats() -> Optional[Dict[str, Any]]:
+    cache = get_llm_cache()
+    return cache.stats() if cache is not None else None
+
+
+# ---------------------------------------------------------
+# LangChain runnable 래퍼 (Kang)
+# ---------------------------------------------------------
+class CachedRunnable:
+    """runnable.invoke(messages) 앞에 캐시를 둔다. schema가 pydantic 모델이면 JSON으로 저장/복원."""
+
+    def __init__(self, node: str, runnable: Any, model: str, schema: Any = None, temperature: float = 0):
+        self.node = node
+        self.runnable = runnable
+        self.model = model
+        self.schema = schema
+        self.temperature = temperature
+
+    def _encode(self, result: Any) -> str:
+        if hasattr(result, "model_dump_json"):
+            # None은 빼고 저장 → 복원 시 기본값으로 (Optional 표기 없이 default=None 인 필드 대비)
+            return result.model_dump_json(exclude_none=True)
+        if hasattr(result, "content"):   # AIMessage (plain get_llm)
+            return json.dumps({"content": result.content}, ensure_ascii=False)
+        return json.dumps(result, ensure_ascii=False)
+
+    def _decode(self, payload: str) -> Any:
+        if self.schema is not None and hasattr(self.schema, "model_validate_json"):
+            return self.schema.model_validate_json(payload)
+        data = json.loads(payload)
+        if self.schema is None and isinstance(data, dict) and set(data) == {"content"}:
+            from langchain_core.messages import AIMessage
+            return AIMessage(content=data["content"])
+        return data
+
+    def invoke(self, messages: Any, *args, **kwargs) -> Any:
+        cache = get_llm_cache()
+        if cache is None or not cache.enabled(self.node):
+            return self.runnable.invoke(messages, *args, **kwargs)
+
+        key = make_llm_key(self.node, self.model, messages, self.schema, temperature=self.temperature)
+        payload = cache.get(self.node, key)
+        if payload is not None:
+            try:
+                return self._decode(payload)
+            except Exception as e:
+                print(f"   ⚠️ [LLM Cache] 저장된 응답 복원 실패 → 다시 호출: {e}")
+
+        result = self.runnable.invoke(messages, *args, **kwargs)
+        try:
+            cache.set(self.node, key, self._encode(result))
+        except Exception as e:
+            print(f"   ⚠️ [LLM Cache] 저장 실패: {e}")
+        return result
+
+    def __getattr__(self, name: str):
+        # stream / batch 등 나머지는 원래 runnable 그대로
+        return getattr(self.runnable, name)
+
+
+def cached_runnable(node: str, runnable: Any, model: str, schema: Any = None, temperature: float = 0) -> CachedRunnable:
+    return CachedRunnable(node, runnable, model, schema, temperature)
+
+
+# ---------------------------------------------------------
+# OpenAI SDK 직접 호출 래퍼 (Jiwon / Anna)
+# ---------------------------------------------------------
+def _decode_openai(payload: str) -> Any:
+    data = json.loads(payload)
+    kind = data.get("object")
+    if kind == "response":
+        from openai.types.responses import Response
+        return Response.model_validate(data)
+    if kind == "chat.completion":
+        from openai.types.chat import ChatCompletion
+        return ChatCompletion.model_validate(data)
+    raise ValueError(f"알 수 없는 응답 타입: {kind}")
+
+
+def cached_create(node: str, create: Callable[..., Any], **kwargs) -> Any:
+    """
+    client.responses.create / client.chat.completions.create 를 캐시와 함께 호출.
+    - 키: node + model + messages/input + 나머지 요청 파라미터(temperature, response_format 등)
+    - 응답 객체는 model_dump_json()으로 저장하고, hit 시 같은 타입(Response / ChatCompletion)으로 복원
+    """
+    cache = get_llm_cache()
+    if cache is None or not cache.enabled(node):
+        return create(**kwargs)
+
+    params = {k: v for k, v in kwargs.items() if k not in ("model", "messages", "input")}
+    messages = kwargs.get("messages", kwargs.get("input"))
+    key = make_llm_key(node, kwargs.get("model", ""), messages, **params)
+
+    payload = cache.get(node, key)
+    if payload is not None:
+        try:
+            return _decode_openai(payload)
+        except Exception as e:
+            print(f"   ⚠️ [LLM Cache] 저장된 응답 복원 실패 → 다시 호출: {e}")
+
+    resp = create(**kwargs)
+    try:
+        cache.set(node, key, resp.model_dump_json())
+    except Exception as e:
+        print(f"   ⚠️ [LLM Cache] 저장 실패: {e}")
+    return resp
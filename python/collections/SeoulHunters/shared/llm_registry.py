@@ -0,0 +1,103 @@
+"""
+llm_registry.py - 프로세스 전역 LLM 클라이언트 레지스트리
+
+역할:
+- 노드가 호출될 때마다 ChatOpenAI(...) 와 with_structured_output(...) 을 새로 만들지 않도록
+  (model, temperature, schema) 별로 한 번 만든 runnable을 돌려준다.
+- 모든 ChatOpenAI가 하나의 httpx 커넥션 풀을 같이 써서, 모델이 달라도
+  api.openai.com 으로의 TCP/TLS 연결을 재사용한다.
+- cache_node를 주면 shared/llm_cache 의 exact-match 캐시를 앞에 붙인다.
+  (LLM_CACHE_NODES 에 해당 노드가 켜져 있을 때만 실제로 캐시)
+- 생성은 lock으로 감싸서 여러 스레드(Gradio 세션, fetch_all, to_thread)에서 불러도 한 번만 만든다.
+
+사용 예시:
+
+    llm = get_llm("gpt-4o-mini", temperature=0)
+    router_chain = get_structured_llm("gpt-4o-mini", RouteDecision, cache_node="router")
+    result = router_chain.invoke(messages)
+"""
+
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+from langchain_openai import ChatOpenAI
+
+from .llm_cache import cached_runnable
+
+POOL_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=60)
+DEFAULT_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+_lock = threading.RLock()
+_http_client: Optional[httpx.Client] = None
+_http_async_client: Optional[httpx.AsyncClient] = None
+_llms: Dict[Tuple, ChatOpenAI] = {}
+_structured: Dict[Tuple, Any] = {}
+
+
+def _freeze(kwargs: Dict[str, Any]) -> Tuple:
+    return tuple(sorted(kwargs.items()))
+
+
+def _http_clients() -> Tuple[httpx.Client, httpx.AsyncClient]:
+    global _http_client, _http_async_client
+    with _lock:
+        if _http_client is None:
+            _http_client = httpx.Client(limits=POOL_LIMITS, timeout=DEFAULT_TIMEOUT)
+            _http_async_client = httpx.AsyncClient(limits=POOL_LIMITS, timeout=DEFAULT_TIMEOUT)
+    return _http_client, _http_async_client
+
+
+def get_llm(model: str, temperature: float = 0, cache_node: Optional[str] = None, **kwargs):
+    """(model, temperature, 추가 옵션) 별로 하나의 ChatOpenAI를 공유한다."""
+    if cache_node:
+        return _cached(cache_node, model, None, temperature, kwargs)
+    key = (model, temperature, _freeze(kwargs))
+    llm = _llms.get(key)
+    if llm is not None:
+        return llm
+    with _lock:
+        llm = _llms.get(key)
+        if llm is None:
+            http_client, http_async_client = _http_clients()
+            llm = ChatOpenAI(
+                model=model,
+                temperature=temperature,
+                http_client=http_client,
+                http_async_client=http_async_client,
+                **kwargs,
+            )
+            _llms[key] = llm
+    return llm
+
+
+def get_structured_llm(model: str, schema: Any, temperature: float = 0, cache_node: Optional[str] = None, **kwargs):
+    """(model, temperature, schema) 별로 하나의 with_structured_output runnable을 공유한다."""
+    if cache_node:
+        return _cached(cache_node, model, schema, temperature, kwargs)
+    key = (model, temperature, schema, _freeze(kwargs))
+    runnable = _structured.get(key)
+    if runnable is not None:
+        return runnable
+    with _lock:
+        runnable = _structured.get(key)
+        if runnable is None:
+            runnable = get_llm(model, temperature, **kwargs).with_structured_output(schema)
+            _structured[key] = runnable
+    return runnable
+
+
+def _cached(cache_node: str, model: str, schema: Any, temperature: float, kwargs: Dict[str, Any]):
+    key = (cache_node, model, temperature, schema, _freeze(kwargs))
+    with _lock:
+        runnable = _structured.get(key)
+        if runnable is None:
+            inner = get_structured_llm(model, schema, temperature, **kwargs) if schema is not None else get_llm(model, temperature, **kwargs)
+            runnable = cached_runnable(cache_node, inner, model=model, schema=schema, temperature=temperature)
+            _structured[key] = runnable
+    return runnable
+
+
+def registry_stats() -> Dict[str, int]:
+    with _lock:
+        return {"llms": len(_llms), "structured": len(_structured)}
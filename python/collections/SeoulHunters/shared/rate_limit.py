@@ -0,0 +1,291 @@
+"""
+rate_limit.py - 검색 provider별 호출 제한 / 재시도 / 서킷 브레이커
+
+역할:
+- provider(naver, kakao)마다 하나의 ProviderGuard를 프로세스 전체에서 공유한다.
+  → 여러 Gradio 세션이 동시에 검색해도 초당/일일 쿼터를 공평하게 나눠 쓴다.
+- 초당 제한: 토큰 버킷 (먼저 기다린 요청이 먼저 토큰을 받음)
+- 일일 제한: KST 자정 기준으로 초기화되는 카운터
+- 429 / 5xx / 네트워크 오류: jitter가 들어간 지수 백오프로 재시도 (Retry-After 헤더 우선)
+- 연속 실패가 쌓이면 서킷을 열어 잠시 호출을 막고, 이후 1건만 시험 호출(half-open)
+- metrics()로 호출 수, 재시도, 대기 시간, 쿼터 사용량 등을 확인할 수 있다.
+
+공개 쿼터 (기본값, PROVIDER_LIMITS 에서 조정):
+- 네이버 검색 API: 일 25,000회
+- 카카오 로컬 API: 일 100,000회
+"""
+
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+import requests
+
+T = TypeVar("T")
+
+KST = timezone(timedelta(hours=9))
+
+# provider별 기본 한도 (초당 요청 수, 버스트 크기, 일일 한도)
+PROVIDER_LIMITS: Dict[str, Dict[str, float]] = {
+    "naver": {"rate_per_sec": 10, "burst": 10, "daily_limit": 25000},
+    "kakao": {"rate_per_sec": 20, "burst": 20, "daily_limit": 100000},
+}
+DEFAULT_LIMITS = {"rate_per_sec": 5, "burst": 5, "daily_limit": 10000}
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class RateLimitError(RuntimeError):
+    """쿼터 소진 / 서킷 오픈 등으로 호출 자체를 하지 않은 경우"""
+
+
+class QuotaExceededError(RateLimitError):
+    pass
+
+
+class CircuitOpenError(RateLimitError):
+    pass
+
+
+# ---------------------------------------------------------
+# 1. 토큰 버킷 (초당 제한)
+# ---------------------------------------------------------
+class TokenBucket:
+    def __init__(self, rate_per_sec: float, burst: float):
+        self.rate = float(rate_per_sec)
+        self.capacity = float(burst)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        # 토큰은 하나씩 "예약"해서 나눠주므로 대기 순서대로 공평하게 받는다
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """토큰 하나를 예약하고, 실제로 기다린 시간(초)을 돌려준다."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+# ---------------------------------------------------------
+# 2. 일일 쿼터 (KST 자정 초기화)
+# ---------------------------------------------------------
+class DailyQuota:
+    def __init__(self, limit: int):
+        self.limit = int(limit)
+        self.used = 0
+        self._day = self._today()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _today():
+        return datetime.now(KST).date()
+
+    def consume(self):
+        with self._lock:
+            today = self._today()
+            if today != self._day:
+                self._day = today
+                self.used = 0
+            if self.used >= self.limit:
+                raise QuotaExceededError(f"일일 쿼터 {self.limit}회를 모두 사용했습니다.")
+            self.used += 1
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.limit - self.used)
+
+
+# ---------------------------------------------------------
+# 3. 서킷 브레이커
+# ---------------------------------------------------------
+class CircuitBreaker:
+    """
+    - closed   : 정상. 연속 실패가 failure_threshold 이상이면 open.
+    - open     : reset_timeout 동안 호출 거부.
+    - half_open: 시험 호출 1건만 허용. 성공하면 closed, 실패하면 다시 open.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        with self._lock:
+            if self.state == "open":
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    raise CircuitOpenError("서킷이 열려 있어 호출을 건너뜁니다.")
+                self.state = "half_open"
+                self._probe_in_flight = False
+            if self.state == "half_open":
+                if self._probe_in_flight:
+                    raise CircuitOpenError("서킷 시험 호출이 진행 중입니다.")
+                self._probe_in_flight = True
+
+    def release_probe(self):
+        """시험 호출을 실제로 보내지 못했을 때 (쿼터 소진 등) 자리만 반납 - 상태는 그대로"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            self._probe_in_flight = False
+            if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+
+# ---------------------------------------------------------
+# 4. Provider 가드 (위 세 가지 + 재시도 + 지표)
+# ---------------------------------------------------------
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code in RETRYABLE_STATUS
+    return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    value = response.headers.get("Retry-After")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class ProviderGuard:
+    def __init__(
+        self,
+        name: str,
+        rate_per_sec: float,
+        burst: float,
+        daily_limit: int,
+        max_retries: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.name = name
+        self.bucket = TokenBucket(rate_per_sec, burst)
+        self.quota = DailyQuota(daily_limit)
+        self.breaker = breaker or CircuitBreaker()
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self._metrics_lock = threading.Lock()
+        self._metrics = {
+            "calls": 0,         # 실제로 나간 HTTP 요청 수 (재시도 포함)
+            "successes": 0,
+            "retries": 0,
+            "failures": 0,      # 재시도까지 다 실패한 호출 수
+            "rejected": 0,      # 쿼터 소진 / 서킷 오픈으로 거부된 호출 수
+            "throttle_wait_sec": 0.0,
+            "backoff_wait_sec": 0.0,
+        }
+
+    def _count(self, key: str, amount: float = 1):
+        with self._metrics_lock:
+            self._metrics[key] += amount
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        delay = _retry_after(error)
+        if delay is None:
+            # jitter: 기본 지연의 0.5 ~ 1.5배 (동시 재시도가 한꺼번에 몰리지 않도록)
+            delay = self.base_delay * (2 ** attempt) * random.uniform(0.5, 1.5)
+        return min(delay, self.max_delay)
+
+    def call(self, fn: Callable[[], T]) -> T:
+        """fn()을 제한/재시도/서킷 규칙에 맞춰 실행한다. 최종 실패 시 마지막 예외를 올린다."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.breaker.before_call()
+            except RateLimitError:
+                self._count("rejected")
+                raise
+            try:
+                self.quota.consume()
+            except RateLimitError:
+                # half_open 시험 호출 자리를 잡아 둔 채로 나가면 이후 호출이 전부 거부되므로 반납
+                self.breaker.release_probe()
+                self._count("rejected")
+                raise
+
+            self._count("throttle_wait_sec", self.bucket.acquire())
+            self._count("calls")
+            try:
+                result = fn()
+            except Exception as e:
+                retryable = _is_retryable(e)
+                if retryable:
+                    self.breaker.record_failure()
+                else:
+                    # 400/401 처럼 서버가 정상 응답한 오류는 가용성 문제로 보지 않는다
+                    self.breaker.record_success()
+                if attempt < self.max_retries and retryable:
+                    delay = self._backoff(attempt, e)
+                    self._count("retries")
+                    self._count("backoff_wait_sec", delay)
+                    time.sleep(delay)
+                    continue
+                self._count("failures")
+                raise
+
+            self.breaker.record_success()
+            self._count("successes")
+            return result
+
+        raise RuntimeError("unreachable")  # pragma: no cover
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._metrics_lock:
+            data = dict(self._metrics)
+        data["throttle_wait_sec"] = round(data["throttle_wait_sec"], 3)
+        data["backoff_wait_sec"] = round(data["backoff_wait_sec"], 3)
+        data["daily_used"] = self.quota.used
+        data["daily_remaining"] = self.quota.remaining
+        data["circuit"] = self.breaker.state
+        return data
+
+
+# ---------------------------------------------------------
+# 5. 프로세스 전역 레지스트리
+# ---------------------------------------------------------
+_guards: Dict[str, ProviderGuard] = {}
+_guards_lock = threading.Lock()
+
+
+def get_guard(provider: str) -> ProviderGuard:
+    """provider별 ProviderGuard 싱글톤"""
+    with _guards_lock:
+        if provider not in _guards:
+            limits = PROVIDER_LIMITS.get(provider, DEFAULT_LIMITS)
+            _guards[provider] = ProviderGuard(provider, **limits)
+        return _guards[provider]
+
+
+def all_guard_metrics() -> Dict[str, Dict[str, Any]]:
+    with _guards_lock:
+        guards = dict(_guards)
+    return {name: guard.metrics() for name, guard in guards.items()}
@@ -0,0 +1,203 @@
+"""
+scheduler.py - 시간창(time window) 기반 하루 일정 스케줄러
+
+역할:
+- 하루치 장소에 실제 방문 시각을 붙인다. (LLM이 지어내는 "오후 2시" / 고정 BASE_SLOTS 대신)
+  · 장소 종류(맛집/카페/관광/쇼핑/야경/기타)마다 방문 시작 가능 시간창과 체류 시간(분)
+    예) 맛집: 11:30~13:30 또는 17:30~20:00 에 시작, 70분
+  · 이동 시간은 shared/travel_time 의 분 단위 행렬
+- 방문 순서는 삽입(insertion) 휴리스틱으로 만들고, relocate / swap 지역 탐색으로 다듬는다.
+  비용 = 이동 시간 + 대기 시간 x WAIT_WEIGHT + 시간창을 놓친 장소 (MISSED_WINDOW_PENALTY + 초과분 x LATE_PENALTY)
+        + 하루 종료 초과 x LATE_PENALTY
+  시간창은 soft 제약이라 항상 결과가 나오고, 시간창을 놓친 장소는 missed=True 로 표시한다.
+- 장소 6곳 x 며칠이면 ms 단위.
+
+사용 예시:
+
+    kinds = [place_kind(p.tag_name, p.category) for p in day_places]
+    order, visits, cost = schedule_day(day_indices, kinds_by_index, travel.minutes)
+    visits[0]  # {"index": 3, "start": 690, "end": 760, "slot": "lunch", "label": "11:30~12:40", "missed": False}
+"""
+
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+DAY_START = 10 * 60          # 10:00 출발
+DAY_END = 22 * 60 + 30       # 22:30 까지
+WAIT_WEIGHT = 0.5
+LATE_PENALTY = 10.0
+MISSED_WINDOW_PENALTY = 60.0  # 시간창을 하나도 못 맞춘 장소 (같은 끼니 두 번 포함)
+
+# 종류별 (방문 시작 가능 시간창 목록, 체류 시간)
+PLACE_KINDS: Dict[str, Dict] = {
+    "맛집": {"windows": [(11 * 60 + 30, 13 * 60 + 30), (17 * 60 + 30, 20 * 60)], "dwell": 70},
+    "카페": {"windows": [(10 * 60, 20 * 60)], "dwell": 50},
+    "관광": {"windows": [(9 * 60 + 30, 17 * 60 + 30)], "dwell": 90},
+    "쇼핑": {"windows": [(10 * 60 + 30, 20 * 60)], "dwell": 60},
+    "야경": {"windows": [(19 * 60, 22 * 60)], "dwell": 60},
+    "기타": {"windows": [(9 * 60, 21 * 60)], "dwell": 60},
+}
+
+# 태그/카테고리 단어 → 종류 (앞에서부터 먼저 맞는 것)
+# 한 글자 단어("바", "빵", "궁" ...)는 '바베큐', '바다' 처럼 다른 단어 안에 들어가기 쉬워서
+# 토큰(공백, '>', ',' 등으로 나눈 조각)의 끝에 올 때만 인정한다 ('와인바', '경복궁', '식빵' O / '바베큐', '바다' X).
+# 두 글자 이상은 포함 여부.
+KIND_WORDS: List[Tuple[str, List[str]]] = [
+    ("야경", ["야경", "루프탑", "전망", "바", "와인바", "칵테일바", "펍", "술집", "이자카야"]),
+    ("카페", ["카페", "디저트", "베이커리", "빵", "빵집", "커피", "찻집", "간식", "snack"]),
+    ("맛집", ["맛집", "음식점", "식당", "한식", "양식", "일식", "중식", "고기", "바베큐", "분식", "국밥", "파스타", "lunch", "dinner"]),
+    ("쇼핑", ["쇼핑", "옷", "옷가게", "의류", "신발", "소품", "편집샵", "빈티지", "시장", "백화점", "가게"]),
+    ("관광", ["관광", "명소", "박물관", "미술관", "전시", "갤러리", "공원", "궁", "고궁", "한옥", "산책", "문화", "체험"]),
+]
+_TOKEN_SPLIT = re.compile(r"[\s>,/·|()\[\]]+")
+
+SLOT_LABELS = {"morning": "오전", "lunch": "점심", "afternoon": "오후", "snack": "간식", "dinner": "저녁", "night": "밤"}
+
+
+def match_kind(text: Optional[str]) -> Optional[str]:
+    """문자열(태그/카테고리/사용자 메시지) → 종류, 없으면 None"""
+    text = text or ""
+    tokens = [t for t in _TOKEN_SPLIT.split(text) if t]
+    for kind, words in KIND_WORDS:
+        if any(any(t.endswith(w) for t in tokens) if len(w) == 1 else (w in text) for w in words):
+            return kind
+    return None
+
+
+def place_kind(tag: Optional[str], category: Optional[str] = None) -> str:
+    """태그(맛집/카페 ...)를 먼저, 없으면 카테고리 문자열로 종류 판정"""
+    for text in (tag, category):
+        kind = match_kind(text)
+        if kind:
+            return kind
+    return "기타"
+
+
+def slot_of(start: int, kind: str) -> str:
+    """시작 시각 → BASE_SLOTS 이름 (morning / lunch / afternoon / snack / dinner / night)"""
+    if kind == "맛집":
+        return "lunch" if start < 15 * 60 else "dinner"
+    if start < 12 * 60:
+        return "morning"
+    if start >= 19 * 60:
+        return "night"
+    if kind == "카페" and 14 * 60 + 30 <= start < 17 * 60 + 30:
+        return "snack"
+    return "afternoon"
+
+
+def fmt_minutes(m: float) -> str:
+    m = int(round(m))
+    return f"{m // 60:02d}:{m % 60:02d}"
+
+
+def simulate(
+    route: Sequence[int],
+    kinds: Dict[int, str],
+    minutes: Sequence[Sequence[float]],
+    day_start: int = DAY_START,
+    day_end: int = DAY_END,
+) -> Tuple[float, List[Dict]]:
+    """순서대로 방문했을 때의 (비용, 방문 시각 목록)"""
+    t = float(day_start)
+    cost = 0.0
+    visits: List[Dict] = []
+    used_windows = set()   # 시간창이 여러 개인 종류(맛집)는 점심/저녁을 한 번씩만
+    prev = None
+    for i in route:
+        travel = float(minutes[prev][i]) if prev is not None else 0.0
+        t += travel
+        cost += travel
+        spec = PLACE_KINDS[kinds[i]]
+
+        # 도착 시각에 시작할 수 있는 가장 이른 (아직 안 쓴) 시간창
+        chosen = None
+        for w, (open_, close) in enumerate(spec["windows"]):
+            if len(spec["windows"]) > 1 and (kinds[i], w) in used_windows:
+                continue
+            if t <= close:
+                chosen = w
+                used_windows.add((kinds[i], w))
+                if t < open_:
+                    cost += (open_ - t) * WAIT_WEIGHT
+                    t = float(open_)
+                break
+        if chosen is None:
+            cost += MISSED_WINDOW_PENALTY + max(0.0, t - spec["windows"][-1][1]) * LATE_PENALTY
+
+        end = t + spec["dwell"]
+        visits.append({
+            "index": i,
+            "start": t,
+            "end": end,
+            "slot": slot_of(int(t), kinds[i]),
+            "label": f"{fmt_minutes(t)}~{fmt_minutes(end)}",
+            "missed": chosen is None,
+        })
+        t = end
+        prev = i
+
+    if t > day_end:
+        cost += (t - day_end) * LATE_PENALTY
+    return cost, visits
+
+
+def _insertion(indices: Sequence[int], kinds: Dict[int, str], minutes, day_start: int, day_end: int) -> List[int]:
+    """시간창이 좁은(전체 시작 가능 시간이 짧은) 장소부터, 비용이 가장 적게 늘어나는 위치에 끼워 넣기"""
+    def tightness(i: int):
+        windows = PLACE_KINDS[kinds[i]]["windows"]
+        return (sum(close - open_ for open_, close in windows), i)
+
+    route: List[int] = []
+    for i in sorted(indices, key=tightness):
+        best_route, best_cost = None, float("inf")
+        for pos in range(len(route) + 1):
+            trial = route[:pos] + [i] + route[pos:]
+            cost, _ = simulate(trial, kinds, minutes, day_start, day_end)
+            if cost < best_cost - 1e-9:
+                best_route, best_cost = trial, cost
+        route = best_route
+    return route
+
+
+def _local_search(route: List[int], kinds: Dict[int, str], minutes, day_start: int, day_end: int) -> List[int]:
+    """relocate(한 장소를 다른 위치로) / swap(두 장소 맞바꾸기) 으로 더 이상 개선이 없을 때까지"""
+    best_cost, _ = simulate(route, kinds, minutes, day_start, day_end)
+    improved = True
+    while improved:
+        improved = False
+        n = len(route)
+        moves = []
+        for a in range(n):
+            for b in range(n):
+                if a != b:
+                    moved = route[:a] + route[a + 1:]
+                    moved.insert(b, route[a])
+                    moves.append(moved)
+                if a < b:
+                    swapped = route[:]
+                    swapped[a], swapped[b] = swapped[b], swapped[a]
+                    moves.append(swapped)
+        for trial in moves:
+            cost, _ = simulate(trial, kinds, minutes, day_start, day_end)
+            if cost < best_cost - 1e-9:
+                route, best_cost = trial, cost
+                improved = True
+                break
+    return route
+
+
+def schedule_day(
+    indices: Sequence[int],
+    kinds: Dict[int, str],
+    minutes: Sequence[Sequence[float]],
+    day_start: int = DAY_START,
+    day_end: int = DAY_END,
+) -> Tuple[List[int], List[Dict], float]:
+    """하루치 장소 인덱스 → (방문 순서, 방문 시각 목록, 비용)"""
+    if not indices:
+        return [], [], 0.0
+    route = _insertion(indices, kinds, minutes, day_start, day_end)
+    route = _local_search(route, kinds, minutes, day_start, day_end)
+    cost, visits = simulate(route, kinds, minutes, day_start, day_end)
+    return route, visits, cost
@@ -0,0 +1,90 @@
+"""
+search_cache.py - 지역 검색 API 응답 디스크 캐시 (SQLite)
+
+역할:
+- 같은 검색어("성수동 카페", "연남동 맛집" 등)를 세션마다 다시 API로 보내지 않도록
+  응답을 SQLite 파일에 저장해 두고 재사용한다.
+- 키: provider + 검색 파라미터(query, display/size, start, sort, 좌표 등)
+- provider별 TTL, 최대 개수 기반 LRU 제거, hit/miss 카운터 제공. (공통 부분은 sqlite_cache.py)
+
+사용 예시:
+
+    cache = SearchCache("~/.cache/seoulhunters/search_cache.sqlite3")
+    items = cache.get("naver", params)
+    if items is None:
+        items = call_api(...)
+        cache.set("naver", params, items)
+    print(cache.stats())
+"""
+
+import json
+from typing import Any, Dict, Optional
+
+from .sqlite_cache import SQLiteCache
+
+DEFAULT_CACHE_PATH = "~/.cache/seoulhunters/search_cache.sqlite3"
+DEFAULT_MAX_ENTRIES = 20000
+
+# provider별 유효 시간 (초). 장소 목록은 자주 안 바뀌므로 넉넉하게.
+DEFAULT_TTLS: Dict[str, float] = {
+    "naver": 24 * 3600,
+    "kakao": 24 * 3600,
+}
+FALLBACK_TTL = 6 * 3600
+
+COORD_PRECISION = 5  # 좌표는 소수점 5자리(약 1m)까지만 키에 반영
+
+
+def _normalize_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    """캐시 키가 흔들리지 않도록 파라미터 정규화 (공백 정리, 좌표 반올림, None 제거)"""
+    normalized: Dict[str, Any] = {}
+    for key, value in params.items():
+        if value is None:
+            continue
+        if key == "query" and isinstance(value, str):
+            value = " ".join(value.split())
+        elif key in ("x", "y"):
+            value = round(float(value), COORD_PRECISION)
+        normalized[key] = value
+    return normalized
+
+
+def make_cache_key(provider: str, params: Dict[str, Any]) -> str:
+    return provider + ":" + json.dumps(_normalize_params(params), sort_keys=True, ensure_ascii=False)
+
+
+class SearchCache(SQLiteCache):
+    """
+    검색 응답용 SQLite TTL + LRU 캐시 (저장/만료/LRU 는 sqlite_cache.SQLiteCache).
+    - 여러 스레드(fetch_all, Gradio 세션)에서 같이 써도 되도록 lock으로 감싼다.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttls: Optional[Dict[str, float]] = None,
+    ):
+        super().__init__(path, table="responses", group_column="provider", max_entries=max_entries)
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+
+    def ttl_for(self, provider: str) -> float:
+        return self.ttls.get(provider, FALLBACK_TTL)
+
+    def get(self, provider: str, params: Dict[str, Any]) -> Optional[Any]:
+        """캐시에 있고 TTL 안이면 응답을, 아니면 None을 돌려준다."""
+        payload = self._get(make_cache_key(provider, params), provider, self.ttl_for(provider))
+        return json.loads(payload) if payload is not None else None
+
+    def set(self, provider: str, params: Dict[str, Any], value: Any):
+        self._set(make_cache_key(provider, params), provider, json.dumps(value, ensure_ascii=False))
+
+    def invalidate(self, provider: Optional[str] = None):
+        """provider 지정 시 해당 provider만, 아니면 전체 삭제"""
+        if provider:
+            self._delete("provider = ?", (provider,))
+        else:
+            self._delete()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.totals(), "max_entries": self.max_entries}
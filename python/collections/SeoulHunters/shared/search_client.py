@@ -0,0 +1,333 @@
+"""
+search_client.py - Naver / Kakao 지역 검색 공용 클라이언트
+
+역할:
+- Kang / Jiwon / Anna 세 파이프라인이 같이 쓰는 검색 클라이언트.
+- requests.Session 하나를 프로세스 전체에서 공유해서 keep-alive 커넥션 풀을 재사용한다.
+  (키워드마다 TCP + TLS 핸드셰이크를 새로 하지 않음)
+- 동기 함수(naver / kakao)와 asyncio 함수(anaver / akakao)를 모두 제공한다.
+- fetch_all / afetch_all 로 여러 검색을 동시에 날릴 수 있다.
+- 응답은 SQLite 디스크 캐시(search_cache.py)를 먼저 확인한다.
+  (환경변수 SEARCH_CACHE_PATH 로 위치 지정, "off" 이면 캐시 끔)
+- 캐시에 없으면 provider별 호출 제한/재시도/서킷 브레이커(rate_limit.py)를 거쳐 호출한다.
+- CASSETTE_MODE=record/replay 이면 HTTP 응답을 파일로 녹화/재생한다. (cassette.py, 이때 SQLite 캐시는 끔)
+  재생은 호출 제한보다 먼저 확인 → 녹화된 응답은 quota / 토큰 버킷을 쓰지 않는다.
+- naver_paged / kakao_paged 는 limit 개수를 채우는 데 필요한 페이지를 동시에 받아 합친다.
+
+사용 예시:
+
+    from shared.search_client import get_search_client, fetch_all
+
+    client = get_search_client()
+    items = client.naver("연남동 맛집", display=5)
+
+    results = fetch_all([partial(client.naver, kw) for kw in keywords])
+"""
+
+import asyncio
+import json
+import math
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .cassette import Cassette, get_cassette
+from .rate_limit import all_guard_metrics, get_guard
+from .search_cache import DEFAULT_CACHE_PATH, SearchCache, make_cache_key
+from .singleflight import SingleFlight
+
+T = TypeVar("T")
+
+NAVER_LOCAL_URL = "https://openapi.naver.com/v1/search/local.json"
+KAKAO_KEYWORD_URL = "https://dapi.kakao.com/v2/local/search/keyword.json"
+
+DEFAULT_TIMEOUT = 5        # 초
+DEFAULT_POOL_SIZE = 32     # 호스트당 유지할 keep-alive 커넥션 수
+DEFAULT_MAX_WORKERS = 16   # fetch_all 동시 실행 개수
+
+# 페이지 크기 / 한도 (공식 문서 기준)
+NAVER_PAGE_SIZE = 5        # display 최대 5
+NAVER_MAX_START = 1        # 지역 검색은 start 최대 1 → 정렬 기준을 바꿔서 추가 결과를 받는다
+NAVER_SORTS = ["random", "comment"]
+KAKAO_PAGE_SIZE = 15       # size 최대 15
+KAKAO_MAX_PAGE = 45        # page 최대 45
+
+
+# ---------------------------------------------------------
+# 1. 커넥션 풀을 가진 검색 클라이언트
+# ---------------------------------------------------------
+class LocalSearchClient:
+    """
+    Naver 지역 검색 / Kakao 키워드 검색을 하나의 Session으로 호출하는 클라이언트.
+    - 응답 원본(items / documents)을 그대로 돌려준다. 전처리는 각 파이프라인 tools 쪽에서.
+    - 4xx, 5xx 는 예외(requests.HTTPError)로 올려보낸다. (에러 응답은 캐시하지 않음)
+    - cache가 있으면 같은 파라미터의 응답은 네트워크 없이 캐시에서 돌려준다.
+    - 동시에 들어온 같은 요청은 하나의 upstream 호출을 나눠 받는다. (singleflight.py)
+    """
+
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        timeout: float = DEFAULT_TIMEOUT,
+        cache: Optional[SearchCache] = None,
+        cassette: Optional[Cassette] = None,
+    ):
+        self.timeout = timeout
+        self.cache = cache
+        self.cassette = cassette
+        self.flight = SingleFlight()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _get(self, provider: str, url: str, headers: Dict[str, str], params: Dict[str, Any]) -> Dict[str, Any]:
+        def _fetch() -> bytes:
+            resp = self.session.get(url, headers=headers, params=params, timeout=self.timeout)
+            resp.raise_for_status()  # 4xx, 5xx 에러 시 예외 발생
+            return resp.content
+
+        if self.cassette is None:
+            return json.loads(_fetch())
+        # 녹화/재생 키에는 인증 헤더를 넣지 않는다 (재생은 _cached_get 에서 guard 전에 처리)
+        return json.loads(self.cassette.record(provider, {"url": url, **params}, _fetch))
+
+    def _cached_get(
+        self,
+        provider: str,
+        url: str,
+        headers: Dict[str, str],
+        params: Dict[str, Any],
+        field: str,
+    ) -> List[Dict[str, Any]]:
+        """
+        캐시 확인 → 없으면 (호출 제한 + 재시도) API 호출 후 결과 리스트(items / documents)를 저장
+        - 같은 파라미터로 동시에 들어온 요청은 single-flight로 합쳐서 API를 한 번만 호출한다.
+        """
+        if self.cache is not None:
+            cached = self.cache.get(provider, params)
+            if cached is not None:
+                return cached
+
+        def _fetch() -> List[Dict[str, Any]]:
+            # leader가 되기 직전에 다른 요청이 캐시를 채웠을 수 있으므로 한 번 더 확인
+            if self.cache is not None:
+                cached = self.cache.get(provider, params)
+                if cached is not None:
+                    return cached
+
+            # 녹화된 응답은 호출 제한(토큰 버킷 / quota / circuit breaker)을 거치지 않고 바로 재생
+            replayed = self.cassette.lookup(provider, {"url": url, **params}) if self.cassette is not None else None
+            if replayed is not None:
+                result = json.loads(replayed).get(field, [])
+            else:
+                guard = get_guard(provider)
+                result = guard.call(lambda: self._get(provider, url, headers, params)).get(field, [])
+
+            if self.cache is not None:
+                self.cache.set(provider, params, result)
+            return result
+
+        return self.flight.do(make_cache_key(provider, params), _fetch)
+
+    # --- 동기 API ---
+    def naver(self, query: str, display: int = 5, start: int = 1, sort: str = "random") -> List[Dict[str, Any]]:
+        """
+        네이버 지역 검색
+        - display: 한 번에 가져올 개수 (공식 문서상 최대 5개)
+        - sort: 'random' (정확도순) / 'comment' (리뷰 많은 순)
+        """
+        headers = {
+            "X-Naver-Client-Id": os.environ.get("NAVER_CLIENT_ID") or "",
+            "X-Naver-Client-Secret": os.environ.get("NAVER_CLIENT_SECRET") or "",
+        }
+        params = {
+            "query": query,
+            "display": display,
+            "start": start,
+            "sort": sort,
+        }
+        return self._cached_get("naver", NAVER_LOCAL_URL, headers, params, "items")
+
+    def kakao(
+        self,
+        query: str,
+        size: int = 15,
+        sort: str = "accuracy",
+        x: Optional[float] = None,
+        y: Optional[float] = None,
+        radius: int = 2000,
+        page: int = 1,
+    ) -> List[Dict[str, Any]]:
+        """
+        카카오 키워드 장소 검색
+        - size: 한 페이지 개수 (최대 15개)
+        - sort: 'accuracy' / 'distance' (distance면 x, y 중심 좌표 필수)
+        - page: 결과 페이지 번호 (1 ~ 45)
+        """
+        api_key = os.environ.get("KAKAO_REST_API_KEY")
+        if not api_key:
+            raise RuntimeError("KAKAO_REST_API_KEY 환경변수가 없습니다.")
+
+        headers = {"Authorization": f"KakaoAK {api_key}"}
+        params: Dict[str, Any] = {
+            "query": query,
+            "size": size,
+            "sort": sort,
+        }
+        if page > 1:
+            params["page"] = page
+        # 거리순 정렬일 경우 중심 좌표 필수
+        if sort == "distance" and x and y:
+            params["x"] = x
+            params["y"] = y
+            params["radius"] = radius
+        return self._cached_get("kakao", KAKAO_KEYWORD_URL, headers, params, "documents")
+
+    # --- 페이지 단위 검색 (limit 개수를 채울 때까지) ---
+    def naver_paged(self, query: str, limit: int, sort: str = "random") -> List[Dict[str, Any]]:
+        """
+        limit 개수를 채우는 데 필요한 만큼 네이버 검색을 동시에 호출해서 합친다.
+        - (start, sort) 조합을 페이지로 본다. start가 막히면 다른 정렬 기준으로 추가 결과를 받는다.
+        - 같은 장소(title + address)는 한 번만 넣는다.
+        """
+        orders = [sort] + [o for o in NAVER_SORTS if o != sort]
+        variants = [
+            (start, order)
+            for order in orders
+            for start in range(1, NAVER_MAX_START + 1, NAVER_PAGE_SIZE)
+        ]
+        variants = variants[:max(1, math.ceil(limit / NAVER_PAGE_SIZE))]
+
+        pages = fetch_all([
+            partial(self.naver, query, display=NAVER_PAGE_SIZE, start=start, sort=order)
+            for start, order in variants
+        ])
+        return _merge_pages(pages, NAVER_PAGE_SIZE, limit, key=lambda it: (it.get("title"), it.get("address")))
+
+    def kakao_paged(self, query: str, limit: int, sort: str = "accuracy", **kwargs) -> List[Dict[str, Any]]:
+        """limit 개수를 채우는 데 필요한 페이지(page=1..N)를 동시에 받아 합친다."""
+        n_pages = min(KAKAO_MAX_PAGE, max(1, math.ceil(limit / KAKAO_PAGE_SIZE)))
+        size = min(KAKAO_PAGE_SIZE, limit) if n_pages == 1 else KAKAO_PAGE_SIZE
+
+        pages = fetch_all([
+            partial(self.kakao, query, size=size, sort=sort, page=page, **kwargs)
+            for page in range(1, n_pages + 1)
+        ])
+        return _merge_pages(pages, size, limit, key=lambda it: it.get("id"))
+
+    # --- asyncio API (Session은 스레드에서 돌리고 이벤트 루프는 막지 않음) ---
+    async def anaver(self, *args, **kwargs) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self.naver, *args, **kwargs)
+
+    async def akakao(self, *args, **kwargs) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self.kakao, *args, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+def _merge_pages(
+    pages: List[List[Dict[str, Any]]],
+    page_size: int,
+    limit: int,
+    key: Callable[[Dict[str, Any]], Any],
+) -> List[Dict[str, Any]]:
+    """
+    페이지 순서대로 중복 없이 합친다.
+    - 어떤 페이지가 page_size보다 짧게 오면 거기가 끝이므로 뒤 페이지는 버린다.
+    """
+    merged: List[Dict[str, Any]] = []
+    seen = set()
+    for page in pages:
+        for item in page:
+            k = key(item)
+            if k in seen:
+                continue
+            seen.add(k)
+            merged.append(item)
+        if len(page) < page_size or len(merged) >= limit:
+            break
+    return merged[:limit]
+
+
+# ---------------------------------------------------------
+# 2. 프로세스 전역 싱글톤
+# ---------------------------------------------------------
+_client: Optional[LocalSearchClient] = None
+_client_lock = threading.Lock()
+
+
+def _cache_from_env() -> Optional[SearchCache]:
+    path = os.environ.get("SEARCH_CACHE_PATH", DEFAULT_CACHE_PATH)
+    if not path or path.lower() == "off":
+        return None
+    try:
+        return SearchCache(path)
+    except Exception as e:
+        # 캐시 파일을 못 열어도 검색 자체는 되도록
+        print(f"   ⚠️ 검색 캐시를 열 수 없어 캐시 없이 진행합니다: {e}")
+        return None
+
+
+def get_search_client() -> LocalSearchClient:
+    """프로세스 전체에서 하나의 LocalSearchClient(=하나의 커넥션 풀 + 캐시)를 공유한다."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                cassette = get_cassette()
+                # cassette 를 쓰는 동안은 검색 캐시를 끈다: 캐시에 있는 검색어가 녹화에서 빠지거나(record),
+                # 재생 지연(CASSETTE_LATENCY) 없이 캐시에서 나가면(replay) 같은 입력 벤치마크가 깨지므로
+                cache = _cache_from_env() if cassette is None else None
+                _client = LocalSearchClient(cache=cache, cassette=cassette)
+    return _client
+
+
+def search_stats() -> Dict[str, Any]:
+    """로그/모니터링용 지표 모음 (캐시 hit/miss, 요청 합치기, provider별 호출/재시도/쿼터 등)"""
+    client = get_search_client()
+    return {
+        "cache": client.cache.stats() if client.cache is not None else None,
+        "coalesced": client.flight.stats(),
+        "cassette": client.cassette.stats() if client.cassette is not None else None,
+        "providers": all_guard_metrics(),
+    }
+
+
+# ---------------------------------------------------------
+# 3. 동시 실행 헬퍼 (fan-out)
+# ---------------------------------------------------------
+def fetch_all(calls: List[Callable[[], T]], max_workers: int = DEFAULT_MAX_WORKERS) -> List[T]:
+    """
+    인자 없는 호출(예: functools.partial(search_local_places, kw, 5)) 리스트를
+    스레드 풀에서 동시에 실행하고, 입력 순서대로 결과를 돌려준다.
+    """
+    if not calls:
+        return []
+    if len(calls) == 1:
+        return [calls[0]()]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(calls))) as pool:
+        return list(pool.map(lambda call: call(), calls))
+
+
+async def afetch_all(
+    calls: List[Callable[[], Awaitable[T]]],
+    max_concurrency: int = DEFAULT_MAX_WORKERS,
+) -> List[T]:
+    """
+    코루틴 팩토리 리스트를 최대 max_concurrency개씩 동시에 실행하고, 입력 순서대로 결과를 돌려준다.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _run(call: Callable[[], Awaitable[T]]) -> T:
+        async with semaphore:
+            return await call()
+
+    return list(await asyncio.gather(*(_run(call) for call in calls)))
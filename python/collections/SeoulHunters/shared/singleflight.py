@@ -0,0 +1,75 @@
+"""
+singleflight.py - 동시에 들어온 같은 요청 합치기 (request coalescing)
+
+역할:
+- 같은 키(정규화된 검색 파라미터)로 동시에 N개의 호출이 들어오면
+  첫 호출(leader)만 실제로 실행하고, 나머지(waiter)는 그 결과를 같이 받는다.
+- 결과를 저장해 두지는 않는다. (저장은 search_cache.py 담당)
+  → 실행이 끝나는 순간 키가 비워지고, 그 뒤에 온 호출은 새로 실행된다.
+- leader에서 예외가 나면 기다리던 호출들도 같은 예외를 받는다.
+
+사용 예시:
+
+    flight = SingleFlight()
+    items = flight.do(key, lambda: client._get(url, headers, params))
+"""
+
+import threading
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self.leaders = 0   # 실제로 실행된 호출 수
+        self.shared = 0    # 다른 호출의 결과를 받아간 호출 수
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.shared += 1
+                is_leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.leaders += 1
+                is_leader = True
+
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            in_flight = len(self._calls)
+        return {
+            "leaders": self.leaders,
+            "shared": self.shared,
+            "in_flight": in_flight,
+        }
@@ -0,0 +1,190 @@
+"""
+slot_filler.py - 가중치 비율 + 위치 기반 슬롯 채우기 (Anna / Jiwon agent4)
+
+역할:
+- 테마 버킷에서 list.pop(0) 으로 꺼내던 방식(FIFO) 대신
+  · 테마별 할당량: tag_plan weight 비율로 전체 슬롯 수를 나눈 정수(최대 나머지 방식).
+    날짜가 지날수록 "지금까지 채웠어야 할 양 - 실제로 채운 양"(부족분)이 큰 테마를 먼저 고른다.
+  · 슬롯 우선순위: SLOT_THEME_PRIORITIES 의 테마 중 부족분이 남은 테마 → 다른 부족 테마 → 우선 테마 → 아무 테마
+    (우선순위 테마 이름이 풀의 테마와 다르면 shared/scheduler 의 종류(맛집/카페 ...)가 같은 테마도 인정)
+  · 같은 테마 안에서는 그날의 "현재 중심(지금까지 고른 장소 평균)"에 가까운 장소부터.
+    중심은 한 곳을 고를 때마다 움직이므로 매번 남은 장소 전체의 (거리 x 가중치 보정, 인덱스) 최솟값을 구한다
+    → 하루당 O(슬롯 수 x 테마 장소 수). 슬롯은 하루 6개 이하라 풀이 수천 개여도 ms 단위.
+- 날짜별 시작 중심은 shared/itinerary_engine 과 같은 주축 분할이라 날짜마다 서로 다른 동네에 머문다.
+- 같은 입력이면 항상 같은 결과 (동점은 인덱스 순) → 벤치마크 비교용으로 결정적.
+
+사용 예시:
+
+    days = fill_days(
+        themes=[p["theme"] for p in places],
+        coords=[naver_xy(p) for p in places],
+        slots=["morning", "lunch", "afternoon", "dinner"],
+        n_days=2,
+        priorities=SLOT_THEME_PRIORITIES,
+        theme_weights=theme_weights_from_plan(tag_plan),
+    )
+    days[0]  # [("morning", 4), ("lunch", 0), ("afternoon", 7), ("dinner", 2)]
+"""
+
+import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from shared.geo import haversine_m
+from shared.itinerary_engine import WEIGHT_PULL, initial_centers
+from shared.scheduler import place_kind
+
+Coord = Tuple[float, float]
+NO_COORD_M = 1e9   # 좌표가 없는 장소는 같은 테마에서 맨 뒤로
+
+
+def theme_weights_from_plan(tag_plan: Any) -> Dict[str, float]:
+    """tag_plan ([{"tag"/"theme": "카페", "weight": 0.3}, ...] 또는 {"tag_plan": [...]}) → {테마: weight}"""
+    if isinstance(tag_plan, dict):
+        tag_plan = tag_plan.get("tag_plan") or tag_plan.get("tags") or []
+    weights: Dict[str, float] = {}
+    for item in tag_plan or []:
+        if hasattr(item, "model_dump"):
+            item = item.model_dump()
+        if not isinstance(item, dict):
+            continue
+        theme = item.get("theme") or item.get("tag") or item.get("category")
+        try:
+            weight = float(item.get("weight") or 0)
+        except (TypeError, ValueError):
+            weight = 0.0
+        if theme and weight > 0:
+            weights[theme] = weights.get(theme, 0.0) + weight
+    return weights
+
+
+def _quotas(counts: Dict[str, int], theme_weights: Dict[str, float], total: int) -> Dict[str, int]:
+    """weight 비율대로 total 을 테마별 정수로 (최대 나머지 방식, 풀에 있는 개수를 넘지 않게)"""
+    shares = {t: theme_weights.get(t, 0.0) for t in counts}
+    if sum(shares.values()) <= 0:
+        shares = {t: float(c) for t, c in counts.items()}   # tag_plan 이 없으면 풀 구성 비율
+    norm = sum(shares.values())
+    raw = {t: total * s / norm for t, s in shares.items()}
+    quotas = {t: min(counts[t], int(math.floor(r))) for t, r in raw.items()}
+    for t in sorted(raw, key=lambda t: (-(raw[t] - math.floor(raw[t])), t)):
+        if sum(quotas.values()) >= total:
+            break
+        if quotas[t] < counts[t]:
+            quotas[t] += 1
+    return quotas
+
+
+def _slot_themes(slot: str, priorities: Dict[str, List[str]], pool_themes: Sequence[str]) -> List[str]:
+    """슬롯 우선순위 → 풀에 있는 테마 목록 (이름이 같은 테마 먼저, 그다음 종류가 같은 테마)"""
+    ordered: List[str] = []
+    for wanted in priorities.get(slot, []):
+        kind = place_kind(wanted)
+        for t in pool_themes:
+            if t not in ordered and (t == wanted or (kind != "기타" and place_kind(t) == kind)):
+                ordered.append(t)
+    return ordered
+
+
+class _ThemeQueue:
+    """한 테마의 남은 장소들 - pop() 은 '현재 중심까지 거리 x 가중치 보정'이 가장 작은 장소 (동점은 인덱스 순)"""
+
+    def __init__(self, members: List[int], key_fn):
+        self.key_fn = key_fn
+        self.members = list(members)
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    def pop(self) -> int:
+        i = min(self.members, key=lambda j: (self.key_fn(j), j))
+        self.members.remove(i)
+        return i
+
+
+def fill_days(
+    themes: Sequence[str],
+    coords: Sequence[Coord],
+    slots: Sequence[str],
+    n_days: int,
+    priorities: Dict[str, List[str]],
+    theme_weights: Optional[Dict[str, float]] = None,
+    per_day: Optional[int] = None,
+    place_weights: Optional[Sequence[float]] = None,
+) -> List[List[Tuple[str, Optional[int]]]]:
+    """날짜별 [(slot, 장소 인덱스 또는 None), ...]. per_day 가 있으면 앞의 per_day 개 슬롯만 채운다"""
+    per_day = len(slots) if per_day is None else max(0, min(per_day, len(slots)))
+    n = len(themes)
+    if n == 0 or n_days <= 0:
+        return [[(slot, None) for slot in slots] for _ in range(max(0, n_days))]
+
+    place_weights = place_weights or [0.0] * n
+    has_coord = [bool(x and y) for x, y in coords]
+    located = [i for i in range(n) if has_coord[i]]
+
+    counts: Dict[str, int] = {}
+    for t in themes:
+        counts[t] = counts.get(t, 0) + 1
+    pool_themes = list(counts)
+    quotas = _quotas(counts, theme_weights or {}, min(n, per_day * n_days))
+    slot_themes = {slot: _slot_themes(slot, priorities, pool_themes) for slot in slots}
+
+    # 날짜별 시작 중심 (주축 분할, 좌표가 있는 장소 기준)
+    located_coords = [coords[i] for i in located]
+    starts = initial_centers(located_coords, n_days) if located_coords else [None] * n_days
+
+    used_total = {t: 0 for t in pool_themes}
+    taken = [False] * n
+    days: List[List[Tuple[str, Optional[int]]]] = []
+
+    for d in range(n_days):
+        picked: List[int] = []
+        center = starts[d]
+
+        def key_fn(i: int) -> float:
+            if center is None or not has_coord[i]:
+                return NO_COORD_M
+            dist = haversine_m(center[0], center[1], coords[i][0], coords[i][1])
+            return dist * (1 - WEIGHT_PULL * max(0.0, min(1.0, place_weights[i])))
+
+        members: Dict[str, List[int]] = {}
+        for i in range(n):
+            if not taken[i]:
+                members.setdefault(themes[i], []).append(i)
+        queues = {t: _ThemeQueue(m, key_fn) for t, m in members.items()}
+
+        # 이 날까지 채웠어야 할 양 기준 부족분
+        def deficit(t: str) -> float:
+            return quotas[t] * (d + 1) / n_days - used_total[t]
+
+        day: List[Tuple[str, Optional[int]]] = []
+        for s, slot in enumerate(slots):
+            if s >= per_day:
+                day.append((slot, None))
+                continue
+            available = [t for t in pool_themes if t in queues and len(queues[t])]
+            preferred = [t for t in slot_themes[slot] if t in available]
+            short = [t for t in available if deficit(t) > 0]
+            choices = (
+                [t for t in preferred if deficit(t) > 0]
+                or short
+                or preferred
+                or available
+            )
+            if not choices:
+                day.append((slot, None))
+                continue
+            # 부족분이 가장 큰 테마 (동점이면 우선순위/풀 순서)
+            theme = max(choices, key=lambda t: (deficit(t), -choices.index(t)))
+            i = queues[theme].pop()
+            taken[i] = True
+            used_total[theme] += 1
+            picked.append(i)
+            day.append((slot, i))
+
+            located_picks = [j for j in picked if has_coord[j]]
+            if located_picks:
+                center = (
+                    sum(coords[j][0] for j in located_picks) / len(located_picks),
+                    sum(coords[j][1] for j in located_picks) / len(located_picks),
+                )
+        days.append(day)
+    return days
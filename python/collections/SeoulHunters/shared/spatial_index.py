@@ -0,0 +1,174 @@
+"""
+spatial_index.py - 후보 풀 공간 인덱스 (균일 격자)
+
+역할:
+- candidates / place_pool 를 매번 전부 훑지 않도록, 좌표를 DEFAULT_CELL_M(250m) 크기의 격자 칸으로 나눠 둔다.
+  질의는 주변 칸만 모아서 numpy로 정확한 haversine 거리를 확인한다.
+  · within(x, y, 800)              : 좌표에서 800m 안 (가까운 순)
+  · nearest(x, y, k=3, tag="카페")  : 가장 가까운 카페 3곳 (칸을 한 겹씩 넓혀 가며 탐색)
+  · bbox(min_x, min_y, max_x, max_y): 사각형 영역 필터
+- 인덱스는 풀(좌표 + 태그) 지문으로 프로세스 레지스트리에 한 번만 만들어 두고,
+  그래프 state 에는 지문 문자열(key)만 넣어 참조한다. (checkpointer 직렬화 대상이 가벼워짐)
+
+사용 예시:
+
+    key, index = get_spatial_index([(p.x, p.y) for p in pool], tags=[p.tag_name for p in pool])
+    state_update = {"pool_index_key": key}
+    ...
+    index = index_for_key(state["pool_index_key"])
+    near = index.within(anchor.x, anchor.y, 800)
+"""
+
+import hashlib
+import math
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from shared.distance import haversine_matrix, pool_fingerprint
+
+DEFAULT_CELL_M = 250
+MAX_CACHED_INDEXES = 32
+METERS_PER_DEG_LAT = 111_320.0
+
+Coord = Tuple[float, float]
+
+
+class GridIndex:
+    def __init__(self, coords: Sequence[Coord], tags: Optional[Sequence[str]] = None, cell_m: float = DEFAULT_CELL_M):
+        arr = np.asarray(coords, dtype=float).reshape(-1, 2)
+        self.xs = arr[:, 0]
+        self.ys = arr[:, 1]
+        self.tags = list(tags) if tags is not None else None
+        self.cell_m = cell_m
+
+        # 경위도 → 격자 칸 크기 (위도에 따라 경도 1도의 길이가 달라지므로 풀 평균 위도 기준)
+        lat0 = float(self.ys.mean()) if len(self.ys) else 37.5
+        self.cell_deg_y = cell_m / METERS_PER_DEG_LAT
+        self.cell_deg_x = cell_m / (METERS_PER_DEG_LAT * max(0.1, math.cos(math.radians(lat0))))
+
+        self.cells: Dict[Tuple[int, int], List[int]] = {}
+        for i, (x, y) in enumerate(zip(self.xs, self.ys)):
+            self.cells.setdefault(self._cell(x, y), []).append(i)
+        gxs = [gx for gx, _ in self.cells] or [0]
+        gys = [gy for _, gy in self.cells] or [0]
+        self.bounds = (min(gxs), min(gys), max(gxs), max(gys))
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return int(math.floor(x / self.cell_deg_x)), int(math.floor(y / self.cell_deg_y))
+
+    def _ring(self, cx: int, cy: int, r: int) -> List[int]:
+        """(cx, cy) 에서 r 칸 떨어진 테두리 칸들의 장소 (r=0 이면 자기 칸)"""
+        if r == 0:
+            return list(self.cells.get((cx, cy), ()))
+        found: List[int] = []
+        for gx in range(cx - r, cx + r + 1):
+            found.extend(self.cells.get((gx, cy - r), ()))
+            found.extend(self.cells.get((gx, cy + r), ()))
+        for gy in range(cy - r + 1, cy + r):
+            found.extend(self.cells.get((cx - r, gy), ()))
+            found.extend(self.cells.get((cx + r, gy), ()))
+        return found
+
+    def _filter(self, idx: List[int], tag: Optional[str], exclude: Sequence[int]) -> np.ndarray:
+        if tag is not None and self.tags is not None:
+            idx = [i for i in idx if self.tags[i] == tag]
+        if exclude:
+            skip = set(exclude)
+            idx = [i for i in idx if i not in skip]
+        return np.asarray(idx, dtype=int)
+
+    def _distances(self, x: float, y: float, idx: np.ndarray) -> np.ndarray:
+        return haversine_matrix(np.array([x]), np.array([y]), self.xs[idx], self.ys[idx])[0]
+
+    def within(self, x: float, y: float, radius_m: float, tag: Optional[str] = None, exclude: Sequence[int] = ()) -> List[int]:
+        """(x, y) 에서 radius_m 안의 장소 인덱스 (가까운 순)"""
+        cx, cy = self._cell(x, y)
+        reach = int(math.ceil(radius_m / self.cell_m)) + 1
+        idx: List[int] = []
+        for gx in range(cx - reach, cx + reach + 1):
+            for gy in range(cy - reach, cy + reach + 1):
+                idx.extend(self.cells.get((gx, gy), ()))
+        idx_arr = self._filter(idx, tag, exclude)
+        if len(idx_arr) == 0:
+            return []
+        d = self._distances(x, y, idx_arr)
+        keep = d <= radius_m
+        idx_arr, d = idx_arr[keep], d[keep]
+        return idx_arr[np.lexsort((idx_arr, d))].tolist()
+
+    def nearest(self, x: float, y: float, k: int, tag: Optional[str] = None, exclude: Sequence[int] = ()) -> List[int]:
+        """(x, y) 에서 가장 가까운 k곳. 칸을 한 겹씩 넓히다가 k번째 거리가 탐색 반경 안으로 들어오면 종료"""
+        if k <= 0 or len(self) == 0:
+            return []
+        cx, cy = self._cell(x, y)
+        min_gx, min_gy, max_gx, max_gy = self.bounds
+        max_ring = max(abs(cx - min_gx), abs(cx - max_gx), abs(cy - min_gy), abs(cy - max_gy))
+        idx: List[int] = []
+        for r in range(0, max_ring + 1):
+            idx.extend(self._ring(cx, cy, r))
+            idx_arr = self._filter(idx, tag, exclude)
+            if len(idx_arr) < k:
+                continue
+            d = self._distances(x, y, idx_arr)
+            order = np.lexsort((idx_arr, d))
+            # r 겹까지 다 본 상태에서 아직 안 본 칸의 장소는 최소 r * cell_m 보다 멀다
+            if d[order[k - 1]] <= r * self.cell_m:
+                return idx_arr[order[:k]].tolist()
+        idx_arr = self._filter(idx, tag, exclude)
+        if len(idx_arr) == 0:
+            return []
+        d = self._distances(x, y, idx_arr)
+        return idx_arr[np.lexsort((idx_arr, d))[:k]].tolist()
+
+    def bbox(self, min_x: float, min_y: float, max_x: float, max_y: float, tag: Optional[str] = None) -> List[int]:
+        """사각형(경도 min_x~max_x, 위도 min_y~max_y) 안의 장소 인덱스"""
+        mask = (self.xs >= min_x) & (self.xs <= max_x) & (self.ys >= min_y) & (self.ys <= max_y)
+        idx = np.where(mask)[0].tolist()
+        return self._filter(idx, tag, ()).tolist()
+
+    def center(self) -> Optional[Coord]:
+        """풀 중심 (Kakao 거리순 검색의 x, y 등)"""
+        if len(self) == 0:
+            return None
+        return float(self.xs.mean()), float(self.ys.mean())
+
+
+_lock = threading.Lock()
+_indexes: "OrderedDict[str, GridIndex]" = OrderedDict()
+
+
+def index_key(coords: Sequence[Coord], tags: Optional[Sequence[str]] = None) -> str:
+    key = pool_fingerprint(coords)
+    if tags is not None:
+        key += ":" + hashlib.sha1("\x1f".join(tags).encode("utf-8")).hexdigest()[:12]
+    return key
+
+
+def get_spatial_index(coords: Sequence[Coord], tags: Optional[Sequence[str]] = None) -> Tuple[str, GridIndex]:
+    """풀 지문 기준으로 한 번만 만든 인덱스와 그 key"""
+    key = index_key(coords, tags)
+    with _lock:
+        index = _indexes.get(key)
+        if index is not None:
+            _indexes.move_to_end(key)
+            return key, index
+    index = GridIndex(coords, tags)
+    with _lock:
+        _indexes[key] = index
+        while len(_indexes) > MAX_CACHED_INDEXES:
+            _indexes.popitem(last=False)
+    return key, index
+
+
+def index_for_key(key: Optional[str]) -> Optional[GridIndex]:
+    """state 에 넣어 둔 key → 인덱스 (다른 프로세스이거나 밀려났으면 None → 다시 만들기)"""
+    if not key:
+        return None
+    with _lock:
+        return _indexes.get(key)
@@ -0,0 +1,145 @@
+"""
+sqlite_cache.py - SQLite TTL + LRU 캐시 공통 베이스
+
+역할:
+- search_cache.SearchCache (검색 응답), llm_cache.LLMCache (LLM 응답), Kang agent3_verdict_cache.VerdictCache (검증 판정)
+  가 같이 쓰는 저장소 부분.
+  · 테이블: key(PK) / 그룹 컬럼(provider, node, tag_name ...) / 값 컬럼 / created_at / accessed_at
+  · 조회 시 TTL 이 지났으면 바로 지우고 miss, hit 이면 accessed_at 갱신 (LRU)
+  · 저장 후 max_entries 를 넘으면 가장 오래 안 쓴 항목부터 삭제
+  · 그룹별 hit/miss 카운터, 여러 스레드에서 같이 써도 되도록 lock 으로 감싼다.
+- 키 만들기, 값 직렬화, 그룹별 TTL, 무효화 조건은 각 캐시 클래스가 정한다.
+
+사용 예시:
+
+    class MyCache(SQLiteCache):
+        def __init__(self, path):
+            super().__init__(path, table="my_entries", group_column="kind")
+
+        def get(self, kind, key):
+            return self._get(key, kind, ttl=3600)      # 저장한 값 또는 None
+
+        def set(self, kind, key, payload):
+            self._set(key, kind, payload)
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+
+class SQLiteCache:
+    """SQLite 기반 TTL + LRU 캐시 베이스 (값은 서브클래스가 직렬화해서 넘긴다)"""
+
+    def __init__(
+        self,
+        path: str,
+        table: str,
+        group_column: str,
+        max_entries: int,
+        value_column: str = "payload",
+        value_type: str = "TEXT",
+    ):
+        self.path = os.path.expanduser(path)
+        self.table = table
+        self.group_column = group_column
+        self.value_column = value_column
+        self.max_entries = max_entries
+
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+        self.evictions = 0
+
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                key             TEXT PRIMARY KEY,
+                {group_column}  TEXT NOT NULL,
+                {value_column}  {value_type} NOT NULL,
+                created_at      REAL NOT NULL,
+                accessed_at     REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_accessed ON {table}(accessed_at)")
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_{group_column} ON {table}({group_column})")
+        self._conn.commit()
+
+    def _get(self, key: str, group: str, ttl: float) -> Optional[Any]:
+        """TTL 안이면 저장된 값, 아니면 None (만료된 항목은 바로 삭제)"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {self.value_column}, created_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None or now - row[1] > ttl:
+                if row is not None:
+                    self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses[group] = self.misses.get(group, 0) + 1
+                return None
+
+            # LRU 갱신
+            self._conn.execute(f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits[group] = self.hits.get(group, 0) + 1
+        return row[0]
+
+    def _set(self, key: str, group: str, value: Any):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, {self.group_column}, {self.value_column}, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, group, value, now, now),
+            )
+            self._evict_locked()
+            self._conn.commit()
+
+    def _evict_locked(self):
+        """max_entries를 넘으면 가장 오래 안 쓴(accessed_at) 항목부터 삭제"""
+        (count,) = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()
+        overflow = count - self.max_entries
+        if overflow <= 0:
+            return
+        self._conn.execute(
+            f"DELETE FROM {self.table} WHERE key IN (SELECT key FROM {self.table} ORDER BY accessed_at ASC LIMIT ?)",
+            (overflow,),
+        )
+        self.evictions += overflow
+
+    def _delete(self, where: str = "", args: Sequence[Any] = ()):
+        """where 조건(예: "provider = ?")에 맞는 항목 삭제, 비어 있으면 전체"""
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}" + (f" WHERE {where}" if where else ""), tuple(args))
+            self._conn.commit()
+
+    def size(self) -> int:
+        with self._lock:
+            (size,) = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()
+        return size
+
+    def totals(self) -> Dict[str, Any]:
+        """전체 hit/miss/hit_rate/evictions/size"""
+        hits, misses = sum(self.hits.values()), sum(self.misses.values())
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 3) if total else 0.0,
+            "evictions": self.evictions,
+            "size": self.size(),
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
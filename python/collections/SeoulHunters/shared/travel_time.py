@@ -0,0 +1,124 @@
+"""
+travel_time.py - 이동수단별 이동 시간(분) 행렬 (오프라인 추정)
+
+역할:
+- shared/distance 의 직선거리 행렬을 TripPreferences.transport 에 맞는 "분" 단위 이동 시간으로 바꾼다.
+  분 = 고정 오버헤드(역까지 걷기/대기/주차 등) + 직선거리 x 우회 계수 / 속도
+  가까운 거리(walk_below_m 이하)는 어떤 수단이든 걸어가는 편이 빠르므로 도보 시간으로 본다.
+- 이동수단이 여러 개면(Jiwon/Anna 의 리스트) 칸마다 가장 빠른 수단의 시간을 쓴다.
+- (풀 지문, 이동수단) 별로 메모이즈 → 같은 풀로 여러 번 경로를 짜도 계산은 한 번.
+- route_minutes_batch: (m x n) 순서 배열의 총 이동 시간을 한 번에 계산 → 요청당 수천 개 순서 비교 가능.
+
+사용 예시:
+
+    tt = get_travel_time_matrix([(p.x, p.y) for p in places], prefs.transport)   # "대중교통" / ["도보", "택시"]
+    tt.minutes[i, j]                     # i → j 이동 시간 (분)
+    tt.route_minutes([3, 0, 5])          # 경로 총 이동 시간
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from shared.distance import get_distance_matrix
+
+# 서울 시내 기준 대략값 (필요하면 profiles 인자로 덮어쓰기)
+TRANSPORT_PROFILES: Dict[str, Dict[str, float]] = {
+    "걷기":     {"speed_kmh": 4.5, "detour": 1.25, "overhead_min": 0.0},
+    "대중교통": {"speed_kmh": 22.0, "detour": 1.4, "overhead_min": 12.0},   # 역/정류장까지 도보 + 대기 + 환승
+    "자차":     {"speed_kmh": 20.0, "detour": 1.35, "overhead_min": 8.0},   # 주차
+    "택시":     {"speed_kmh": 22.0, "detour": 1.35, "overhead_min": 5.0},   # 호출/대기
+}
+TRANSPORT_ALIASES = {"도보": "걷기", "뚜벅이": "걷기", "지하철": "대중교통", "버스": "대중교통", "렌터카": "자차", "차": "자차"}
+DEFAULT_TRANSPORT = "대중교통"
+WALK_BELOW_M = 700        # 이 거리 이하는 걸어가는 시간으로
+MAX_CACHED = 64
+
+Coord = Tuple[float, float]
+
+
+def resolve_transport(transport: Union[None, str, Sequence[str]]) -> Tuple[str, ...]:
+    """'도보' / ['도보', '택시'] / None → 프로필 이름 튜플 (모르는 값은 버리고, 비면 기본값)"""
+    values = [transport] if isinstance(transport, str) else list(transport or [])
+    modes = []
+    for v in values:
+        mode = TRANSPORT_ALIASES.get(v, v)
+        if mode in TRANSPORT_PROFILES and mode not in modes:
+            modes.append(mode)
+    return tuple(sorted(modes)) or (DEFAULT_TRANSPORT,)
+
+
+def minutes_for(distance_m: np.ndarray, mode: str, profiles: Optional[Dict[str, Dict[str, float]]] = None) -> np.ndarray:
+    """거리(m) 배열 → mode 이동 시간(분) 배열 (짧은 거리는 도보 시간)"""
+    profiles = profiles or TRANSPORT_PROFILES
+    walk = profiles["걷기"]
+    walk_min = distance_m * walk["detour"] / (walk["speed_kmh"] * 1000 / 60) + walk["overhead_min"]
+    p = profiles[mode]
+    mode_min = distance_m * p["detour"] / (p["speed_kmh"] * 1000 / 60) + p["overhead_min"]
+    minutes = np.where(distance_m <= WALK_BELOW_M, np.minimum(walk_min, mode_min), mode_min)
+    return np.where(distance_m > 0, minutes, 0.0)
+
+
+class TravelTimeMatrix:
+    def __init__(self, coords: Sequence[Coord], modes: Tuple[str, ...], profiles: Optional[Dict[str, Dict[str, float]]] = None):
+        self.modes = modes
+        self.distance = get_distance_matrix(coords)
+        self.minutes = np.minimum.reduce([minutes_for(self.distance.matrix, m, profiles) for m in modes])
+
+    def __len__(self) -> int:
+        return len(self.minutes)
+
+    def route_minutes(self, order: Sequence[int]) -> float:
+        """열린 경로 총 이동 시간 (분)"""
+        if len(order) < 2:
+            return 0.0
+        idx = np.asarray(order, dtype=int)
+        return float(self.minutes[idx[:-1], idx[1:]].sum())
+
+    def route_minutes_batch(self, orders: Any) -> np.ndarray:
+        """(m x n) 순서 배열 → 각 순서의 총 이동 시간 (m,)"""
+        orders = np.asarray(orders, dtype=int)
+        if orders.ndim != 2 or orders.shape[1] < 2:
+            return np.zeros(len(orders))
+        return self.minutes[orders[:, :-1], orders[:, 1:]].sum(axis=1)
+
+
+_lock = threading.Lock()
+_matrices: "OrderedDict[Tuple[str, Tuple[str, ...]], TravelTimeMatrix]" = OrderedDict()
+
+
+def get_travel_time_matrix(
+    coords: Sequence[Coord],
+    transport: Union[None, str, Sequence[str]] = None,
+    profiles: Optional[Dict[str, Dict[str, float]]] = None,
+) -> TravelTimeMatrix:
+    """(풀 지문, 이동수단) 별로 메모이즈된 이동 시간 행렬. profiles 를 직접 주면 캐시하지 않는다"""
+    modes = resolve_transport(transport)
+    if profiles is not None:
+        return TravelTimeMatrix(coords, modes, profiles)
+
+    key = (get_distance_matrix(coords).fingerprint, modes)
+    with _lock:
+        tt = _matrices.get(key)
+        if tt is not None:
+            _matrices.move_to_end(key)
+            return tt
+    tt = TravelTimeMatrix(coords, modes)
+    with _lock:
+        _matrices[key] = tt
+        while len(_matrices) > MAX_CACHED:
+            _matrices.popitem(last=False)
+    return tt
+
+
+def transport_label(transport: Union[None, str, Sequence[str]]) -> str:
+    return "+".join(resolve_transport(transport))
+
+
+def nearest_by_time(tt: TravelTimeMatrix, i: int, candidates: List[int]) -> int:
+    """candidates 중 i에서 이동 시간이 가장 짧은 곳 (같으면 인덱스 작은 쪽)"""
+    row = tt.minutes[i, candidates]
+    best = np.lexsort((np.asarray(candidates), row))[0]
+    return candidates[int(best)]
@@ -3,11 +3,18 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+import json
 import os
+import sys
+from pathlib import Path
 from typing import Literal
 from tavily import TavilyClient
 from deepagents import create_deep_agent
 
+# SeoulHunters/shared 의 녹화/재생(cassette) 모듈 사용 (CASSETTE_MODE=record/replay)
+sys.path.append(str(Path(__file__).resolve().parents[2] / "collections" / "SeoulHunters"))
+from shared.cassette import get_cassette
+
 tavily_client = TavilyClient()
 
 def internet_search(
@@ -17,12 +24,26 @@ def internet_search(
     include_raw_content: bool = False,
 ):
     """Run a web search"""
-    return tavily_client.search(
-        query,
-        max_results=max_results,
-        include_raw_content=include_raw_content,
-        topic=topic,
-    )
+    def _search():
+        return tavily_client.search(
+            query,
+            max_results=max_results,
+            include_raw_content=include_raw_content,
+            topic=topic,
+        )
+
+    cassette = get_cassette()
+    if cassette is None:
+        return _search()
+
+    key = {
+        "query": query,
+        "max_results": max_results,
+        "topic": topic,
+        "include_raw_content": include_raw_content,
+    }
+    body = cassette.play("tavily", key, lambda: json.dumps(_search(), ensure_ascii=False).encode("utf-8"))
+    return json.loads(body)
 
 # System prompt to steer the agent to be an expert researcher
 research_instructions = """You are an expert researcher. Your job is to conduct thorough research and then write a polished report.
@@ -0,0 +1,113 @@
+"""Kang 그래프(router → path_finder)에서 완성된 일정의 부분 수정이 전체 재생성 없이 처리되는지 확인."""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+KANG_DIR = Path(__file__).resolve().parent.parent / "collections" / "SeoulHunters" / "Kang"
+sys.path.insert(0, str(KANG_DIR))
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+
+from langchain_core.messages import AIMessage, HumanMessage  # noqa: E402
+from langgraph.graph import END, StateGraph  # noqa: E402
+
+import agents.agent5_path_finder as a5  # noqa: E402
+from agents.agent0_router import router_node  # noqa: E402
+from state import (  # noqa: E402
+    AgentState,
+    CandidatePlace,
+    DaySchedule,
+    FinalItinerary,
+    ScheduledPlace,
+    TripPreferences,
+)
+
+
+def _place(name, tag, x, y):
+    return CandidatePlace(
+        place_name=name, address="서울 성동구", category=tag, tag_name=tag, place_url="",
+        x=x, y=y, weight=0.5, keyword=tag,
+    )
+
+
+def _day(day, places):
+    return DaySchedule(
+        day=day,
+        daily_theme=f"{day}일차",
+        places=[
+            ScheduledPlace(place=p, order=i, visit_time="", description=f"{p.place_name} 설명")
+            for i, p in enumerate(places, 1)
+        ],
+    )
+
+
+def _graph():
+    workflow = StateGraph(AgentState)
+    workflow.add_node("router", router_node)
+    workflow.add_node("path_finder", a5.agent5_route_node)
+    workflow.set_entry_point("router")
+    workflow.add_conditional_edges("router", lambda s: s["next_step"], {"path_finder": "path_finder", "planner": END, "suggester": END, "general_chat": END})
+    workflow.add_edge("path_finder", END)
+    return workflow.compile()
+
+
+class _FakeNote:
+    def invoke(self, messages):
+        return a5.LLMPlaceNote(description="바꾼 카페 설명")
+
+
+@pytest.mark.parametrize("request_text", ["2일차 카페 말고 다른 데", "2일차 카페 빼고 다른 데 넣어줘"])
+def test_replace_cafe_on_day_two_edits_only_that_day(monkeypatch, request_text):
+    def no_full_plan(*args, **kwargs):
+        raise AssertionError("부분 수정인데 전체 일정을 다시 만들었음")
+
+    monkeypatch.setattr(a5, "_plan_with_engine", no_full_plan)
+    monkeypatch.setattr(a5, "_plan_with_llm", no_full_plan)
+    monkeypatch.setattr(a5, "get_structured_llm", lambda *args, **kwargs: _FakeNote())
+
+    onion = _place("어니언 성수", "카페", 127.0582, 37.5447)
+    pool = [
+        _place("성수 식당", "맛집", 127.0560, 37.5440),
+        _place("성수 저녁집", "맛집", 127.0570, 37.5430),
+        _place("서울숲", "관광", 127.0374, 37.5444),
+        onion,
+        _place("대림창고", "카페", 127.0575, 37.5418),
+        _place("한남 브런치", "맛집", 127.0020, 37.5340),
+        _place("한남 카페", "카페", 127.0030, 37.5350),
+        _place("리움미술관", "관광", 126.9990, 37.5380),
+    ]
+    itinerary = FinalItinerary(
+        total_days=2,
+        schedule=[_day(1, pool[5:8]), _day(2, [pool[0], onion, pool[2], pool[1]])],
+        overall_review="총평",
+    )
+    prefs = TripPreferences.model_construct(
+        target_area="성수", duration=2, intensity=50, themes=["카페"], transport="대중교통",
+        additional_notes="", is_complete=True,
+    )
+    state = {
+        "messages": [AIMessage(content="일정 완성!"), HumanMessage(content=request_text)],
+        "preferences": prefs,
+        "candidates": pool,
+        "main_place_candidates": [],
+        "final_itinerary": itinerary,
+    }
+
+    result = _graph().invoke(state)
+
+    edited = result["final_itinerary"]
+    day1, day2 = edited.schedule
+    assert day1 == itinerary.schedule[0]
+    names = [sp.place.place_name for sp in day2.places]
+    assert "어니언 성수" not in names
+    assert "대림창고" in names
+    assert len(names) == 4
+    assert [sp.order for sp in day2.places] == [1, 2, 3, 4]
+    assert next(sp.description for sp in day2.places if sp.place.place_name == "대림창고") == "바꾼 카페 설명"
+    assert next(sp.description for sp in day2.places if sp.place.place_name == "서울숲") == "서울숲 설명"
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))